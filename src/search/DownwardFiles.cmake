@@ -161,6 +161,14 @@ fast_downward_plugin(
         open_lists/tiebreaking_open_list
 )
 
+fast_downward_plugin(
+    NAME F_G_BUCKET_OPEN_LIST
+    HELP "Two-level f/g bucket open list with erasure by state ID"
+    SOURCES
+        open_lists/f_g_bucket_open_list
+    DEPENDENCY_ONLY
+)
+
 fast_downward_plugin(
     NAME TYPE_BASED_OPEN_LIST
     HELP "Type-based open list"
@@ -192,6 +200,22 @@ fast_downward_plugin(
     DEPENDENCY_ONLY
 )
 
+fast_downward_plugin(
+    NAME GRAPH_AUTOMORPHISMS
+    HELP "Automorphisms of coloured graphs by colour refinement and individualization"
+    SOURCES
+        algorithms/graph_automorphisms
+    DEPENDENCY_ONLY
+)
+
+fast_downward_plugin(
+    NAME FLAT_INT_MAP
+    HELP "Map from non-negative integers that is cleared in place"
+    SOURCES
+        algorithms/flat_int_map
+    DEPENDENCY_ONLY
+)
+
 fast_downward_plugin(
     NAME INT_HASH_SET
     HELP "Hash set storing non-negative integers"
@@ -365,8 +389,19 @@ fast_downward_plugin(
     NAME PEA_IDA_SEARCH
     HELP "PEA*+IDA* search algorithm"
     SOURCES
+        search_engines/checkpoint
+        search_engines/dead_end_memo
+        search_engines/goal_perimeter
+        search_engines/h_value_cache
+        search_engines/hash_distributed_search
+        search_engines/move_pruning
+        search_engines/operator_selection_function
+        search_engines/parallel_bounded_dfs
         search_engines/pea_ida_search
-    DEPENDS NULL_PRUNING_METHOD ORDERED_SET SUCCESSOR_GENERATOR
+        search_engines/spilled_open_list
+        search_engines/structural_symmetries
+        search_engines/transposition_table
+    DEPENDS F_G_BUCKET_OPEN_LIST FLAT_INT_MAP GRAPH_AUTOMORPHISMS NULL_PRUNING_METHOD ORDERED_SET PDBS PRIORITY_QUEUES SUCCESSOR_GENERATOR
     DEPENDENCY_ONLY
 )
 
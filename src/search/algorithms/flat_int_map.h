@@ -0,0 +1,121 @@
+#ifndef ALGORITHMS_FLAT_INT_MAP_H
+#define ALGORITHMS_FLAT_INT_MAP_H
+
+#include <cassert>
+#include <cstdint>
+#include <vector>
+
+namespace flat_int_map {
+/*
+  Map from non-negative integer keys (e.g. StateID values) to values that
+  is meant to be filled and cleared many times, e.g. once per expanded
+  node.
+
+  All entries are stored in a single vector with open addressing and
+  linear probing. The map remembers the buckets it used, so clear() only
+  resets those and keeps the memory. Once the map has grown to the largest
+  number of entries it has to hold at a time, neither inserting nor
+  clearing allocates memory. Entries cannot be erased one by one.
+
+  Usage:
+
+  FlatIntMap<int> g_values;
+  g_values[3] = 7;
+  int *g_value = g_values.find(3);
+  assert(g_value && *g_value == 7);
+  g_values.clear();
+  assert(!g_values.find(3));
+*/
+template<typename Value>
+class FlatIntMap {
+    static const int EMPTY_KEY = -1;
+    static const int MIN_NUM_BUCKETS = 16;
+
+    struct Bucket {
+        int key;
+        Value value;
+    };
+
+    std::vector<Bucket> buckets;
+    std::vector<int> used_bucket_indices;
+    int shift;
+
+    // Fibonacci hashing spreads consecutive keys such as StateIDs over the buckets.
+    int get_ideal_bucket_index(int key) const {
+        return static_cast<std::uint32_t>(key * 2654435769u) >> shift;
+    }
+
+    int find_bucket_index(int key) const {
+        assert(key >= 0);
+        int mask = buckets.size() - 1;
+        int index = get_ideal_bucket_index(key);
+        while (buckets[index].key != key && buckets[index].key != EMPTY_KEY)
+            index = (index + 1) & mask;
+        return index;
+    }
+
+    void resize(int num_buckets) {
+        std::vector<Bucket> old_buckets;
+        old_buckets.swap(buckets);
+        buckets.assign(num_buckets, {EMPTY_KEY, Value()});
+        shift = 32;
+        for (int size = num_buckets; size > 1; size /= 2)
+            --shift;
+        std::vector<int> old_used_bucket_indices;
+        old_used_bucket_indices.swap(used_bucket_indices);
+        for (int old_index : old_used_bucket_indices) {
+            const Bucket &bucket = old_buckets[old_index];
+            int index = find_bucket_index(bucket.key);
+            buckets[index] = bucket;
+            used_bucket_indices.push_back(index);
+        }
+    }
+
+public:
+    FlatIntMap() {
+        resize(MIN_NUM_BUCKETS);
+    }
+
+    Value *find(int key) {
+        int index = find_bucket_index(key);
+        return buckets[index].key == key ? &buckets[index].value : nullptr;
+    }
+
+    const Value *find(int key) const {
+        int index = find_bucket_index(key);
+        return buckets[index].key == key ? &buckets[index].value : nullptr;
+    }
+
+    // Insert the key with a default-constructed value if it is not in the map.
+    Value &operator[](int key) {
+        int index = find_bucket_index(key);
+        if (buckets[index].key == key)
+            return buckets[index].value;
+        // The load factor is kept at most 1/2.
+        if (2 * (size() + 1) > static_cast<int>(buckets.size())) {
+            resize(2 * buckets.size());
+            index = find_bucket_index(key);
+        }
+        buckets[index].key = key;
+        buckets[index].value = Value();
+        used_bucket_indices.push_back(index);
+        return buckets[index].value;
+    }
+
+    int size() const {
+        return used_bucket_indices.size();
+    }
+
+    bool empty() const {
+        return used_bucket_indices.empty();
+    }
+
+    void clear() {
+        for (int index : used_bucket_indices)
+            buckets[index].key = EMPTY_KEY;
+        used_bucket_indices.clear();
+    }
+};
+}
+
+#endif
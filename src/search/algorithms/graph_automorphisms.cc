@@ -0,0 +1,263 @@
+#include "graph_automorphisms.h"
+
+#include "../utils/timer.h"
+
+#include <algorithm>
+#include <cassert>
+#include <numeric>
+
+using namespace std;
+
+namespace graph_automorphisms {
+namespace {
+/*
+  Colours are always dense, i.e. the colours of n cells are 0, ..., n - 1,
+  and their order is invariant under automorphisms, so that the discrete
+  partitions of two paths can be compared colour by colour.
+*/
+class AutomorphismSearch {
+    const vector<vector<pair<int, int>>> &adjacency;
+    int num_vertices;
+    utils::Timer timer;
+    double max_time;
+    int remaining_backtracks;
+
+    // Refined partitions, individualized vertices and cell sizes on the levels of the first path.
+    vector<vector<int>> path_colours;
+    vector<int> path_vertices;
+    vector<vector<int>> path_shapes;
+    vector<int> first_leaf_vertices;
+
+    vector<int> orbit_parents;
+    vector<vector<int>> generators;
+
+    vector<vector<long long>> signatures;
+    vector<int> order;
+    vector<int> refined_colours;
+    vector<pair<int, int>> mapped_neighbours;
+
+    int get_num_colours(const vector<int> &colours) const {
+        return *max_element(colours.begin(), colours.end()) + 1;
+    }
+
+    vector<int> get_shape(const vector<int> &colours) const {
+        vector<int> shape(get_num_colours(colours), 0);
+        for (int colour : colours) {
+            ++shape[colour];
+        }
+        return shape;
+    }
+
+    int get_target_colour(const vector<int> &shape) const {
+        for (size_t colour = 0; colour < shape.size(); ++colour) {
+            if (shape[colour] > 1)
+                return colour;
+        }
+        return -1;
+    }
+
+    void refine(vector<int> &colours) {
+        int num_colours = get_num_colours(colours);
+        while (num_colours < num_vertices) {
+            vector<int> shape = get_shape(colours);
+            for (int vertex = 0; vertex < num_vertices; ++vertex) {
+                vector<long long> &signature = signatures[vertex];
+                signature.clear();
+                if (shape[colours[vertex]] == 1)
+                    continue;
+                for (const pair<int, int> &edge : adjacency[vertex]) {
+                    signature.push_back(static_cast<long long>(edge.first) * num_vertices + colours[edge.second]);
+                }
+                sort(signature.begin(), signature.end());
+            }
+
+            // Vertices are split by their signatures within their cells, which keeps the order of the cells.
+            iota(order.begin(), order.end(), 0);
+            sort(order.begin(), order.end(), [&](int vertex1, int vertex2) {
+                     if (colours[vertex1] != colours[vertex2])
+                         return colours[vertex1] < colours[vertex2];
+                     if (signatures[vertex1] != signatures[vertex2])
+                         return signatures[vertex1] < signatures[vertex2];
+                     return vertex1 < vertex2;
+                 });
+            int colour = -1;
+            for (int i = 0; i < num_vertices; ++i) {
+                int vertex = order[i];
+                if (i == 0 || colours[vertex] != colours[order[i - 1]] ||
+                    signatures[vertex] != signatures[order[i - 1]])
+                    ++colour;
+                refined_colours[vertex] = colour;
+            }
+            colours.swap(refined_colours);
+            if (colour + 1 == num_colours)
+                break;
+            num_colours = colour + 1;
+        }
+    }
+
+    void individualize(vector<int> &colours, int vertex) {
+        int vertex_colour = colours[vertex];
+        for (int other = 0; other < num_vertices; ++other) {
+            if (colours[other] > vertex_colour || (colours[other] == vertex_colour && other != vertex))
+                ++colours[other];
+        }
+        refine(colours);
+    }
+
+    bool is_automorphism(const vector<int> &permutation) {
+        for (int vertex = 0; vertex < num_vertices; ++vertex) {
+            mapped_neighbours.clear();
+            for (const pair<int, int> &edge : adjacency[vertex]) {
+                mapped_neighbours.emplace_back(edge.first, permutation[edge.second]);
+            }
+            sort(mapped_neighbours.begin(), mapped_neighbours.end());
+            if (mapped_neighbours != adjacency[permutation[vertex]])
+                return false;
+        }
+        return true;
+    }
+
+    bool is_out_of_time() const {
+        return timer() > max_time;
+    }
+
+    bool search_leaf(int level, const vector<int> &colours) {
+        if (level == static_cast<int>(path_vertices.size())) {
+            vector<int> permutation(num_vertices);
+            for (int vertex = 0; vertex < num_vertices; ++vertex) {
+                permutation[first_leaf_vertices[colours[vertex]]] = vertex;
+            }
+            if (!is_automorphism(permutation))
+                return false;
+            generators.push_back(move(permutation));
+            return true;
+        }
+
+        int target_colour = get_target_colour(path_shapes[level]);
+        for (int vertex = 0; vertex < num_vertices; ++vertex) {
+            if (colours[vertex] != target_colour)
+                continue;
+            if (--remaining_backtracks < 0 || is_out_of_time())
+                return false;
+            vector<int> child_colours = colours;
+            individualize(child_colours, vertex);
+            if (get_shape(child_colours) != path_shapes[level + 1])
+                continue;
+            if (search_leaf(level + 1, child_colours))
+                return true;
+        }
+        return false;
+    }
+
+    int find_orbit(int vertex) {
+        while (orbit_parents[vertex] != vertex) {
+            orbit_parents[vertex] = orbit_parents[orbit_parents[vertex]];
+            vertex = orbit_parents[vertex];
+        }
+        return vertex;
+    }
+
+    void add_to_orbits(const vector<int> &permutation) {
+        for (int vertex = 0; vertex < num_vertices; ++vertex) {
+            int orbit1 = find_orbit(vertex);
+            int orbit2 = find_orbit(permutation[vertex]);
+            if (orbit1 != orbit2)
+                orbit_parents[max(orbit1, orbit2)] = min(orbit1, orbit2);
+        }
+    }
+
+public:
+    AutomorphismSearch(const vector<vector<pair<int, int>>> &adjacency, double max_time)
+        : adjacency(adjacency),
+          num_vertices(adjacency.size()),
+          max_time(max_time),
+          remaining_backtracks(0),
+          orbit_parents(adjacency.size()),
+          signatures(adjacency.size()),
+          order(adjacency.size()),
+          refined_colours(adjacency.size()) {
+        iota(orbit_parents.begin(), orbit_parents.end(), 0);
+    }
+
+    vector<vector<int>> compute_generators(const vector<int> &vertex_colours) {
+        if (num_vertices == 0)
+            return {};
+
+        vector<int> distinct_colours = vertex_colours;
+        sort(distinct_colours.begin(), distinct_colours.end());
+        distinct_colours.erase(unique(distinct_colours.begin(), distinct_colours.end()), distinct_colours.end());
+        vector<int> colours(num_vertices);
+        for (int vertex = 0; vertex < num_vertices; ++vertex) {
+            colours[vertex] = lower_bound(distinct_colours.begin(), distinct_colours.end(), vertex_colours[vertex]) - distinct_colours.begin();
+        }
+        refine(colours);
+
+        // Without a complete first path there is nothing to compare other paths with.
+        while (true) {
+            if (is_out_of_time())
+                return {};
+            vector<int> shape = get_shape(colours);
+            path_shapes.push_back(shape);
+            int target_colour = get_target_colour(shape);
+            if (target_colour == -1)
+                break;
+            int vertex = find(colours.begin(), colours.end(), target_colour) - colours.begin();
+            path_colours.push_back(colours);
+            path_vertices.push_back(vertex);
+            individualize(colours, vertex);
+        }
+        first_leaf_vertices.resize(num_vertices);
+        for (int vertex = 0; vertex < num_vertices; ++vertex) {
+            first_leaf_vertices[colours[vertex]] = vertex;
+        }
+
+        int depth = path_vertices.size();
+        for (int level = depth - 1; level >= 0; --level) {
+            const vector<int> &level_colours = path_colours[level];
+            int path_vertex = path_vertices[level];
+            // One vertex of each orbit is enough, and a failed vertex stands for its orbit.
+            vector<int> tried_vertices = {path_vertex};
+            for (int vertex = 0; vertex < num_vertices; ++vertex) {
+                if (level_colours[vertex] != level_colours[path_vertex])
+                    continue;
+                if (is_out_of_time())
+                    return move(generators);
+                int orbit = find_orbit(vertex);
+                if (any_of(tried_vertices.begin(), tried_vertices.end(),
+                           [&](int tried_vertex) {return find_orbit(tried_vertex) == orbit;}))
+                    continue;
+                tried_vertices.push_back(vertex);
+
+                vector<int> candidate_colours = level_colours;
+                individualize(candidate_colours, vertex);
+                if (get_shape(candidate_colours) != path_shapes[level + 1])
+                    continue;
+                remaining_backtracks = 4 * (depth - level) + 16;
+                if (search_leaf(level + 1, candidate_colours))
+                    add_to_orbits(generators.back());
+            }
+        }
+        return move(generators);
+    }
+};
+}
+
+int Graph::add_vertex(int colour) {
+    vertex_colours.push_back(colour);
+    adjacency.emplace_back();
+    return vertex_colours.size() - 1;
+}
+
+void Graph::add_edge(int vertex1, int vertex2, int label) {
+    adjacency[vertex1].emplace_back(label, vertex2);
+    adjacency[vertex2].emplace_back(label, vertex1);
+}
+
+vector<vector<int>> Graph::compute_generators(double max_time) {
+    for (vector<pair<int, int>> &neighbours : adjacency) {
+        sort(neighbours.begin(), neighbours.end());
+    }
+    AutomorphismSearch search(adjacency, max_time);
+    return search.compute_generators(vertex_colours);
+}
+}
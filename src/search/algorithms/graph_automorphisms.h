@@ -0,0 +1,50 @@
+#ifndef ALGORITHMS_GRAPH_AUTOMORPHISMS_H
+#define ALGORITHMS_GRAPH_AUTOMORPHISMS_H
+
+#include <utility>
+#include <vector>
+
+/*
+  Automorphisms of undirected graphs with coloured vertices and labelled
+  edges, computed with colour refinement and individualization (in the
+  spirit of nauty and bliss, but without their more elaborate pruning).
+
+  Colour refinement splits the vertices of a colour by the multisets of
+  (label, colour) pairs of their edges until the partition is equitable.
+  The search follows a first path from the refined partition to a
+  discrete one, individualizing the smallest vertex of the first
+  non-singleton cell on each level. Then, from the deepest level to the
+  root, it tries to reach a discrete partition of the same shape after
+  individualizing another vertex of the same cell. The vertex mapping
+  between the two discrete partitions is an automorphism if it preserves
+  all edges, which is checked explicitly. Vertices in the same orbit of
+  the generators found so far are skipped.
+
+  The generators are sound but not necessarily complete: a candidate that
+  does not yield an automorphism within a small number of backtracks is
+  given up, and the search stops when its time limit is reached.
+*/
+
+namespace graph_automorphisms {
+class Graph {
+    std::vector<int> vertex_colours;
+    // Pairs of edge label and neighbour, sorted once the graph is complete.
+    std::vector<std::vector<std::pair<int, int>>> adjacency;
+
+public:
+    int add_vertex(int colour);
+    void add_edge(int vertex1, int vertex2, int label);
+
+    int get_num_vertices() const {
+        return vertex_colours.size();
+    }
+
+    /*
+      Return permutations of the vertices that generate a subgroup of the
+      automorphism group of the graph.
+    */
+    std::vector<std::vector<int>> compute_generators(double max_time);
+};
+}
+
+#endif
@@ -280,6 +280,10 @@ public:
         return num_entries;
     }
 
+    size_t get_memory_usage_in_bytes() const {
+        return buckets.capacity() * sizeof(Bucket);
+    }
+
     /*
       Insert a key into the hash set.
 
@@ -33,6 +33,30 @@ static string sanitize_arg_string(string s) {
     return s;
 }
 
+static size_t parse_memory_arg(const string &name, const string &value) {
+    // Amounts of memory are given in bytes, optionally with a k, m or g suffix.
+    size_t pos;
+    unsigned long long amount;
+    try {
+        amount = stoull(value, &pos);
+    } catch (invalid_argument &) {
+        throw ArgError("argument for " + name + " must be an amount of memory");
+    } catch (out_of_range &) {
+        throw ArgError("argument for " + name + " is out of range");
+    }
+    string suffix = value.substr(pos);
+    if (suffix == "k") {
+        amount <<= 10;
+    } else if (suffix == "m") {
+        amount <<= 20;
+    } else if (suffix == "g") {
+        amount <<= 30;
+    } else if (!suffix.empty()) {
+        throw ArgError("unknown suffix for " + name + ": " + suffix);
+    }
+    return amount;
+}
+
 static int parse_int_arg(const string &name, const string &value) {
     try {
         return stoi(value);
@@ -112,6 +136,47 @@ static shared_ptr<SearchEngine> parse_cmd_line_aux(
                 throw ArgError("missing argument after --open-limit");
             ++i;
             SearchEngine::open_limit = stoul(args[i]);
+        } else if (arg == "--open-memory-budget") {
+            if (is_last)
+                throw ArgError("missing argument after --open-memory-budget");
+            ++i;
+            SearchEngine::open_memory_budget = parse_memory_arg(arg, sanitize_arg_string(args[i]));
+        } else if (arg == "--low-water-mark") {
+            if (is_last)
+                throw ArgError("missing argument after --low-water-mark");
+            ++i;
+            SearchEngine::low_water_mark = stod(args[i]);
+            if (SearchEngine::low_water_mark < 0 || SearchEngine::low_water_mark >= 1)
+                throw ArgError("argument for --low-water-mark must be in [0, 1)");
+        } else if (arg == "--threshold-growth-ratio") {
+            if (is_last)
+                throw ArgError("missing argument after --threshold-growth-ratio");
+            ++i;
+            SearchEngine::threshold_growth_ratio = stod(args[i]);
+            if (SearchEngine::threshold_growth_ratio != 0 && SearchEngine::threshold_growth_ratio <= 1)
+                throw ArgError("argument for --threshold-growth-ratio must be 0 or greater than 1");
+        } else if (arg == "--spill-directory") {
+            if (is_last)
+                throw ArgError("missing argument after --spill-directory");
+            ++i;
+            SearchEngine::spill_directory = args[i];
+        } else if (arg == "--checkpoint") {
+            if (is_last)
+                throw ArgError("missing argument after --checkpoint");
+            ++i;
+            SearchEngine::checkpoint_file = args[i];
+        } else if (arg == "--checkpoint-interval") {
+            if (is_last)
+                throw ArgError("missing argument after --checkpoint-interval");
+            ++i;
+            SearchEngine::checkpoint_interval = parse_int_arg(arg, args[i]);
+            if (SearchEngine::checkpoint_interval <= 0)
+                throw ArgError("argument for --checkpoint-interval must be positive");
+        } else if (arg == "--resume") {
+            if (is_last)
+                throw ArgError("missing argument after --resume");
+            ++i;
+            SearchEngine::resume_file = args[i];
         } else if (arg == "--time-limit") {
             if (is_last)
                 throw ArgError("missing argument after --time-limit");
@@ -124,6 +189,54 @@ static shared_ptr<SearchEngine> parse_cmd_line_aux(
             SearchEngine::second_phase_lower_bound = {stoi(args[i])};
         } else if (arg == "--partial-expansion") {
             SearchEngine::using_partial_expansion = true;
+        } else if (arg == "--enhanced-partial-expansion") {
+            SearchEngine::using_enhanced_partial_expansion = true;
+        } else if (arg == "--move-pruning") {
+            SearchEngine::using_move_pruning = true;
+        } else if (arg == "--transient-second-phase") {
+            SearchEngine::using_transient_second_phase = true;
+        } else if (arg == "--whole-node-expansion") {
+            SearchEngine::using_whole_node_expansion = true;
+        } else if (arg == "--deferred-evaluation") {
+            SearchEngine::using_deferred_evaluation = true;
+        } else if (arg == "--frontier-pruning") {
+            SearchEngine::using_frontier_pruning = true;
+        } else if (arg == "--symmetry-pruning") {
+            SearchEngine::using_symmetry_pruning = true;
+        } else if (arg == "--transposition-table-memory") {
+            if (is_last)
+                throw ArgError("missing argument after --transposition-table-memory");
+            ++i;
+            SearchEngine::transposition_table_memory = parse_memory_arg(arg, sanitize_arg_string(args[i]));
+        } else if (arg == "--h-cache-memory") {
+            if (is_last)
+                throw ArgError("missing argument after --h-cache-memory");
+            ++i;
+            SearchEngine::h_cache_memory = parse_memory_arg(arg, sanitize_arg_string(args[i]));
+        } else if (arg == "--perimeter-memory") {
+            if (is_last)
+                throw ArgError("missing argument after --perimeter-memory");
+            ++i;
+            SearchEngine::perimeter_memory = parse_memory_arg(arg, sanitize_arg_string(args[i]));
+        } else if (arg == "--dead-end-memo-memory") {
+            if (is_last)
+                throw ArgError("missing argument after --dead-end-memo-memory");
+            ++i;
+            SearchEngine::dead_end_memo_memory = parse_memory_arg(arg, sanitize_arg_string(args[i]));
+        } else if (arg == "--first-phase-threads") {
+            if (is_last)
+                throw ArgError("missing argument after --first-phase-threads");
+            ++i;
+            SearchEngine::first_phase_threads = parse_int_arg(arg, args[i]);
+            if (SearchEngine::first_phase_threads < 1)
+                throw ArgError("argument for --first-phase-threads must be positive");
+        } else if (arg == "--second-phase-threads") {
+            if (is_last)
+                throw ArgError("missing argument after --second-phase-threads");
+            ++i;
+            SearchEngine::second_phase_threads = parse_int_arg(arg, args[i]);
+            if (SearchEngine::second_phase_threads < 1)
+                throw ArgError("argument for --second-phase-threads must be positive");
         } else if (utils::startswith(arg, "--") &&
                    registry.is_predefinition(arg.substr(2))) {
             if (is_last)
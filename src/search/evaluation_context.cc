@@ -55,6 +55,16 @@ const EvaluationResult &EvaluationContext::get_result(Evaluator *evaluator) {
     return result;
 }
 
+void EvaluationContext::set_result(Evaluator *evaluator, const EvaluationResult &result) {
+    assert(cache[evaluator].is_uninitialized());
+    cache[evaluator] = result;
+    if (statistics &&
+        evaluator->is_used_for_counting_evaluations() &&
+        result.get_count_evaluation()) {
+        statistics->inc_evaluations();
+    }
+}
+
 const EvaluatorCache &EvaluationContext::get_cache() const {
     return cache;
 }
@@ -89,6 +89,11 @@ public:
         SearchStatistics *statistics = nullptr, bool calculate_preferred = false);
 
     const EvaluationResult &get_result(Evaluator *eval);
+    /*
+      Store a result that eval computed outside of get_result(), e.g. for a
+      batch of successor states (see Evaluator::compute_successor_results).
+    */
+    void set_result(Evaluator *eval, const EvaluationResult &result);
     const EvaluatorCache &get_cache() const;
     const State &get_state() const;
     int get_g_value() const;
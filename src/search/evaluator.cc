@@ -1,5 +1,6 @@
 #include "evaluator.h"
 
+#include "evaluation_context.h"
 #include "option_parser.h"
 #include "plugin.h"
 
@@ -25,6 +26,13 @@ bool Evaluator::dead_ends_are_reliable() const {
     return true;
 }
 
+void Evaluator::compute_successor_results(
+    const State &, const vector<OperatorID> &,
+    vector<EvaluationContext> &successor_contexts) {
+    for (EvaluationContext &eval_context : successor_contexts)
+        eval_context.get_result(this);
+}
+
 void Evaluator::report_value_for_initial_state(const EvaluationResult &result) const {
     assert(use_for_reporting_minima);
     utils::g_log << "Initial heuristic value for " << description << ": ";
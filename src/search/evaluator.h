@@ -2,8 +2,10 @@
 #define EVALUATOR_H
 
 #include "evaluation_result.h"
+#include "operator_id.h"
 
 #include <set>
+#include <vector>
 
 class EvaluationContext;
 class State;
@@ -76,6 +78,20 @@ public:
     virtual EvaluationResult compute_result(
         EvaluationContext &eval_context) = 0;
 
+    /*
+      compute_successor_results should compute the results for a batch
+      of evaluation contexts whose states are all successors of
+      parent_state and store them in the contexts. The state of
+      successor_contexts[i] is the result of applying operators[i] in
+      parent_state. Evaluators can override it to share work between the
+      siblings, which differ from their parent in only a few facts.
+
+      The default implementation evaluates every context on its own.
+    */
+    virtual void compute_successor_results(
+        const State &parent_state, const std::vector<OperatorID> &operators,
+        std::vector<EvaluationContext> &successor_contexts);
+
     void report_value_for_initial_state(const EvaluationResult &result) const;
     void report_new_minimum_value(const EvaluationResult &result) const;
 
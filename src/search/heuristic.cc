@@ -50,16 +50,18 @@ EvaluationResult Heuristic::compute_result(EvaluationContext &eval_context) {
 
     const State &state = eval_context.get_state();
     bool calculate_preferred = eval_context.get_calculate_preferred();
+    // Unregistered states cannot be looked up in the per-state cache.
+    bool use_cache = cache_evaluator_values && state.get_registry();
 
     int heuristic = NO_VALUE;
 
-    if (!calculate_preferred && cache_evaluator_values &&
+    if (!calculate_preferred && use_cache &&
         heuristic_cache[state].h != NO_VALUE && !heuristic_cache[state].dirty) {
         heuristic = heuristic_cache[state].h;
         result.set_count_evaluation(false);
     } else {
         heuristic = compute_heuristic(state);
-        if (cache_evaluator_values) {
+        if (use_cache) {
             heuristic_cache[state] = HEntry(heuristic, false);
         }
         result.set_count_evaluation(true);
@@ -95,6 +97,60 @@ EvaluationResult Heuristic::compute_result(EvaluationContext &eval_context) {
     return result;
 }
 
+void Heuristic::compute_successor_heuristics(
+    const State &, const vector<OperatorID> &,
+    const vector<State> &ancestor_successor_states, vector<int> &heuristics) {
+    for (const State &ancestor_successor_state : ancestor_successor_states)
+        heuristics.push_back(compute_heuristic(ancestor_successor_state));
+}
+
+void Heuristic::compute_successor_results(
+    const State &parent_state, const vector<OperatorID> &operators,
+    vector<EvaluationContext> &successor_contexts) {
+    assert(operators.size() == successor_contexts.size());
+    vector<OperatorID> successor_operators;
+    vector<State> successor_states;
+    vector<EvaluationContext *> computed_contexts;
+    for (size_t i = 0; i < successor_contexts.size(); ++i) {
+        EvaluationContext &eval_context = successor_contexts[i];
+        const State &state = eval_context.get_state();
+        bool use_cache = cache_evaluator_values && state.get_registry();
+        // Preferred operators and cached estimates are handled one by one.
+        if (eval_context.get_calculate_preferred() ||
+            (use_cache && heuristic_cache[state].h != NO_VALUE &&
+             !heuristic_cache[state].dirty)) {
+            eval_context.get_result(this);
+        } else {
+            successor_operators.push_back(operators[i]);
+            successor_states.push_back(state);
+            computed_contexts.push_back(&eval_context);
+        }
+    }
+
+    if (successor_states.empty())
+        return;
+
+    vector<int> heuristics;
+    heuristics.reserve(successor_states.size());
+    compute_successor_heuristics(
+        parent_state, successor_operators, successor_states, heuristics);
+    assert(heuristics.size() == successor_states.size());
+    preferred_operators.clear();
+
+    for (size_t i = 0; i < computed_contexts.size(); ++i) {
+        int heuristic = heuristics[i];
+        assert(heuristic == DEAD_END || heuristic >= 0);
+        if (cache_evaluator_values && successor_states[i].get_registry()) {
+            heuristic_cache[successor_states[i]] = HEntry(heuristic, false);
+        }
+        EvaluationResult result;
+        result.set_evaluator_value(
+            heuristic == DEAD_END ? EvaluationResult::INFTY : heuristic);
+        result.set_count_evaluation(true);
+        computed_contexts[i]->set_result(this, result);
+    }
+}
+
 bool Heuristic::does_cache_estimates() const {
     return cache_evaluator_values;
 }
@@ -63,6 +63,19 @@ protected:
 
     virtual int compute_heuristic(const State &ancestor_state) = 0;
 
+    /*
+      Append the heuristic values of the given successors of
+      ancestor_parent_state to heuristics, where ancestor_successor_states[i]
+      is generated by operators[i]. Heuristics can override this to reuse
+      the computation for the parent. The default implementation calls
+      compute_heuristic() for every successor.
+    */
+    virtual void compute_successor_heuristics(
+        const State &ancestor_parent_state,
+        const std::vector<OperatorID> &operators,
+        const std::vector<State> &ancestor_successor_states,
+        std::vector<int> &heuristics);
+
     /*
       Usage note: Marking the same operator as preferred multiple times
       is OK -- it will only appear once in the list of preferred
@@ -84,6 +97,9 @@ public:
 
     virtual EvaluationResult compute_result(
         EvaluationContext &eval_context) override;
+    virtual void compute_successor_results(
+        const State &parent_state, const std::vector<OperatorID> &operators,
+        std::vector<EvaluationContext> &successor_contexts) override;
 
     virtual bool does_cache_estimates() const override;
     virtual bool is_estimate_cached(const State &state) const override;
@@ -7,9 +7,11 @@
 #include "../task_proxy.h"
 
 #include "../task_utils/task_properties.h"
+#include "../utils/hash.h"
 #include "../utils/logging.h"
 #include "../utils/memory.h"
 
+#include <algorithm>
 #include <iostream>
 
 using namespace std;
@@ -17,7 +19,12 @@ using namespace std;
 namespace lm_cut_heuristic {
 LandmarkCutHeuristic::LandmarkCutHeuristic(const Options &opts)
     : Heuristic(opts),
-      landmark_generator(utils::make_unique_ptr<LandmarkCutLandmarks>(task_proxy)) {
+      landmark_generator(utils::make_unique_ptr<LandmarkCutLandmarks>(task_proxy)),
+      repair_successors(opts.get<bool>("repair_successors")),
+      incremental(opts.get<bool>("incremental")),
+      max_inherited_generations(opts.get<int>("max_inherited_generations")),
+      min_inherited_share(opts.get<double>("min_inherited_share")),
+      operator_cost_reductions(task_proxy.get_operators().size(), 0) {
     utils::g_log << "Initializing landmark cut heuristic..." << endl;
 }
 
@@ -37,6 +44,159 @@ int LandmarkCutHeuristic::compute_heuristic(const State &ancestor_state) {
     return total_cost;
 }
 
+void LandmarkCutHeuristic::compute_successor_heuristics(
+    const State &ancestor_parent_state,
+    const vector<OperatorID> &operators,
+    const vector<State> &ancestor_successor_states,
+    vector<int> &heuristics) {
+    if (incremental) {
+        compute_incremental_successor_heuristics(
+            ancestor_parent_state, operators, ancestor_successor_states,
+            heuristics);
+        return;
+    }
+    if (!repair_successors) {
+        Heuristic::compute_successor_heuristics(
+            ancestor_parent_state, operators, ancestor_successor_states,
+            heuristics);
+        return;
+    }
+    State parent_state = convert_ancestor_state(ancestor_parent_state);
+    parent_state.unpack();
+    landmark_generator->set_parent_state(parent_state);
+
+    for (const State &ancestor_successor_state : ancestor_successor_states) {
+        State successor_state = convert_ancestor_state(ancestor_successor_state);
+        successor_state.unpack();
+        int total_cost = 0;
+        bool dead_end = landmark_generator->compute_successor_landmarks(
+            successor_state,
+            [&total_cost](int cut_cost) {total_cost += cut_cost;},
+            nullptr);
+        heuristics.push_back(dead_end ? DEAD_END : total_cost);
+    }
+}
+/*
+  Find the given state among the evaluated successors on the path and drop
+  the layers above it. If the state is not on the path (e.g. because its
+  h-value came from a cache or the search jumped), the search has left the
+  path, so all layers are dropped and the next lookups stay cheap.
+*/
+const LandmarkCutHeuristic::EvaluatedState *LandmarkCutHeuristic::find_on_path(
+    const vector<int> &values, uint64_t hash) {
+    for (size_t layer = path_layers.size(); layer-- > 0;) {
+        for (const EvaluatedState &evaluated_state : path_layers[layer]) {
+            if (evaluated_state.hash == hash && evaluated_state.values == values) {
+                path_layers.resize(layer + 1);
+                return &evaluated_state;
+            }
+        }
+    }
+    path_layers.clear();
+    return nullptr;
+}
+
+/*
+  Incremental LM-cut: if the successor of s generated by o is s', every
+  landmark of s that does not contain o is a landmark of s', since
+  prefixing a plan for s' with o yields a plan for s. So the landmarks of
+  the parent that do not contain the generating operator are kept with
+  their costs, which are a cost partitioning, and LM-cut only computes the
+  remaining landmarks under the reduced costs.
+
+  The successor is computed from scratch if the landmarks of the parent
+  are unknown, if they were inherited for max_inherited_generations
+  generations, or if the kept landmarks carry less than
+  min_inherited_share of the h-value of the parent. This bounds how far
+  the cost partitioning drifts from the one of a fresh LM-cut.
+*/
+void LandmarkCutHeuristic::compute_incremental_successor_heuristics(
+    const State &ancestor_parent_state,
+    const vector<OperatorID> &operators,
+    const vector<State> &ancestor_successor_states,
+    vector<int> &heuristics) {
+    State parent_state = convert_ancestor_state(ancestor_parent_state);
+    parent_state.unpack();
+    const vector<int> &parent_values = parent_state.get_unpacked_values();
+    const EvaluatedState *parent = find_on_path(parent_values, utils::get_hash64(parent_values));
+    if (parent && parent->inherited_generations >= max_inherited_generations)
+        parent = nullptr;
+    int parent_cost = 0;
+    if (parent) {
+        for (int cost : parent->landmark_costs)
+            parent_cost += cost;
+    }
+
+    vector<EvaluatedState> layer;
+    layer.reserve(ancestor_successor_states.size());
+    for (size_t i = 0; i < ancestor_successor_states.size(); ++i) {
+        State successor_state = convert_ancestor_state(ancestor_successor_states[i]);
+        successor_state.unpack();
+        layer.emplace_back();
+        EvaluatedState &successor = layer.back();
+        successor.values = successor_state.get_unpacked_values();
+        successor.hash = utils::get_hash64(successor.values);
+        successor.inherited_generations = 0;
+
+        int total_cost = 0;
+        if (parent) {
+            int op_id = operators[i].get_index();
+            int begin = 0;
+            for (size_t lm = 0; lm < parent->landmark_costs.size(); ++lm) {
+                int end = parent->landmark_ends[lm];
+                auto first = parent->landmark_operators.begin() + begin;
+                auto last = parent->landmark_operators.begin() + end;
+                if (find(first, last, op_id) == last) {
+                    int cost = parent->landmark_costs[lm];
+                    for (auto it = first; it != last; ++it)
+                        operator_cost_reductions[*it] += cost;
+                    successor.landmark_operators.insert(
+                        successor.landmark_operators.end(), first, last);
+                    successor.landmark_ends.push_back(
+                        successor.landmark_operators.size());
+                    successor.landmark_costs.push_back(cost);
+                    total_cost += cost;
+                }
+                begin = end;
+            }
+
+            if (total_cost < min_inherited_share * parent_cost) {
+                // The generating operator breaks too much of the cost partitioning of the parent.
+                fill(operator_cost_reductions.begin(),
+                     operator_cost_reductions.end(), 0);
+                successor.landmark_operators.clear();
+                successor.landmark_ends.clear();
+                successor.landmark_costs.clear();
+                total_cost = 0;
+            } else {
+                successor.inherited_generations = parent->inherited_generations + 1;
+            }
+        }
+
+        bool dead_end = landmark_generator->compute_remaining_landmarks(
+            successor_state, operator_cost_reductions, nullptr,
+            [&successor, &total_cost](const vector<int> &landmark, int cost) {
+                successor.landmark_operators.insert(
+                    successor.landmark_operators.end(),
+                    landmark.begin(), landmark.end());
+                successor.landmark_ends.push_back(
+                    successor.landmark_operators.size());
+                successor.landmark_costs.push_back(cost);
+                total_cost += cost;
+            });
+        heuristics.push_back(dead_end ? DEAD_END : total_cost);
+
+        if (successor.inherited_generations > 0) {
+            fill(operator_cost_reductions.begin(),
+                 operator_cost_reductions.end(), 0);
+        }
+    }
+
+    if (path_layers.size() == MAX_NUM_PATH_LAYERS)
+        path_layers.erase(path_layers.begin(), path_layers.begin() + MAX_NUM_PATH_LAYERS / 2);
+    path_layers.push_back(move(layer));
+}
+
 static shared_ptr<Heuristic> _parse(OptionParser &parser) {
     parser.document_synopsis("Landmark-cut heuristic", "");
     parser.document_language_support("action costs", "supported");
@@ -47,8 +207,43 @@ static shared_ptr<Heuristic> _parse(OptionParser &parser) {
     parser.document_property("safe", "yes");
     parser.document_property("preferred operators", "no");
 
+    parser.add_option<bool>(
+        "repair_successors",
+        "when evaluating the successors of a state together, compute the "
+        "h^max values of the parent once and repair them for each successor "
+        "instead of exploring the relaxed task from scratch. This only pays "
+        "off when successors differ from their parent in few facts and the "
+        "h^max values of most propositions do not depend on them.",
+        "false");
+    parser.add_option<bool>(
+        "incremental",
+        "when evaluating the successors of a state together, keep the "
+        "landmarks of the parent that do not contain the generating operator "
+        "and only compute the remaining ones. This needs the landmarks of the "
+        "parent, which are kept for the states along the search path, so it "
+        "suits depth-first searches. It can be less informed than computing "
+        "LM-cut from scratch.",
+        "false");
+    parser.add_option<int>(
+        "max_inherited_generations",
+        "with incremental, compute the landmarks from scratch once they were "
+        "inherited over this many generations",
+        "16",
+        Bounds("1", "infinity"));
+    parser.add_option<double>(
+        "min_inherited_share",
+        "with incremental, compute the landmarks of a successor from scratch "
+        "if the landmarks it inherits carry less than this share of the "
+        "h-value of its parent",
+        "0.5",
+        Bounds("0", "1"));
     Heuristic::add_options_to_parser(parser);
     Options opts = parser.parse();
+    if (parser.help_mode())
+        return nullptr;
+
+    if (opts.get<bool>("repair_successors") && opts.get<bool>("incremental"))
+        parser.error("repair_successors and incremental cannot be combined");
     if (parser.dry_run())
         return nullptr;
     else
@@ -3,7 +3,9 @@
 
 #include "../heuristic.h"
 
+#include <cstdint>
 #include <memory>
+#include <vector>
 
 namespace options {
 class Options;
@@ -13,9 +15,47 @@ namespace lm_cut_heuristic {
 class LandmarkCutLandmarks;
 
 class LandmarkCutHeuristic : public Heuristic {
+    static const size_t MAX_NUM_PATH_LAYERS = 1000;
+
+    // Landmarks of an evaluated state, kept for its successors.
+    struct EvaluatedState {
+        std::vector<int> values;
+        std::uint64_t hash;
+        // Number of generations since the landmarks were computed from scratch.
+        int inherited_generations;
+        // Landmark i consists of the operators in [landmark_ends[i - 1], landmark_ends[i]).
+        std::vector<int> landmark_operators;
+        std::vector<int> landmark_ends;
+        std::vector<int> landmark_costs;
+    };
+
     std::unique_ptr<LandmarkCutLandmarks> landmark_generator;
+    const bool repair_successors;
+    const bool incremental;
+    const int max_inherited_generations;
+    const double min_inherited_share;
+
+    /*
+      For incremental computation, the evaluated successors of the states
+      that were expanded along the current search path, one layer per
+      expanded state, the most recent one last.
+    */
+    std::vector<std::vector<EvaluatedState>> path_layers;
+    std::vector<int> operator_cost_reductions;
+
+    const EvaluatedState *find_on_path(const std::vector<int> &values, std::uint64_t hash);
+    void compute_incremental_successor_heuristics(
+        const State &ancestor_parent_state,
+        const std::vector<OperatorID> &operators,
+        const std::vector<State> &ancestor_successor_states,
+        std::vector<int> &heuristics);
 
     virtual int compute_heuristic(const State &ancestor_state) override;
+    virtual void compute_successor_heuristics(
+        const State &ancestor_parent_state,
+        const std::vector<OperatorID> &operators,
+        const std::vector<State> &ancestor_successor_states,
+        std::vector<int> &heuristics) override;
 public:
     explicit LandmarkCutHeuristic(const options::Options &opts);
     virtual ~LandmarkCutHeuristic() override;
@@ -143,6 +143,168 @@ void LandmarkCutLandmarks::first_exploration(const State &state) {
     }
 }
 
+void LandmarkCutLandmarks::save_parent_exploration() {
+    for (auto &var_props : propositions) {
+        for (RelaxedProposition &prop : var_props) {
+            prop.num_cheapest_achievers = 0;
+        }
+    }
+    artificial_goal.num_cheapest_achievers = 0;
+    for (RelaxedOperator &op : relaxed_operators) {
+        if (op.unsatisfied_preconditions)
+            continue;
+        int target_cost = op.h_max_supporter_cost + op.cost;
+        for (RelaxedProposition *effect : op.effects) {
+            if (effect->h_max_cost == target_cost)
+                ++effect->num_cheapest_achievers;
+        }
+    }
+    // Facts of the parent state are supported by the state itself.
+    for (size_t var = 0; var < parent_state_values.size(); ++var) {
+        propositions[var][parent_state_values[var]].num_cheapest_achievers =
+            numeric_limits<int>::max();
+    }
+
+    parent_h_max_costs.clear();
+    parent_num_cheapest_achievers.clear();
+    for (auto &var_props : propositions) {
+        for (RelaxedProposition &prop : var_props) {
+            parent_h_max_costs.push_back(
+                prop.status == UNREACHED ? -1 : prop.h_max_cost);
+            parent_num_cheapest_achievers.push_back(prop.num_cheapest_achievers);
+        }
+    }
+    parent_h_max_costs.push_back(
+        artificial_goal.status == UNREACHED ? -1 : artificial_goal.h_max_cost);
+    parent_num_cheapest_achievers.push_back(artificial_goal.num_cheapest_achievers);
+
+    parent_operators.clear();
+    for (RelaxedOperator &op : relaxed_operators) {
+        parent_operators.push_back(
+            {op.unsatisfied_preconditions, op.h_max_supporter_cost,
+             op.h_max_supporter});
+    }
+}
+
+void LandmarkCutLandmarks::restore_parent_exploration() {
+    size_t i = 0;
+    auto restore = [this, &i](RelaxedProposition &prop) {
+            int h_max_cost = parent_h_max_costs[i];
+            prop.status = h_max_cost == -1 ? UNREACHED : REACHED;
+            prop.h_max_cost = h_max_cost;
+            prop.num_cheapest_achievers = parent_num_cheapest_achievers[i];
+            ++i;
+        };
+    for (auto &var_props : propositions) {
+        for (RelaxedProposition &prop : var_props) {
+            restore(prop);
+        }
+    }
+    restore(artificial_goal);
+    artificial_precondition.status = REACHED;
+    artificial_precondition.h_max_cost = 0;
+
+    for (size_t op_id = 0; op_id < relaxed_operators.size(); ++op_id) {
+        RelaxedOperator &op = relaxed_operators[op_id];
+        const OperatorSnapshot &snapshot = parent_operators[op_id];
+        op.cost = op.base_cost;
+        op.unsatisfied_preconditions = snapshot.unsatisfied_preconditions;
+        op.h_max_supporter_cost = snapshot.h_max_supporter_cost;
+        op.h_max_supporter = snapshot.h_max_supporter;
+    }
+}
+
+/*
+  Compute the h^max values of successor_state from those of the parent
+  state, which have to be restored before.
+
+  The facts of the parent that do not hold in the successor and,
+  transitively, the propositions all of whose cheapest achievers have one
+  of them as precondition are marked as unreached.
+  These propositions are seeded from their achievers, and a Dijkstra
+  exploration starting from them and from the facts of the successor only
+  updates the operators whose preconditions changed.
+*/
+void LandmarkCutLandmarks::repair_first_exploration(
+    const State &successor_state) {
+    assert(priority_queue.empty());
+    const vector<int> &successor_values = successor_state.get_unpacked_values();
+
+    affected_propositions.clear();
+    // Facts of the successor have cost 0 anyway, so they are never affected.
+    for (size_t var = 0; var < successor_values.size(); ++var) {
+        if (parent_state_values[var] != successor_values[var]) {
+            RelaxedProposition *prop = &propositions[var][parent_state_values[var]];
+            prop->status = UNREACHED;
+            affected_propositions.push_back(prop);
+            propositions[var][successor_values[var]].num_cheapest_achievers =
+                numeric_limits<int>::max();
+        }
+    }
+    for (size_t i = 0; i < affected_propositions.size(); ++i) {
+        for (RelaxedOperator *relaxed_op : affected_propositions[i]->precondition_of) {
+            if (relaxed_op->unsatisfied_preconditions)
+                continue;
+            int target_cost = relaxed_op->h_max_supporter_cost + relaxed_op->cost;
+            for (RelaxedProposition *effect : relaxed_op->effects) {
+                if (effect->status != UNREACHED && effect->h_max_cost == target_cost &&
+                    --effect->num_cheapest_achievers == 0) {
+                    effect->status = UNREACHED;
+                    affected_propositions.push_back(effect);
+                }
+            }
+            relaxed_op->unsatisfied_preconditions = 1;
+            relaxed_op->h_max_supporter = 0;
+            relaxed_op->h_max_supporter_cost = numeric_limits<int>::max();
+        }
+    }
+
+    for (size_t var = 0; var < successor_values.size(); ++var) {
+        enqueue_if_necessary(&propositions[var][successor_values[var]], 0);
+    }
+    for (RelaxedProposition *prop : affected_propositions) {
+        for (RelaxedOperator *relaxed_op : prop->effect_of) {
+            int supporter_cost = 0;
+            for (RelaxedProposition *pre : relaxed_op->preconditions) {
+                if (pre->status == UNREACHED) {
+                    supporter_cost = -1;
+                    break;
+                }
+                supporter_cost = max(supporter_cost, pre->h_max_cost);
+            }
+            if (supporter_cost != -1)
+                enqueue_if_necessary(prop, supporter_cost + relaxed_op->cost);
+        }
+    }
+
+    while (!priority_queue.empty()) {
+        pair<int, RelaxedProposition *> top_pair = priority_queue.pop();
+        int popped_cost = top_pair.first;
+        RelaxedProposition *prop = top_pair.second;
+        if (prop->h_max_cost < popped_cost)
+            continue;
+        for (RelaxedOperator *relaxed_op : prop->precondition_of) {
+            RelaxedProposition *supporter = 0;
+            for (RelaxedProposition *pre : relaxed_op->preconditions) {
+                if (pre->status == UNREACHED) {
+                    supporter = 0;
+                    break;
+                }
+                if (!supporter || pre->h_max_cost > supporter->h_max_cost)
+                    supporter = pre;
+            }
+            if (!supporter)
+                continue;
+            relaxed_op->unsatisfied_preconditions = 0;
+            relaxed_op->h_max_supporter = supporter;
+            relaxed_op->h_max_supporter_cost = supporter->h_max_cost;
+            int target_cost = supporter->h_max_cost + relaxed_op->cost;
+            for (RelaxedProposition *effect : relaxed_op->effects)
+                enqueue_if_necessary(effect, target_cost);
+        }
+    }
+}
+
 void LandmarkCutLandmarks::first_exploration_incremental(
     vector<RelaxedOperator *> &cut) {
     assert(priority_queue.empty());
@@ -279,6 +441,46 @@ bool LandmarkCutLandmarks::compute_landmarks(
     for (RelaxedOperator &op : relaxed_operators) {
         op.cost = op.base_cost;
     }
+    first_exploration(state);
+    return compute_landmarks_after_first_exploration(
+        state, cost_callback, landmark_callback);
+}
+
+bool LandmarkCutLandmarks::compute_remaining_landmarks(
+    const State &state, const vector<int> &operator_cost_reductions,
+    CostCallback cost_callback, LandmarkCallback landmark_callback) {
+    for (RelaxedOperator &op : relaxed_operators) {
+        op.cost = op.base_cost;
+        if (op.original_op_id != -1)
+            op.cost -= operator_cost_reductions[op.original_op_id];
+        assert(op.cost >= 0);
+    }
+    first_exploration(state);
+    return compute_landmarks_after_first_exploration(
+        state, cost_callback, landmark_callback);
+}
+
+void LandmarkCutLandmarks::set_parent_state(const State &parent_state) {
+    for (RelaxedOperator &op : relaxed_operators) {
+        op.cost = op.base_cost;
+    }
+    first_exploration(parent_state);
+    parent_state_values = parent_state.get_unpacked_values();
+    save_parent_exploration();
+}
+
+bool LandmarkCutLandmarks::compute_successor_landmarks(
+    const State &successor_state, CostCallback cost_callback,
+    LandmarkCallback landmark_callback) {
+    restore_parent_exploration();
+    repair_first_exploration(successor_state);
+    return compute_landmarks_after_first_exploration(
+        successor_state, cost_callback, landmark_callback);
+}
+
+bool LandmarkCutLandmarks::compute_landmarks_after_first_exploration(
+    const State &state, CostCallback cost_callback,
+    LandmarkCallback landmark_callback) {
     // The following three variables could be declared inside the loop
     // ("second_exploration_queue" even inside second_exploration),
     // but having them here saves reallocations and hence provides a
@@ -286,7 +488,6 @@ bool LandmarkCutLandmarks::compute_landmarks(
     vector<RelaxedOperator *> cut;
     Landmark landmark;
     vector<RelaxedProposition *> second_exploration_queue;
-    first_exploration(state);
     // validate_h_max();  // too expensive to use even in regular debug mode
     if (artificial_goal.status == UNREACHED)
         return true;
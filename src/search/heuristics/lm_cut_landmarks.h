@@ -46,9 +46,18 @@ struct RelaxedProposition {
 
     PropositionStatus status;
     int h_max_cost;
+    // Number of operators achieving h_max_cost (only used for repairing h^max values).
+    int num_cheapest_achievers;
 };
 
 class LandmarkCutLandmarks {
+    // h^max data of an operator after the first exploration of a parent state.
+    struct OperatorSnapshot {
+        int unsatisfied_preconditions;
+        int h_max_supporter_cost;
+        RelaxedProposition *h_max_supporter;
+    };
+
     std::vector<RelaxedOperator> relaxed_operators;
     std::vector<std::vector<RelaxedProposition>> propositions;
     RelaxedProposition artificial_precondition;
@@ -56,6 +65,13 @@ class LandmarkCutLandmarks {
     int num_propositions;
     priority_queues::AdaptiveQueue<RelaxedProposition *> priority_queue;
 
+    std::vector<int> parent_state_values;
+    // h^max costs of the propositions of the parent state (-1 if unreached), artificial goal last.
+    std::vector<int> parent_h_max_costs;
+    std::vector<int> parent_num_cheapest_achievers;
+    std::vector<OperatorSnapshot> parent_operators;
+    std::vector<RelaxedProposition *> affected_propositions;
+
     void build_relaxed_operator(const OperatorProxy &op);
     void add_relaxed_operator(std::vector<RelaxedProposition *> &&precondition,
                               std::vector<RelaxedProposition *> &&effects,
@@ -64,6 +80,9 @@ class LandmarkCutLandmarks {
     void setup_exploration_queue();
     void setup_exploration_queue_state(const State &state);
     void first_exploration(const State &state);
+    void save_parent_exploration();
+    void restore_parent_exploration();
+    void repair_first_exploration(const State &successor_state);
     void first_exploration_incremental(std::vector<RelaxedOperator *> &cut);
     void second_exploration(const State &state,
                             std::vector<RelaxedProposition *> &second_exploration_queue,
@@ -80,6 +99,9 @@ class LandmarkCutLandmarks {
 
     void mark_goal_plateau(RelaxedProposition *subgoal);
     void validate_h_max() const;
+    bool compute_landmarks_after_first_exploration(
+        const State &state, std::function<void (int)> cost_callback,
+        std::function<void (const std::vector<int> &, int)> landmark_callback);
 public:
     using Landmark = std::vector<int>;
     using CostCallback = std::function<void (int)>;
@@ -103,6 +125,31 @@ public:
     */
     bool compute_landmarks(const State &state, CostCallback cost_callback,
                            LandmarkCallback landmark_callback);
+
+    /*
+      Like compute_landmarks(), but the cost of each operator is reduced by
+      operator_cost_reductions[op_id] first, e.g. by the costs of known
+      landmarks of the state. The reductions must not exceed the operator
+      costs. Only the landmarks found under the reduced costs are reported.
+    */
+    bool compute_remaining_landmarks(
+        const State &state, const std::vector<int> &operator_cost_reductions,
+        CostCallback cost_callback, LandmarkCallback landmark_callback);
+
+    /*
+      Compute the h^max values of parent_state, so that
+      compute_successor_landmarks() can repair them for each successor of
+      parent_state instead of exploring the relaxed task from scratch.
+    */
+    void set_parent_state(const State &parent_state);
+
+    /*
+      Like compute_landmarks() for a successor of the state last passed to
+      set_parent_state(). Both states have to be unpacked.
+    */
+    bool compute_successor_landmarks(
+        const State &successor_state, CostCallback cost_callback,
+        LandmarkCallback landmark_callback);
 };
 
 inline void RelaxedOperator::update_h_max_supporter() {
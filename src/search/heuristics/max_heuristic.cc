@@ -6,6 +6,7 @@
 #include "../utils/logging.h"
 
 #include <cassert>
+#include <limits>
 #include <vector>
 
 using namespace std;
@@ -25,8 +26,14 @@ namespace max_heuristic {
 
 // construction and destruction
 HSPMaxHeuristic::HSPMaxHeuristic(const Options &opts)
-    : RelaxationHeuristic(opts) {
+    : RelaxationHeuristic(opts),
+      repair_successors(opts.get<bool>("repair_successors")),
+      achievers(propositions.size()),
+      affected(propositions.size(), false),
+      affected_operators(unary_operators.size(), false) {
     utils::g_log << "Initializing HSP max heuristic..." << endl;
+    for (UnaryOperator &op : unary_operators)
+        achievers[op.effect].push_back(get_op_id(op));
 }
 
 // heuristic computation
@@ -53,7 +60,7 @@ void HSPMaxHeuristic::setup_exploration_queue_state(const State &state) {
     }
 }
 
-void HSPMaxHeuristic::relaxed_exploration() {
+void HSPMaxHeuristic::relaxed_exploration(bool stop_at_goals) {
     int unsolved_goals = goal_propositions.size();
     while (!queue.empty()) {
         pair<int, PropID> top_pair = queue.pop();
@@ -65,7 +72,7 @@ void HSPMaxHeuristic::relaxed_exploration() {
         assert(prop_cost <= distance);
         if (prop_cost < distance)
             continue;
-        if (prop->is_goal && --unsolved_goals == 0)
+        if (prop->is_goal && --unsolved_goals == 0 && stop_at_goals)
             return;
         for (OpID op_id : precondition_of_pool.get_slice(
                  prop->precondition_of, prop->num_precondition_occurences)) {
@@ -80,6 +87,17 @@ void HSPMaxHeuristic::relaxed_exploration() {
     }
 }
 
+int HSPMaxHeuristic::compute_goal_cost() const {
+    int total_cost = 0;
+    for (PropID goal_id : goal_propositions) {
+        int goal_cost = propositions[goal_id].cost;
+        if (goal_cost == -1)
+            return DEAD_END;
+        total_cost = max(total_cost, goal_cost);
+    }
+    return total_cost;
+}
+
 int HSPMaxHeuristic::compute_heuristic(const State &ancestor_state) {
     State state = convert_ancestor_state(ancestor_state);
 
@@ -87,17 +105,174 @@ int HSPMaxHeuristic::compute_heuristic(const State &ancestor_state) {
     setup_exploration_queue_state(state);
     relaxed_exploration();
 
-    int total_cost = 0;
-    for (PropID goal_id : goal_propositions) {
-        const Proposition *goal = get_proposition(goal_id);
-        int goal_cost = goal->cost;
-        if (goal_cost == -1)
-            return DEAD_END;
-        total_cost = max(total_cost, goal_cost);
+    return compute_goal_cost();
+}
+
+// Return the h^max cost of the effect of the given operator, or -1 if it is unreachable.
+int HSPMaxHeuristic::get_operator_cost(OpID op_id) const {
+    const UnaryOperator &op = unary_operators[op_id];
+    int cost = op.base_cost;
+    for (PropID pre_id : get_preconditions(op_id)) {
+        int pre_cost = propositions[pre_id].cost;
+        if (pre_cost == -1)
+            return -1;
+        cost = max(cost, op.base_cost + pre_cost);
+    }
+    return cost;
+}
+
+void HSPMaxHeuristic::set_cost(PropID prop_id, int cost) {
+    Proposition *prop = get_proposition(prop_id);
+    cost_trail.emplace_back(prop_id, prop->cost);
+    prop->cost = cost;
+}
+
+void HSPMaxHeuristic::set_num_cheapest_achievers(PropID prop_id, int num) {
+    num_cheapest_achievers_trail.emplace_back(prop_id, num_cheapest_achievers[prop_id]);
+    num_cheapest_achievers[prop_id] = num;
+}
+
+void HSPMaxHeuristic::enqueue_if_cheaper(PropID prop_id, int cost) {
+    int prop_cost = get_proposition(prop_id)->cost;
+    if (prop_cost == -1 || prop_cost > cost) {
+        set_cost(prop_id, cost);
+        queue.push(cost, prop_id);
+    }
+}
+
+/*
+  Compute h^max of successor_state from the complete exploration of its
+  parent, which is stored in the proposition costs and the unary operators.
+
+  Only the propositions whose cost may increase are recomputed: the facts
+  of the parent that do not hold in the successor and, transitively, the
+  propositions all of whose cheapest achievers have one of them as
+  precondition. Their costs are reset and seeded from their achievers.
+  Then, a Dijkstra exploration that starts from these propositions and from
+  the facts of the successor only follows operators with changed
+  preconditions. All changed costs are restored at the end.
+*/
+int HSPMaxHeuristic::compute_successor_heuristic(
+    const vector<int> &parent_values, const State &successor_state) {
+    const vector<int> &successor_values = successor_state.get_unpacked_values();
+    assert(queue.empty() && cost_trail.empty() && affected_props.empty());
+
+    // Facts of the successor have cost 0 anyway, so they are never affected.
+    for (size_t var = 0; var < parent_values.size(); ++var) {
+        if (parent_values[var] != successor_values[var]) {
+            PropID prop_id = get_prop_id(var, parent_values[var]);
+            affected[prop_id] = true;
+            affected_props.push_back(prop_id);
+            set_num_cheapest_achievers(
+                get_prop_id(var, successor_values[var]), numeric_limits<int>::max());
+        }
     }
+    for (size_t i = 0; i < affected_props.size(); ++i) {
+        const Proposition *prop = get_proposition(affected_props[i]);
+        for (OpID op_id : precondition_of_pool.get_slice(
+                 prop->precondition_of, prop->num_precondition_occurences)) {
+            if (affected_operators[op_id])
+                continue;
+            affected_operators[op_id] = true;
+            affected_ops.push_back(op_id);
+            const UnaryOperator &op = unary_operators[op_id];
+            if (op.unsatisfied_preconditions == 0 &&
+                propositions[op.effect].cost == op.cost) {
+                set_num_cheapest_achievers(
+                    op.effect, num_cheapest_achievers[op.effect] - 1);
+                if (num_cheapest_achievers[op.effect] == 0) {
+                    affected[op.effect] = true;
+                    affected_props.push_back(op.effect);
+                }
+            }
+        }
+    }
+
+    for (PropID prop_id : affected_props)
+        set_cost(prop_id, -1);
+    for (size_t var = 0; var < successor_values.size(); ++var)
+        enqueue_if_cheaper(get_prop_id(var, successor_values[var]), 0);
+    for (PropID prop_id : affected_props) {
+        for (OpID op_id : achievers[prop_id]) {
+            int op_cost = get_operator_cost(op_id);
+            if (op_cost != -1)
+                enqueue_if_cheaper(prop_id, op_cost);
+        }
+    }
+
+    while (!queue.empty()) {
+        pair<int, PropID> top_pair = queue.pop();
+        int distance = top_pair.first;
+        PropID prop_id = top_pair.second;
+        const Proposition *prop = get_proposition(prop_id);
+        if (prop->cost < distance)
+            continue;
+        for (OpID op_id : precondition_of_pool.get_slice(
+                 prop->precondition_of, prop->num_precondition_occurences)) {
+            int op_cost = get_operator_cost(op_id);
+            if (op_cost != -1)
+                enqueue_if_cheaper(unary_operators[op_id].effect, op_cost);
+        }
+    }
+
+    int total_cost = compute_goal_cost();
+
+    for (PropID prop_id : affected_props)
+        affected[prop_id] = false;
+    affected_props.clear();
+    for (OpID op_id : affected_ops)
+        affected_operators[op_id] = false;
+    affected_ops.clear();
+    for (auto it = cost_trail.rbegin(); it != cost_trail.rend(); ++it)
+        propositions[it->first].cost = it->second;
+    cost_trail.clear();
+    for (auto it = num_cheapest_achievers_trail.rbegin();
+         it != num_cheapest_achievers_trail.rend(); ++it)
+        num_cheapest_achievers[it->first] = it->second;
+    num_cheapest_achievers_trail.clear();
+
     return total_cost;
 }
 
+void HSPMaxHeuristic::compute_successor_heuristics(
+    const State &ancestor_parent_state,
+    const vector<OperatorID> &operators,
+    const vector<State> &ancestor_successor_states,
+    vector<int> &heuristics) {
+    if (!repair_successors) {
+        Heuristic::compute_successor_heuristics(
+            ancestor_parent_state, operators, ancestor_successor_states,
+            heuristics);
+        return;
+    }
+    State parent_state = convert_ancestor_state(ancestor_parent_state);
+    parent_state.unpack();
+
+    // Unlike for a single state, the exploration of the parent may not stop at the goals.
+    setup_exploration_queue();
+    setup_exploration_queue_state(parent_state);
+    relaxed_exploration(false);
+
+    // Facts of the parent are supported by the state itself.
+    num_cheapest_achievers.assign(propositions.size(), 0);
+    for (const UnaryOperator &op : unary_operators) {
+        if (op.unsatisfied_preconditions == 0 && propositions[op.effect].cost == op.cost)
+            ++num_cheapest_achievers[op.effect];
+    }
+    const vector<int> &parent_values = parent_state.get_unpacked_values();
+    for (size_t var = 0; var < parent_values.size(); ++var) {
+        num_cheapest_achievers[get_prop_id(var, parent_values[var])] =
+            numeric_limits<int>::max();
+    }
+
+    for (const State &ancestor_successor_state : ancestor_successor_states) {
+        State successor_state = convert_ancestor_state(ancestor_successor_state);
+        successor_state.unpack();
+        heuristics.push_back(
+            compute_successor_heuristic(parent_values, successor_state));
+    }
+}
+
 static shared_ptr<Heuristic> _parse(OptionParser &parser) {
     parser.document_synopsis("Max heuristic", "");
     parser.document_language_support("action costs", "supported");
@@ -112,6 +287,14 @@ static shared_ptr<Heuristic> _parse(OptionParser &parser) {
     parser.document_property("safe", "yes for tasks without axioms");
     parser.document_property("preferred operators", "no");
 
+    parser.add_option<bool>(
+        "repair_successors",
+        "when evaluating the successors of a state together, compute the "
+        "h^max values of the parent once and repair them for each successor "
+        "instead of exploring the relaxed task from scratch. This only pays "
+        "off when successors differ from their parent in few facts and the "
+        "h^max values of most propositions do not depend on them.",
+        "false");
     Heuristic::add_options_to_parser(parser);
     Options opts = parser.parse();
     if (parser.dry_run())
@@ -6,6 +6,8 @@
 #include "../algorithms/priority_queues.h"
 
 #include <cassert>
+#include <utility>
+#include <vector>
 
 namespace max_heuristic {
 using relaxation_heuristic::PropID;
@@ -17,9 +19,34 @@ using relaxation_heuristic::UnaryOperator;
 class HSPMaxHeuristic : public relaxation_heuristic::RelaxationHeuristic {
     priority_queues::AdaptiveQueue<PropID> queue;
 
+    const bool repair_successors;
+    /*
+      Data for repairing the costs of a complete exploration of a parent
+      state for its successors (see compute_successor_heuristics()).
+      achievers[prop_id] are the unary operators with effect prop_id, and
+      num_cheapest_achievers[prop_id] counts those that achieve it at its
+      cost in the parent exploration.
+    */
+    std::vector<std::vector<OpID>> achievers;
+    std::vector<int> num_cheapest_achievers;
+    std::vector<bool> affected;
+    std::vector<bool> affected_operators;
+    std::vector<PropID> affected_props;
+    std::vector<OpID> affected_ops;
+    std::vector<std::pair<PropID, int>> cost_trail;
+    std::vector<std::pair<PropID, int>> num_cheapest_achievers_trail;
+
     void setup_exploration_queue();
     void setup_exploration_queue_state(const State &state);
-    void relaxed_exploration();
+    void relaxed_exploration(bool stop_at_goals = true);
+
+    int compute_goal_cost() const;
+    int get_operator_cost(OpID op_id) const;
+    void set_cost(PropID prop_id, int cost);
+    void set_num_cheapest_achievers(PropID prop_id, int num);
+    void enqueue_if_cheaper(PropID prop_id, int cost);
+    int compute_successor_heuristic(
+        const std::vector<int> &parent_values, const State &successor_state);
 
     void enqueue_if_necessary(PropID prop_id, int cost) {
         assert(cost >= 0);
@@ -32,6 +59,11 @@ class HSPMaxHeuristic : public relaxation_heuristic::RelaxationHeuristic {
     }
 protected:
     virtual int compute_heuristic(const State &ancestor_state) override;
+    virtual void compute_successor_heuristics(
+        const State &ancestor_parent_state,
+        const std::vector<OperatorID> &operators,
+        const std::vector<State> &ancestor_successor_states,
+        std::vector<int> &heuristics) override;
 public:
     explicit HSPMaxHeuristic(const options::Options &opts);
 };
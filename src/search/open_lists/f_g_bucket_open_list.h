@@ -0,0 +1,372 @@
+#ifndef OPEN_LISTS_F_G_BUCKET_OPEN_LIST_H
+#define OPEN_LISTS_F_G_BUCKET_OPEN_LIST_H
+
+#include "../state_id.h"
+
+#include "../algorithms/segmented_vector.h"
+#include "../utils/collections.h"
+
+#include <algorithm>
+#include <cassert>
+#include <utility>
+#include <vector>
+
+/*
+  FGBucketOpenList is a two-level bucket open list for search engines with
+  integer f and g values that need to remove arbitrary entries from open
+  (e.g. when a state is reached again with a better g value).
+
+  Entries are ordered by minimal f, then maximal g, then maximal depth.
+
+  The first level is a vector of f-buckets indexed by f (relative to the
+  smallest f pushed so far), with a cursor to the first non-empty bucket as
+  in priority_queues::BucketQueue. Since g values can span a very large range
+  in tasks with real action costs, the second level stores only the g values
+  that actually occur in an f-bucket, sorted in increasing order, so that the
+  best g-bucket is always the last one. Pushing a g value that is larger than
+  all others of its f-bucket (the common case when successors are pushed
+  after their parent was popped) and popping are constant-time operations.
+
+  Within a g-bucket, entries are kept in a binary max-heap on depth. Entries
+  of equal depth leave the heap in no particular order (e.g. pushing a, b
+  and c with the same depth pops a, c, b).
+
+  The item vectors of emptied g-buckets are kept for reuse by new g-buckets,
+  so that popping the last entry of a g-bucket and pushing the successors
+  into a new one does not allocate every time.
+
+  Every entry is identified by the StateID of its state and at most one entry
+  per state can be in the open list at any time. The position of each entry
+  is stored in a segmented vector indexed by StateID, so entries can be
+  looked up and erased without handles.
+*/
+
+namespace f_g_bucket_open_list {
+template<class Entry>
+class FGBucketOpenList {
+    struct Item {
+        StateID state_id;
+        int depth;
+        Entry entry;
+
+        Item(StateID state_id, int depth, const Entry &entry)
+            : state_id(state_id), depth(depth), entry(entry) {
+        }
+    };
+
+    struct GBucket {
+        int g;
+        std::vector<Item> items;
+
+        GBucket(int g, std::vector<Item> &&items)
+            : g(g), items(std::move(items)) {
+        }
+    };
+
+    struct FBucket {
+        // Sorted by increasing g.
+        std::vector<GBucket> g_buckets;
+        int size;
+
+        FBucket()
+            : size(0) {
+        }
+    };
+
+    struct Location {
+        int f;
+        int g;
+        int index;
+
+        Location()
+            : f(-1), g(-1), index(-1) {
+        }
+    };
+
+    std::vector<FBucket> f_buckets;
+    int f_offset;
+    mutable int current_f_bucket_no;
+    segmented_vector::SegmentedVector<Location> locations;
+    int num_entries;
+    // Empty item vectors of removed g-buckets, with their capacity.
+    std::vector<std::vector<Item>> free_item_vectors;
+    static const size_t MAX_NUM_FREE_ITEM_VECTORS = 64;
+
+    FBucket &get_f_bucket(int f) {
+        if (f_buckets.empty()) {
+            f_offset = f;
+            current_f_bucket_no = 0;
+        } else if (f < f_offset) {
+            f_buckets.insert(f_buckets.begin(), f_offset - f, FBucket());
+            current_f_bucket_no += f_offset - f;
+            f_offset = f;
+        }
+        int f_bucket_no = f - f_offset;
+        if (f_bucket_no >= static_cast<int>(f_buckets.size()))
+            f_buckets.resize(f_bucket_no + 1);
+        else if (f_bucket_no < current_f_bucket_no)
+            current_f_bucket_no = f_bucket_no;
+        return f_buckets[f_bucket_no];
+    }
+
+    template<typename GBuckets>
+    static auto find_g_bucket(GBuckets &g_buckets, int g) -> decltype(g_buckets.begin()) {
+        if (!g_buckets.empty() && g_buckets.back().g == g)
+            return g_buckets.end() - 1;
+        return std::lower_bound(
+            g_buckets.begin(), g_buckets.end(), g,
+            [](const GBucket &g_bucket, int value) {
+                return g_bucket.g < value;
+            });
+    }
+
+    std::vector<Item> get_free_item_vector() {
+        std::vector<Item> items;
+        if (!free_item_vectors.empty()) {
+            items = std::move(free_item_vectors.back());
+            free_item_vectors.pop_back();
+        }
+        return items;
+    }
+
+    GBucket &get_g_bucket(FBucket &f_bucket, int g) {
+        if (f_bucket.g_buckets.empty() || f_bucket.g_buckets.back().g < g) {
+            f_bucket.g_buckets.emplace_back(g, get_free_item_vector());
+            return f_bucket.g_buckets.back();
+        }
+        auto it = find_g_bucket(f_bucket.g_buckets, g);
+        if (it == f_bucket.g_buckets.end() || it->g != g)
+            it = f_bucket.g_buckets.emplace(it, g, get_free_item_vector());
+        return *it;
+    }
+
+    Location &get_location(StateID state_id) {
+        assert(state_id.value >= 0);
+        if (state_id.value >= static_cast<int>(locations.size()))
+            locations.resize(state_id.value + 1);
+        return locations[state_id.value];
+    }
+
+    void update_current_f_bucket_no() const {
+        int num_f_buckets = f_buckets.size();
+        while (current_f_bucket_no < num_f_buckets &&
+               f_buckets[current_f_bucket_no].size == 0)
+            ++current_f_bucket_no;
+    }
+
+    void place(std::vector<Item> &items, Item &&item, int index) {
+        items[index] = std::move(item);
+        locations[items[index].state_id.value].index = index;
+    }
+
+    void sift_up(std::vector<Item> &items, int index) {
+        Item item = std::move(items[index]);
+        while (index > 0) {
+            int parent = (index - 1) / 2;
+            if (items[parent].depth >= item.depth)
+                break;
+            place(items, std::move(items[parent]), index);
+            index = parent;
+        }
+        place(items, std::move(item), index);
+    }
+
+    void sift_down(std::vector<Item> &items, int index) {
+        int size = items.size();
+        Item item = std::move(items[index]);
+        while (true) {
+            int child = 2 * index + 1;
+            if (child >= size)
+                break;
+            if (child + 1 < size && items[child + 1].depth > items[child].depth)
+                ++child;
+            if (item.depth >= items[child].depth)
+                break;
+            place(items, std::move(items[child]), index);
+            index = child;
+        }
+        place(items, std::move(item), index);
+    }
+
+    Entry remove(int f, int g, int index) {
+        FBucket &f_bucket = f_buckets[f - f_offset];
+        auto g_bucket_it = find_g_bucket(f_bucket.g_buckets, g);
+        assert(g_bucket_it != f_bucket.g_buckets.end() && g_bucket_it->g == g);
+        std::vector<Item> &items = g_bucket_it->items;
+        assert(utils::in_bounds(index, items));
+
+        Entry entry = std::move(items[index].entry);
+        locations[items[index].state_id.value] = Location();
+
+        int last = items.size() - 1;
+        if (index != last) {
+            int moved_state_id_value = items[last].state_id.value;
+            place(items, std::move(items[last]), index);
+            items.pop_back();
+            sift_up(items, index);
+            sift_down(items, locations[moved_state_id_value].index);
+        } else {
+            items.pop_back();
+        }
+
+        if (items.empty()) {
+            if (free_item_vectors.size() < MAX_NUM_FREE_ITEM_VECTORS)
+                free_item_vectors.push_back(std::move(items));
+            f_bucket.g_buckets.erase(g_bucket_it);
+        }
+        --f_bucket.size;
+        --num_entries;
+        return entry;
+    }
+
+public:
+    FGBucketOpenList()
+        : f_offset(0), current_f_bucket_no(0), num_entries(0) {
+    }
+
+    void push(StateID state_id, int f, int g, int depth, const Entry &entry) {
+        assert(f >= 0 && g >= 0);
+        assert(!contains(state_id));
+        FBucket &f_bucket = get_f_bucket(f);
+        std::vector<Item> &items = get_g_bucket(f_bucket, g).items;
+
+        Location &location = get_location(state_id);
+        location.f = f;
+        location.g = g;
+        location.index = items.size();
+        items.emplace_back(state_id, depth, entry);
+        sift_up(items, location.index);
+
+        ++f_bucket.size;
+        ++num_entries;
+    }
+
+    const Entry &top() const {
+        assert(!empty());
+        update_current_f_bucket_no();
+        return f_buckets[current_f_bucket_no].g_buckets.back().items.front().entry;
+    }
+
+    Entry pop() {
+        assert(!empty());
+        update_current_f_bucket_no();
+        const FBucket &f_bucket = f_buckets[current_f_bucket_no];
+        return remove(current_f_bucket_no + f_offset, f_bucket.g_buckets.back().g, 0);
+    }
+
+    int get_min_f() const {
+        assert(!empty());
+        update_current_f_bucket_no();
+        return current_f_bucket_no + f_offset;
+    }
+
+    // Number of entries with the given f value.
+    size_t count(int f) const {
+        int f_bucket_no = f - f_offset;
+        if (f_bucket_no < 0 || f_bucket_no >= static_cast<int>(f_buckets.size()))
+            return 0;
+        return f_buckets[f_bucket_no].size;
+    }
+
+    int get_max_f() const {
+        assert(!empty());
+        int f_bucket_no = f_buckets.size() - 1;
+        while (f_buckets[f_bucket_no].size == 0)
+            --f_bucket_no;
+        return f_bucket_no + f_offset;
+    }
+
+    // Remove all entries with the largest f value and append them to entries.
+    void pop_max_f_bucket(std::vector<Entry> &entries) {
+        assert(!empty());
+        while (f_buckets.back().size == 0)
+            f_buckets.pop_back();
+        FBucket &f_bucket = f_buckets.back();
+        for (GBucket &g_bucket : f_bucket.g_buckets) {
+            for (Item &item : g_bucket.items) {
+                locations[item.state_id.value] = Location();
+                entries.push_back(std::move(item.entry));
+            }
+        }
+        num_entries -= f_bucket.size;
+        f_buckets.pop_back();
+        current_f_bucket_no = std::min(current_f_bucket_no, static_cast<int>(f_buckets.size()));
+    }
+
+    bool contains(StateID state_id) const {
+        return state_id.value < static_cast<int>(locations.size()) &&
+               locations[state_id.value].index != -1;
+    }
+
+    const Entry &get(StateID state_id) const {
+        assert(contains(state_id));
+        const Location &location = locations[state_id.value];
+        const FBucket &f_bucket = f_buckets[location.f - f_offset];
+        return find_g_bucket(f_bucket.g_buckets, location.g)->items[location.index].entry;
+    }
+
+    Entry erase(StateID state_id) {
+        assert(contains(state_id));
+        Location location = locations[state_id.value];
+        return remove(location.f, location.g, location.index);
+    }
+
+    template<typename Function>
+    void for_each(Function function) const {
+        int num_f_buckets = f_buckets.size();
+        for (int f_bucket_no = current_f_bucket_no; f_bucket_no < num_f_buckets; ++f_bucket_no) {
+            for (const GBucket &g_bucket : f_buckets[f_bucket_no].g_buckets) {
+                for (const Item &item : g_bucket.items) {
+                    function(item.entry);
+                }
+            }
+        }
+    }
+
+    size_t size() const {
+        return num_entries;
+    }
+
+    size_t get_memory_usage_in_bytes() const {
+        size_t memory = locations.size() * sizeof(Location) +
+            f_buckets.capacity() * sizeof(FBucket);
+        for (const FBucket &f_bucket : f_buckets) {
+            memory += f_bucket.g_buckets.capacity() * sizeof(GBucket);
+            for (const GBucket &g_bucket : f_bucket.g_buckets) {
+                memory += g_bucket.items.capacity() * sizeof(Item);
+            }
+        }
+        memory += free_item_vectors.capacity() * sizeof(std::vector<Item>);
+        for (const std::vector<Item> &items : free_item_vectors) {
+            memory += items.capacity() * sizeof(Item);
+        }
+        return memory;
+    }
+
+    /*
+      Constant-time estimate of get_memory_usage_in_bytes() that counts the
+      entries instead of the capacities of the g-buckets, optionally with
+      num_additional_entries entries that are about to be pushed.
+    */
+    size_t get_estimated_memory_usage_in_bytes(size_t num_additional_entries = 0) const {
+        return locations.size() * sizeof(Location) +
+               f_buckets.capacity() * sizeof(FBucket) +
+               (num_entries + num_additional_entries) * sizeof(Item);
+    }
+
+    bool empty() const {
+        return num_entries == 0;
+    }
+
+    void clear() {
+        f_buckets.clear();
+        free_item_vectors.clear();
+        locations.resize(0);
+        f_offset = 0;
+        current_f_bucket_no = 0;
+        num_entries = 0;
+    }
+};
+}
+
+#endif
@@ -196,6 +196,16 @@ public:
         return num_states;
     }
 
+    // Returns the multipliers of the perfect hash function of the PDB
+    const std::vector<int> &get_hash_multipliers() const {
+        return hash_multipliers;
+    }
+
+    // Returns the h-value of the abstract state with the given index
+    int get_value_for_index(int index) const {
+        return distances[index];
+    }
+
     std::vector<std::vector<OperatorID>> && extract_wildcard_plan() {
         return std::move(wildcard_plan);
     };
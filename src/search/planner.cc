@@ -59,8 +59,9 @@ int main(int argc, const char **argv) {
 
     engine->save_plan_if_necessary();
     engine->print_statistics();
-    utils::g_log << "Search time: " << search_timer << endl;
-    utils::g_log << "Total time: " << utils::g_timer << endl;
+    // The times of a resumed search include those of its earlier runs.
+    utils::g_log << "Search time: " << utils::Duration(engine->get_resumed_search_time() + search_timer()) << endl;
+    utils::g_log << "Total time: " << utils::Duration(engine->get_resumed_search_time() + utils::g_timer()) << endl;
 
     ExitCode exitcode = engine->found_solution()
         ? ExitCode::SUCCESS
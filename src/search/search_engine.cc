@@ -15,6 +15,7 @@
 #include "utils/system.h"
 #include "utils/timer.h"
 
+#include <algorithm>
 #include <cassert>
 #include <iostream>
 #include <limits>
@@ -29,8 +30,28 @@ class PruningMethod;
 
 long unsigned int SearchEngine::time_limit = INT_MAX;
 long unsigned int SearchEngine::open_limit = INT_MAX;
+size_t SearchEngine::open_memory_budget = 0;
+double SearchEngine::low_water_mark = 0;
+double SearchEngine::threshold_growth_ratio = 0;
+string SearchEngine::spill_directory = "";
+string SearchEngine::checkpoint_file = "";
+int SearchEngine::checkpoint_interval = 600;
+string SearchEngine::resume_file = "";
 optional<int> SearchEngine::second_phase_lower_bound = {};
 bool SearchEngine::using_partial_expansion = false;
+bool SearchEngine::using_enhanced_partial_expansion = false;
+bool SearchEngine::using_move_pruning = false;
+bool SearchEngine::using_transient_second_phase = false;
+bool SearchEngine::using_whole_node_expansion = false;
+bool SearchEngine::using_deferred_evaluation = false;
+bool SearchEngine::using_frontier_pruning = false;
+bool SearchEngine::using_symmetry_pruning = false;
+size_t SearchEngine::transposition_table_memory = 0;
+size_t SearchEngine::h_cache_memory = 16 << 20;
+size_t SearchEngine::perimeter_memory = 0;
+size_t SearchEngine::dead_end_memo_memory = 0;
+int SearchEngine::first_phase_threads = 1;
+int SearchEngine::second_phase_threads = 1;
 
 successor_generator::SuccessorGenerator &get_successor_generator(const TaskProxy &task_proxy) {
     utils::g_log << "Building successor generator..." << flush;
@@ -62,7 +83,8 @@ SearchEngine::SearchEngine(const Options &opts)
       cost_type(opts.get<OperatorCost>("cost_type")),
       is_unit_cost(task_properties::is_unit_cost(task_proxy)),
       max_time(opts.get<double>("max_time")),
-      verbosity(opts.get<utils::Verbosity>("verbosity")) {
+      verbosity(opts.get<utils::Verbosity>("verbosity")),
+      resumed_search_time(0) {
     if (opts.get<int>("bound") < 0) {
         cerr << "error: negative cost bound " << opts.get<int>("bound") << endl;
         utils::exit_with(ExitCode::SEARCH_INPUT_ERROR);
@@ -95,7 +117,8 @@ void SearchEngine::set_plan(const Plan &p) {
 void SearchEngine::search() {
     initialize();
     // utils::CountdownTimer timer(max_time);
-    utils::CountdownTimer timer(time_limit);
+    // A resumed search only gets the time that its earlier runs left.
+    utils::CountdownTimer timer(max(0.0, time_limit - resumed_search_time));
     while (status == IN_PROGRESS) {
         status = step();
         if (timer.is_expired()) {
@@ -106,7 +129,7 @@ void SearchEngine::search() {
         }
     }
     // TODO: Revise when and which search times are logged.
-    utils::g_log << "Actual search time: " << timer.get_elapsed_time() << endl;
+    utils::g_log << "Actual search time: " << utils::Duration(resumed_search_time + timer.get_elapsed_time()) << endl;
 }
 
 bool SearchEngine::check_goal_and_set_plan(const State &state) {
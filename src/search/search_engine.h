@@ -10,6 +10,7 @@
 #include "state_registry.h"
 #include "task_proxy.h"
 
+#include <string>
 #include <vector>
 
 #include <optional>
@@ -55,6 +56,8 @@ protected:
     bool is_unit_cost;
     double max_time;
     const utils::Verbosity verbosity;
+    // Search time of the earlier runs of a search that was resumed from a checkpoint.
+    double resumed_search_time;
 
     virtual void initialize() {}
     virtual SearchStatus step() = 0;
@@ -69,6 +72,7 @@ public:
     virtual void save_plan_if_necessary();
     bool found_solution() const;
     SearchStatus get_status() const;
+    double get_resumed_search_time() const {return resumed_search_time;}
     const Plan &get_plan() const;
     void search();
     const SearchStatistics &get_statistics() const {return statistics;}
@@ -84,8 +88,28 @@ public:
 
     static long unsigned int time_limit;
     static long unsigned int open_limit;
+    static std::size_t open_memory_budget;
+    static double low_water_mark;
+    static double threshold_growth_ratio;
+    static std::string spill_directory;
+    static std::string checkpoint_file;
+    static int checkpoint_interval;
+    static std::string resume_file;
     static std::optional<int> second_phase_lower_bound;
     static bool using_partial_expansion;
+    static bool using_enhanced_partial_expansion;
+    static bool using_move_pruning;
+    static bool using_transient_second_phase;
+    static bool using_whole_node_expansion;
+    static bool using_deferred_evaluation;
+    static bool using_frontier_pruning;
+    static bool using_symmetry_pruning;
+    static std::size_t transposition_table_memory;
+    static std::size_t h_cache_memory;
+    static std::size_t perimeter_memory;
+    static std::size_t dead_end_memo_memory;
+    static int first_phase_threads;
+    static int second_phase_threads;
 };
 
 /*
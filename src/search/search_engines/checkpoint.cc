@@ -0,0 +1,89 @@
+#include "checkpoint.h"
+
+#include "../utils/logging.h"
+
+#include <cstdio>
+#include <fstream>
+
+#if OPERATING_SYSTEM == LINUX || OPERATING_SYSTEM == OSX
+#include <sys/wait.h>
+#include <unistd.h>
+#endif
+
+using namespace std;
+
+namespace checkpoint {
+static bool write_file(
+    const string &filename, const function<void(ostream &)> &write_checkpoint) {
+    string temporary_filename = filename + ".tmp";
+    {
+        ofstream out(temporary_filename, ios::binary | ios::trunc);
+        write_checkpoint(out);
+        out.close();
+        if (!out)
+            return false;
+    }
+    return rename(temporary_filename.c_str(), filename.c_str()) == 0;
+}
+
+CheckpointWriter::CheckpointWriter(const string &filename)
+    : filename(filename),
+      child_process_id(-1),
+      num_checkpoints(0) {
+}
+
+CheckpointWriter::~CheckpointWriter() {
+    reap_child(true);
+}
+
+void CheckpointWriter::reap_child(bool wait) {
+#if OPERATING_SYSTEM == LINUX || OPERATING_SYSTEM == OSX
+    if (child_process_id == -1)
+        return;
+    int status;
+    pid_t result = waitpid(child_process_id, &status, wait ? 0 : WNOHANG);
+    if (result == 0)
+        return;
+    if (result == child_process_id && WIFEXITED(status) && WEXITSTATUS(status) == 0) {
+        utils::g_log << "Checkpoint " << num_checkpoints << " written to "
+                     << filename << endl;
+    } else {
+        utils::g_log << "Checkpoint " << num_checkpoints << " could not be written to "
+                     << filename << endl;
+    }
+    child_process_id = -1;
+#else
+    utils::unused_variable(wait);
+#endif
+}
+
+bool CheckpointWriter::is_busy() {
+    reap_child(false);
+    return child_process_id != -1;
+}
+
+void CheckpointWriter::write(const function<void(ostream &)> &write_checkpoint) {
+    reap_child(true);
+    ++num_checkpoints;
+#if OPERATING_SYSTEM == LINUX || OPERATING_SYSTEM == OSX
+    // Buffered output would otherwise be flushed by both processes.
+    cout.flush();
+    pid_t process_id = fork();
+    if (process_id == 0) {
+        // _exit() skips the destructors and atexit handlers of the search.
+        _exit(write_file(filename, write_checkpoint) ? 0 : 1);
+    } else if (process_id > 0) {
+        child_process_id = process_id;
+        return;
+    }
+    // Fall back to writing the checkpoint synchronously if fork() failed.
+#endif
+    if (write_file(filename, write_checkpoint)) {
+        utils::g_log << "Checkpoint " << num_checkpoints << " written to "
+                     << filename << endl;
+    } else {
+        utils::g_log << "Checkpoint " << num_checkpoints << " could not be written to "
+                     << filename << endl;
+    }
+}
+}
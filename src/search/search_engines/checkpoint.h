@@ -0,0 +1,83 @@
+#ifndef SEARCH_ENGINES_CHECKPOINT_H
+#define SEARCH_ENGINES_CHECKPOINT_H
+
+#include "../utils/system.h"
+
+#include <functional>
+#include <iostream>
+#include <string>
+#include <vector>
+
+/*
+  Helpers to write checkpoints of long searches and to read them back.
+
+  CheckpointWriter writes a checkpoint with a given function. On Unix, it
+  forks a child process that writes the checkpoint from its copy-on-write
+  snapshot of the search, so the search itself does not stall. The file is
+  first written under a temporary name and then renamed, so a crash while
+  writing never destroys the previous checkpoint. On Windows, the
+  checkpoint is written synchronously.
+
+  Checkpoints are raw binary files that are only meant to be read back by
+  the same build of the planner on the same task.
+*/
+
+namespace checkpoint {
+template<typename T>
+void write_value(std::ostream &out, const T &value) {
+    out.write(reinterpret_cast<const char *>(&value), sizeof(T));
+}
+
+template<typename T>
+void write_values(std::ostream &out, const std::vector<T> &values) {
+    write_value<long long int>(out, values.size());
+    out.write(reinterpret_cast<const char *>(values.data()), values.size() * sizeof(T));
+}
+
+/*
+  Read a value written with write_value(). Exits with an input error if the
+  checkpoint ends early.
+*/
+template<typename T>
+T read_value(std::istream &in) {
+    T value;
+    in.read(reinterpret_cast<char *>(&value), sizeof(T));
+    if (!in) {
+        std::cerr << "Checkpoint is truncated or unreadable" << std::endl;
+        utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+    }
+    return value;
+}
+
+template<typename T>
+std::vector<T> read_values(std::istream &in) {
+    long long int size = read_value<long long int>(in);
+    std::vector<T> values(size);
+    in.read(reinterpret_cast<char *>(values.data()), size * sizeof(T));
+    if (!in) {
+        std::cerr << "Checkpoint is truncated or unreadable" << std::endl;
+        utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+    }
+    return values;
+}
+
+class CheckpointWriter {
+    const std::string filename;
+    // Process ID of the child that is writing a checkpoint, or -1.
+    int child_process_id;
+    int num_checkpoints;
+
+    void reap_child(bool wait);
+
+public:
+    explicit CheckpointWriter(const std::string &filename);
+    ~CheckpointWriter();
+
+    // Return true if the previous checkpoint is still being written.
+    bool is_busy();
+
+    void write(const std::function<void(std::ostream &)> &write_checkpoint);
+};
+}
+
+#endif
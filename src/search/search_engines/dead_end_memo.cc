@@ -0,0 +1,102 @@
+#include "dead_end_memo.h"
+
+#include "../state_registry.h"
+
+#include "../utils/hash.h"
+#include "../utils/logging.h"
+
+using namespace std;
+
+namespace dead_end_memo {
+// Key of an empty slot of the transient table.
+static const uint64_t EMPTY_KEY = 0;
+
+DeadEndMemo::DeadEndMemo(const StateRegistry &state_registry, size_t transient_memory_budget_in_bytes)
+    : state_registry(state_registry),
+      bucket_mask(0),
+      num_lookups(0),
+      num_hits(0),
+      num_registered_dead_ends(0),
+      num_transient_dead_ends(0),
+      num_evictions(0) {
+    size_t num_buckets = 1;
+    while (2 * num_buckets * BUCKET_SIZE * sizeof(uint64_t) <= transient_memory_budget_in_bytes)
+        num_buckets *= 2;
+    if (num_buckets * BUCKET_SIZE * sizeof(uint64_t) <= transient_memory_budget_in_bytes) {
+        transient_keys.resize(num_buckets * BUCKET_SIZE, EMPTY_KEY);
+        bucket_mask = num_buckets - 1;
+    }
+}
+
+uint64_t DeadEndMemo::get_transient_key(const State &state) const {
+    uint64_t key = utils::get_hash64(state.get_unpacked_values());
+    return key == EMPTY_KEY ? 1 : key;
+}
+
+bool DeadEndMemo::is_dead_end(const State &state) {
+    ++num_lookups;
+    bool dead_end = false;
+    if (state.get_registry() == &state_registry) {
+        size_t index = state.get_id().value;
+        dead_end = index < registered_dead_ends.size() && registered_dead_ends[index];
+    } else if (num_transient_dead_ends > 0) {
+        // Only hash transient states once there is a dead end to find.
+        uint64_t key = get_transient_key(state);
+        const uint64_t *bucket = &transient_keys[(key & bucket_mask) * BUCKET_SIZE];
+        for (int i = 0; i < BUCKET_SIZE; ++i) {
+            if (bucket[i] == key) {
+                dead_end = true;
+                break;
+            }
+        }
+    }
+    if (dead_end)
+        ++num_hits;
+    return dead_end;
+}
+
+void DeadEndMemo::store_dead_end(const State &state) {
+    if (state.get_registry() == &state_registry) {
+        size_t index = state.get_id().value;
+        if (index >= registered_dead_ends.size())
+            registered_dead_ends.resize(state_registry.size(), false);
+        if (!registered_dead_ends[index]) {
+            registered_dead_ends[index] = true;
+            ++num_registered_dead_ends;
+        }
+        return;
+    }
+    if (transient_keys.empty())
+        return;
+
+    uint64_t key = get_transient_key(state);
+    uint64_t *bucket = &transient_keys[(key & bucket_mask) * BUCKET_SIZE];
+    for (int i = 0; i < BUCKET_SIZE; ++i) {
+        if (bucket[i] == key)
+            return;
+        if (bucket[i] == EMPTY_KEY) {
+            bucket[i] = key;
+            ++num_transient_dead_ends;
+            return;
+        }
+    }
+    // The bits above the bucket index choose the evicted key.
+    bucket[(key >> 32) % BUCKET_SIZE] = key;
+    ++num_transient_dead_ends;
+    ++num_evictions;
+}
+
+size_t DeadEndMemo::get_memory_usage_in_bytes() const {
+    return registered_dead_ends.capacity() / 8 + transient_keys.capacity() * sizeof(uint64_t);
+}
+
+void DeadEndMemo::print_statistics() const {
+    utils::g_log << "Dead-end memo hits: " << num_hits << " of " << num_lookups << endl;
+    utils::g_log << "Dead-end memo hit rate: "
+                 << (num_lookups ? double(num_hits) / double(num_lookups) : 0) << endl;
+    utils::g_log << "Dead-end memo registered dead ends: " << num_registered_dead_ends << endl;
+    utils::g_log << "Dead-end memo transient dead ends: " << num_transient_dead_ends << endl;
+    utils::g_log << "Dead-end memo transient evictions: " << num_evictions << endl;
+    utils::g_log << "Dead-end memo memory: " << get_memory_usage_in_bytes() / 1024 << " KB" << endl;
+}
+}
@@ -0,0 +1,62 @@
+#ifndef SEARCH_ENGINES_DEAD_END_MEMO_H
+#define SEARCH_ENGINES_DEAD_END_MEMO_H
+
+#include "../task_proxy.h"
+
+#include <cstdint>
+#include <vector>
+
+class StateRegistry;
+
+/*
+  DeadEndMemo remembers the states that a safe evaluator recognized as dead
+  ends, so that a search that generates the same states many times (e.g.
+  over the iterations of IDA*) does not evaluate them again.
+
+  Dead ends among the states of the given registry are stored in a bitset
+  over their StateIDs, one bit per registered state. Dead ends among
+  unregistered (transient) states are stored as 64-bit hashes of their
+  values in a fixed-size table with buckets of four keys; a new key evicts
+  one of the keys of a full bucket. Like the transposition table and the
+  heuristic cache, the table treats states with the same 64-bit hash as
+  equal, so unlike a Bloom or cuckoo filter with short fingerprints it
+  practically never reports a live state as a dead end.
+
+  Unlike the heuristic cache, the memo does not depend on the evaluator
+  being path-independent: a dead end of a safe evaluator is a dead end on
+  every path.
+*/
+
+namespace dead_end_memo {
+class DeadEndMemo {
+    static const int BUCKET_SIZE = 4;
+
+    const StateRegistry &state_registry;
+    std::vector<bool> registered_dead_ends;
+    std::vector<std::uint64_t> transient_keys;
+    std::uint64_t bucket_mask;
+
+    long unsigned int num_lookups;
+    long unsigned int num_hits;
+    long unsigned int num_registered_dead_ends;
+    long unsigned int num_transient_dead_ends;
+    long unsigned int num_evictions;
+
+    std::uint64_t get_transient_key(const State &state) const;
+
+public:
+    DeadEndMemo(const StateRegistry &state_registry, std::size_t transient_memory_budget_in_bytes);
+
+    /*
+      Return true if the state was stored as a dead end. Transient states
+      must be unpacked.
+    */
+    bool is_dead_end(const State &state);
+    void store_dead_end(const State &state);
+
+    std::size_t get_memory_usage_in_bytes() const;
+    void print_statistics() const;
+};
+}
+
+#endif
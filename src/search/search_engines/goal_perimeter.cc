@@ -0,0 +1,218 @@
+#include "goal_perimeter.h"
+
+#include "../algorithms/priority_queues.h"
+#include "../task_utils/task_properties.h"
+#include "../utils/logging.h"
+#include "../utils/timer.h"
+
+#include <algorithm>
+#include <cassert>
+#include <climits>
+#include <map>
+
+using namespace std;
+
+namespace goal_perimeter {
+GoalPerimeter::GoalPerimeter(const TaskProxy &task_proxy, size_t memory_budget_in_bytes)
+    : task_proxy(task_proxy),
+      radius(-1),
+      complete(false),
+      num_entries(0),
+      memory_usage_in_bytes(0),
+      num_lookups(0),
+      num_hits(0) {
+    task_properties::verify_no_axioms(task_proxy);
+    task_properties::verify_no_conditional_effects(task_proxy);
+    utils::Timer timer;
+
+    VariablesProxy variables = task_proxy.get_variables();
+    OperatorsProxy operators = task_proxy.get_operators();
+    int num_variables = variables.size();
+
+    vector<vector<FactPair>> preconditions(operators.size());
+    vector<vector<FactPair>> effects(operators.size());
+    vector<vector<vector<int>>> achievers(num_variables);
+    for (VariableProxy var : variables) {
+        achievers[var.get_id()].resize(var.get_domain_size());
+    }
+    for (OperatorProxy op : operators) {
+        for (FactProxy pre : op.get_preconditions()) {
+            preconditions[op.get_id()].push_back(pre.get_pair());
+        }
+        for (EffectProxy effect : op.get_effects()) {
+            FactPair fact = effect.get_fact().get_pair();
+            effects[op.get_id()].push_back(fact);
+            achievers[fact.var][fact.value].push_back(op.get_id());
+        }
+    }
+
+    // Partial states have the value -1 for unspecified variables.
+    utils::HashMap<vector<int>, int> node_ids;
+    vector<vector<int>> node_values;
+    vector<Entry> node_entries;
+    vector<bool> node_closed;
+    priority_queues::AdaptiveQueue<int> queue;
+    size_t bytes_per_node = 2 * (sizeof(vector<int>) + num_variables * sizeof(int)) + sizeof(Entry) + 4 * sizeof(void *);
+
+    vector<int> goal_values(num_variables, -1);
+    for (FactProxy goal : task_proxy.get_goals()) {
+        goal_values[goal.get_variable().get_id()] = goal.get_value();
+    }
+    node_ids[goal_values] = 0;
+    node_values.push_back(goal_values);
+    node_entries.push_back({0, 0, -1});
+    node_closed.push_back(false);
+    queue.push(0, 0);
+
+    vector<int> operator_marks(operators.size(), -1);
+    while (true) {
+        if (queue.empty()) {
+            complete = true;
+            break;
+        }
+        pair<int, int> top = queue.pop();
+        int cost = top.first;
+        int node_id = top.second;
+        if (node_closed[node_id] || node_entries[node_id].cost < cost)
+            continue;
+        if (node_values.size() * bytes_per_node > memory_budget_in_bytes) {
+            // All partial states up to the previous cost have been regressed.
+            radius = cost - 1;
+            break;
+        }
+        node_closed[node_id] = true;
+        radius = cost;
+
+        vector<int> values = node_values[node_id];
+        int depth = node_entries[node_id].depth;
+        for (int var = 0; var < num_variables; ++var) {
+            if (values[var] == -1)
+                continue;
+            for (int op_id : achievers[var][values[var]]) {
+                if (operator_marks[op_id] == node_id)
+                    continue;
+                operator_marks[op_id] = node_id;
+
+                vector<int> regressed_values = values;
+                bool consistent = true;
+                for (const FactPair &effect : effects[op_id]) {
+                    if (values[effect.var] != -1 && values[effect.var] != effect.value) {
+                        consistent = false;
+                        break;
+                    }
+                    regressed_values[effect.var] = -1;
+                }
+                for (const FactPair &pre : preconditions[op_id]) {
+                    if (!consistent)
+                        break;
+                    if (regressed_values[pre.var] != -1 && regressed_values[pre.var] != pre.value)
+                        consistent = false;
+                    regressed_values[pre.var] = pre.value;
+                }
+                if (!consistent)
+                    continue;
+
+                int regressed_cost = cost + operators[op_id].get_cost();
+                auto inserted = node_ids.emplace(regressed_values, node_values.size());
+                if (inserted.second) {
+                    node_values.push_back(move(regressed_values));
+                    node_entries.push_back({regressed_cost, depth + 1, op_id});
+                    node_closed.push_back(false);
+                } else {
+                    Entry &entry = node_entries[inserted.first->second];
+                    if (node_closed[inserted.first->second] || entry.cost <= regressed_cost)
+                        continue;
+                    entry = {regressed_cost, depth + 1, op_id};
+                }
+                queue.push(regressed_cost, inserted.first->second);
+            }
+        }
+    }
+
+    map<vector<int>, int> table_ids;
+    for (size_t node_id = 0; node_id < node_values.size(); ++node_id) {
+        if (!node_closed[node_id] || node_entries[node_id].cost > radius)
+            continue;
+        vector<int> table_variables;
+        vector<int> key;
+        for (int var = 0; var < num_variables; ++var) {
+            if (node_values[node_id][var] != -1) {
+                table_variables.push_back(var);
+                key.push_back(node_values[node_id][var]);
+            }
+        }
+        auto inserted = table_ids.emplace(table_variables, tables.size());
+        if (inserted.second) {
+            tables.push_back({move(table_variables), {}});
+        }
+        tables[inserted.first->second].entries[key] = node_entries[node_id];
+        memory_usage_in_bytes += sizeof(vector<int>) + key.size() * sizeof(int) + sizeof(Entry) + 2 * sizeof(void *);
+        ++num_entries;
+    }
+
+    utils::g_log << "Goal perimeter: " << num_entries << " partial states in "
+                 << tables.size() << " tables with radius ";
+    if (complete)
+        utils::g_log << "infinity";
+    else
+        utils::g_log << radius;
+    utils::g_log << ", built in " << timer << endl;
+}
+
+const GoalPerimeter::Entry *GoalPerimeter::lookup(const vector<int> &state_values) {
+    ++num_lookups;
+    const Entry *best_entry = nullptr;
+    for (const Table &table : tables) {
+        projected_values.resize(table.variables.size());
+        for (size_t i = 0; i < table.variables.size(); ++i) {
+            projected_values[i] = state_values[table.variables[i]];
+        }
+        auto it = table.entries.find(projected_values);
+        if (it == table.entries.end())
+            continue;
+        const Entry &entry = it->second;
+        if (!best_entry || entry.cost < best_entry->cost ||
+            (entry.cost == best_entry->cost && entry.depth < best_entry->depth))
+            best_entry = &entry;
+    }
+    if (best_entry)
+        ++num_hits;
+    return best_entry;
+}
+
+int GoalPerimeter::get_goal_distance(const State &state) {
+    const Entry *entry = lookup(state.get_unpacked_values());
+    return entry ? entry->cost : -1;
+}
+
+int GoalPerimeter::get_outside_h_value(int h_value) const {
+    if (h_value == INT_MAX || complete)
+        return INT_MAX;
+    return max(h_value, radius + 1);
+}
+
+void GoalPerimeter::extract_plan(const State &state, vector<OperatorID> &plan) {
+    // Following the operator of the best entry strictly decreases its cost or, for operators of cost 0, its depth.
+    // Goal states end the plan even if they are not stored, e.g. when the budget is smaller than the first layer.
+    State current_state = state;
+    while (!task_properties::is_goal_state(task_proxy, current_state)) {
+        const Entry *entry = lookup(current_state.get_unpacked_values());
+        assert(entry);
+        if (!entry || entry->depth == 0)
+            break;
+        plan.emplace_back(entry->operator_id);
+        current_state = current_state.get_unregistered_successor(task_proxy.get_operators()[entry->operator_id]);
+    }
+}
+
+void GoalPerimeter::print_statistics() const {
+    utils::g_log << "Goal perimeter partial states: " << num_entries << endl;
+    utils::g_log << "Goal perimeter tables: " << tables.size() << endl;
+    if (complete)
+        utils::g_log << "Goal perimeter radius: infinity" << endl;
+    else
+        utils::g_log << "Goal perimeter radius: " << radius << endl;
+    utils::g_log << "Goal perimeter hits: " << num_hits << " of " << num_lookups << endl;
+    utils::g_log << "Goal perimeter memory: " << memory_usage_in_bytes / 1024 << " KB" << endl;
+}
+}
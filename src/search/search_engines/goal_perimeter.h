@@ -0,0 +1,90 @@
+#ifndef SEARCH_ENGINES_GOAL_PERIMETER_H
+#define SEARCH_ENGINES_GOAL_PERIMETER_H
+
+#include "../operator_id.h"
+#include "../task_proxy.h"
+
+#include "../utils/hash.h"
+
+#include <vector>
+
+/*
+  GoalPerimeter is a bounded regression from the goal of a task without
+  axioms and conditional effects.
+
+  The regression is a uniform-cost search over partial states, starting
+  from the goal. A partial state p is regressed through an operator o that
+  achieves a fact of p and does not contradict it: the regressed partial
+  state requires the preconditions of o and the facts of p that o does not
+  change. Every state that satisfies a regressed partial state reaches a
+  state satisfying p by applying o.
+
+  The search stops when its memory budget is exhausted. Its radius is the
+  largest cost up to which all partial states have been regressed. For a
+  state whose goal distance is at most the radius, the smallest cost of the
+  partial states it satisfies is its exact goal distance. A state that
+  satisfies none of them has a goal distance larger than the radius. If the
+  whole regression space fits in the budget, such a state is a dead end.
+
+  The partial states are stored in one hash table per set of specified
+  variables, so a state is looked up with one projection per table.
+*/
+
+namespace goal_perimeter {
+class GoalPerimeter {
+    struct Entry {
+        int cost;
+        // Number of operators to the goal, which breaks ties between entries of the same cost when a plan is extracted.
+        int depth;
+        int operator_id;
+    };
+
+    struct Table {
+        std::vector<int> variables;
+        utils::HashMap<std::vector<int>, Entry> entries;
+    };
+
+    TaskProxy task_proxy;
+    std::vector<Table> tables;
+    int radius;
+    bool complete;
+    std::size_t num_entries;
+    std::size_t memory_usage_in_bytes;
+    std::vector<int> projected_values;
+
+    long unsigned int num_lookups;
+    long unsigned int num_hits;
+
+    const Entry *lookup(const std::vector<int> &state_values);
+
+public:
+    GoalPerimeter(const TaskProxy &task_proxy, std::size_t memory_budget_in_bytes);
+
+    /*
+      Return the exact goal distance of the state if it is at most the
+      radius, and -1 otherwise. The state must be unpacked.
+    */
+    int get_goal_distance(const State &state);
+
+    /*
+      Raise an admissible heuristic value of a state that is not in the
+      perimeter to the smallest goal distance outside of it.
+    */
+    int get_outside_h_value(int h_value) const;
+
+    /*
+      Append the operators of an optimal plan from a state in the
+      perimeter to plan. Nothing is appended for a goal state.
+    */
+    void extract_plan(const State &state, std::vector<OperatorID> &plan);
+
+    // Return the largest goal distance of the states in the perimeter.
+    int get_radius() const {
+        return radius;
+    }
+
+    void print_statistics() const;
+};
+}
+
+#endif
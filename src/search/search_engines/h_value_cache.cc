@@ -0,0 +1,66 @@
+#include "h_value_cache.h"
+
+#include "../utils/hash.h"
+#include "../utils/logging.h"
+
+using namespace std;
+
+namespace h_value_cache {
+HValueCache::HValueCache(size_t transient_memory_budget_in_bytes)
+    : transient_mask(0),
+      num_hits(0),
+      num_misses(0),
+      num_evictions(0) {
+    size_t num_transient_entries = 1;
+    while (2 * num_transient_entries * sizeof(TransientEntry) <= transient_memory_budget_in_bytes)
+        num_transient_entries *= 2;
+    if (num_transient_entries * sizeof(TransientEntry) <= transient_memory_budget_in_bytes) {
+        transient_entries.resize(num_transient_entries);
+        transient_mask = num_transient_entries - 1;
+    }
+}
+
+HValueCache::TransientEntry *HValueCache::get_entry(const State &state, uint64_t &key) {
+    if (state.get_registry() || transient_entries.empty())
+        return nullptr;
+    key = utils::get_hash64(state.get_unpacked_values());
+    return &transient_entries[key & transient_mask];
+}
+
+bool HValueCache::lookup_h_value(const State &state, int &h_value) {
+    uint64_t key;
+    TransientEntry *entry = get_entry(state, key);
+    if (!entry)
+        return false;
+    if (entry->h_value != UNKNOWN && entry->key == key) {
+        ++num_hits;
+        h_value = entry->h_value;
+        return true;
+    }
+    ++num_misses;
+    return false;
+}
+
+void HValueCache::store_h_value(const State &state, int h_value) {
+    uint64_t key;
+    TransientEntry *entry = get_entry(state, key);
+    if (!entry)
+        return;
+    if (entry->h_value != UNKNOWN && entry->key != key)
+        ++num_evictions;
+    entry->key = key;
+    entry->h_value = h_value;
+}
+
+size_t HValueCache::get_transient_memory_usage_in_bytes() const {
+    return transient_entries.capacity() * sizeof(TransientEntry);
+}
+
+void HValueCache::print_statistics() const {
+    utils::g_log << "Heuristic cache hits: " << num_hits << endl;
+    utils::g_log << "Heuristic cache misses: " << num_misses << endl;
+    utils::g_log << "Heuristic cache transient evictions: " << num_evictions << endl;
+    utils::g_log << "Heuristic cache transient memory: "
+                 << get_transient_memory_usage_in_bytes() / 1024 << " KB" << endl;
+}
+}
@@ -0,0 +1,73 @@
+#ifndef SEARCH_ENGINES_H_VALUE_CACHE_H
+#define SEARCH_ENGINES_H_VALUE_CACHE_H
+
+#include "../task_proxy.h"
+
+#include <cstdint>
+#include <vector>
+
+/*
+  HValueCache stores the heuristic values of a path-independent evaluator
+  for unregistered (transient) states, which a search may generate many
+  times (e.g. over the iterations of IDA*).
+
+  The values are stored in a direct-mapped table of fixed size keyed by a
+  64-bit hash of the state values, where a new value evicts the one
+  occupying its slot. Registered states are not cached here, since a
+  path-independent evaluator already caches their values itself.
+*/
+
+namespace h_value_cache {
+class HValueCache {
+    static const int UNKNOWN = -1;
+
+    struct TransientEntry {
+        std::uint64_t key;
+        int h_value;
+
+        TransientEntry()
+            : key(0), h_value(UNKNOWN) {
+        }
+    };
+
+    std::vector<TransientEntry> transient_entries;
+    std::uint64_t transient_mask;
+
+    long unsigned int num_hits;
+    long unsigned int num_misses;
+    long unsigned int num_evictions;
+
+    TransientEntry *get_entry(const State &state, std::uint64_t &key);
+
+public:
+    explicit HValueCache(std::size_t transient_memory_budget_in_bytes);
+
+    /*
+      Return the cached heuristic value of the given state. If it is not
+      cached, compute it with compute_h_value() and cache it. Registered
+      states are always passed to compute_h_value().
+    */
+    template<typename Function>
+    int get_h_value(const State &state, Function compute_h_value) {
+        int h_value;
+        if (lookup_h_value(state, h_value))
+            return h_value;
+        h_value = compute_h_value();
+        store_h_value(state, h_value);
+        return h_value;
+    }
+
+    /*
+      Like get_h_value(), split in two for evaluating several states at
+      once: lookup_h_value() returns false if the value of the given state
+      is not cached, and store_h_value() caches it after computing it.
+    */
+    bool lookup_h_value(const State &state, int &h_value);
+    void store_h_value(const State &state, int h_value);
+
+    std::size_t get_transient_memory_usage_in_bytes() const;
+    void print_statistics() const;
+};
+}
+
+#endif
@@ -0,0 +1,408 @@
+#include "hash_distributed_search.h"
+
+#include "parallel_bounded_dfs.h"
+
+#include "../axioms.h"
+#include "../evaluation_context.h"
+#include "../evaluator.h"
+
+#include "../task_utils/successor_generator.h"
+#include "../task_utils/task_properties.h"
+#include "../utils/logging.h"
+#include "../utils/system.h"
+
+#include <algorithm>
+#include <cassert>
+#include <thread>
+
+using namespace std;
+
+namespace hash_distributed_search {
+HashDistributedSearch::HashDistributedSearch(
+    const shared_ptr<AbstractTask> &task,
+    const successor_generator::SuccessorGenerator &successor_generator,
+    const vector<shared_ptr<Evaluator>> &evaluators,
+    long unsigned int open_limit, size_t open_memory_budget,
+    bool using_partial_expansion)
+    : task(task),
+      task_proxy(*task),
+      successor_generator(successor_generator),
+      open_limit(open_limit),
+      open_memory_budget(open_memory_budget),
+      using_partial_expansion(using_partial_expansion),
+      open_size(0),
+      open_limit_reached(false),
+      incumbent_cost(INT_MAX),
+      terminated(false),
+      num_idle_workers(0),
+      num_messages_in_flight(0),
+      goal_worker(-1),
+      goal_state_id_value(-1) {
+    assert(!evaluators.empty());
+    if (evaluators.size() > 1)
+        utils::share_heap_between_threads();
+    int num_workers = evaluators.size();
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        unique_ptr<Worker> worker = make_unique<Worker>();
+        worker->evaluator = evaluator;
+        if (!task_proxy.get_axioms().empty())
+            worker->axiom_evaluator = make_unique<AxiomEvaluator>(task_proxy);
+        worker->state_registry = make_unique<StateRegistry>(task_proxy);
+        worker->node_infos = make_unique<PerStateInformation<NodeInfo>>();
+        worker->outboxes.resize(num_workers);
+        worker->idle = false;
+        worker->memory_usage = 0;
+        worker->num_expansions = 0;
+        worker->num_generations = 0;
+        worker->num_evaluations = 0;
+        worker->num_messages = 0;
+        workers.push_back(move(worker));
+    }
+}
+
+HashDistributedSearch::~HashDistributedSearch() {
+}
+
+int HashDistributedSearch::get_owner(const vector<int> &values) const {
+    return utils::get_hash64(values) % workers.size();
+}
+
+HashDistributedSearch::NodeInfo &HashDistributedSearch::get_node_info(
+    Worker &worker, StateID state_id) {
+    return (*worker.node_infos)[worker.state_registry->lookup_state(state_id)];
+}
+
+void HashDistributedSearch::push(Worker &worker, const OpenNode &open_node) {
+    worker.open_list.push(open_node.state_id, open_node.big_f_value,
+                          open_node.g_value, open_node.depth, open_node);
+    NodeInfo &node_info = get_node_info(worker, open_node.state_id);
+    node_info.status = NodeInfo::OPEN;
+    node_info.g_value = open_node.g_value;
+    ++open_size;
+}
+
+size_t HashDistributedSearch::get_memory_usage_in_bytes(
+    const Worker &worker, long unsigned int num_new_open_nodes) const {
+    return worker.state_registry->get_memory_usage_in_bytes() +
+           worker.state_registry->size() * sizeof(NodeInfo) +
+           worker.open_list.get_estimated_memory_usage_in_bytes(num_new_open_nodes);
+}
+
+void HashDistributedSearch::update_memory_usage(Worker &worker) {
+    if (open_memory_budget > 0)
+        worker.memory_usage = get_memory_usage_in_bytes(worker);
+}
+
+int HashDistributedSearch::evaluate(Worker &worker, const State &state, int g_value) {
+    EvaluationContext eval_context(state, g_value, false, nullptr);
+    ++worker.num_evaluations;
+    return eval_context.get_evaluator_value_or_infinity(worker.evaluator.get());
+}
+
+void HashDistributedSearch::receive(Worker &worker, Message &message) {
+    State state = worker.state_registry->insert_state(message.values);
+    NodeInfo &node_info = (*worker.node_infos)[state];
+
+    if (node_info.status == NodeInfo::CLOSED) {
+        if (node_info.g_value <= message.g_value)
+            return;
+        node_info.status = NodeInfo::NEW;
+    } else if (node_info.status == NodeInfo::OPEN) {
+        if (node_info.g_value <= message.g_value)
+            return;
+        worker.open_list.erase(state.get_id());
+        --open_size;
+    }
+
+    node_info.predecessor_worker = message.predecessor_worker;
+    node_info.predecessor_state_id_value = message.predecessor_state_id_value;
+    node_info.generating_operator_proxy_id = message.generating_operator_proxy_id;
+    push(worker, OpenNode(state.get_id(), message.g_value, message.big_f_value, message.depth));
+}
+
+void HashDistributedSearch::expand(int worker_id, OpenNode expanding_node) {
+    Worker &worker = *workers[worker_id];
+    State expanding_state = worker.state_registry->lookup_state(expanding_node.state_id);
+    expanding_state.unpack();
+
+    if (task_properties::is_goal_state(task_proxy, expanding_state)) {
+        {
+            lock_guard<mutex> lock(termination_mutex);
+            if (expanding_node.g_value < incumbent_cost) {
+                incumbent_cost = expanding_node.g_value;
+                goal_worker = worker_id;
+                goal_state_id_value = expanding_node.state_id.value;
+            }
+        }
+        // The goal node stays open, so it is transferred if the open limit is reached later.
+        push(worker, expanding_node);
+        return;
+    }
+
+    ++worker.num_expansions;
+    worker.applicable_operators.clear();
+    successor_generator.generate_applicable_ops(expanding_state, worker.applicable_operators);
+    worker.expanding_hash.clear();
+    worker.expanding_hash[expanding_state.get_unpacked_values()] = expanding_node.g_value;
+    worker.successors.clear();
+
+    OperatorsProxy operators = task_proxy.get_operators();
+    for (OperatorID op_id : worker.applicable_operators) {
+        OperatorProxy op = operators[op_id];
+        State successor = parallel_bounded_dfs::get_unregistered_successor(
+            *task, worker.axiom_evaluator.get(), expanding_state, op);
+        ++worker.num_generations;
+
+        const vector<int> &successor_values = successor.get_unpacked_values();
+        int successor_g_value = expanding_node.g_value + op.get_cost();
+        auto it = worker.expanding_hash.find(successor_values);
+        if (it != worker.expanding_hash.end() && it->second <= successor_g_value)
+            continue;
+
+        int successor_h_value = evaluate(worker, successor, successor_g_value);
+        if (successor_h_value == INT_MAX)
+            continue;
+
+        worker.expanding_hash[successor_values] = successor_g_value;
+        worker.successors.push_back(
+            {successor_values, successor_g_value, successor_g_value + successor_h_value,
+             expanding_node.depth + 1, worker_id, expanding_node.state_id.value,
+             op.get_id()});
+    }
+
+    // As in the sequential first phase, successors with larger F values are collapsed into the expanded node.
+    int big_f_value = expanding_node.big_f_value;
+    int new_big_f_value = INT_MAX;
+    int num_successors_to_put_in_open = 0;
+    int num_successors_to_re_compact = 0;
+    for (Message &successor : worker.successors) {
+        if (worker.expanding_hash[successor.values] < successor.g_value) {
+            successor.depth = -1;
+        } else if (using_partial_expansion && successor.big_f_value > big_f_value) {
+            new_big_f_value = min(new_big_f_value, successor.big_f_value);
+            ++num_successors_to_re_compact;
+        } else {
+            ++num_successors_to_put_in_open;
+        }
+    }
+
+    long unsigned int num_new_open_nodes = num_successors_to_put_in_open + min(1, num_successors_to_re_compact);
+    bool exceeds_open_memory_budget = false;
+    if (open_memory_budget > 0) {
+        // The new nodes are counted as if they were all owned by this worker.
+        size_t memory_usage = get_memory_usage_in_bytes(worker, num_new_open_nodes);
+        for (size_t other_worker_id = 0; other_worker_id < workers.size(); ++other_worker_id) {
+            if (static_cast<int>(other_worker_id) != worker_id)
+                memory_usage += workers[other_worker_id]->memory_usage;
+        }
+        exceeds_open_memory_budget = memory_usage > open_memory_budget;
+    }
+    if (open_size + num_new_open_nodes > open_limit || exceeds_open_memory_budget) {
+        open_limit_reached = true;
+        push(worker, expanding_node);
+        return;
+    }
+
+    bool re_compact_single_successor = num_successors_to_re_compact == 1;
+    if (num_successors_to_re_compact <= 1) {
+        NodeInfo &node_info = get_node_info(worker, expanding_node.state_id);
+        node_info.status = NodeInfo::CLOSED;
+        node_info.g_value = expanding_node.g_value;
+    } else {
+        expanding_node.big_f_value = new_big_f_value;
+        push(worker, expanding_node);
+    }
+
+    for (Message &successor : worker.successors) {
+        if (successor.depth == -1)
+            continue;
+        if (using_partial_expansion && successor.big_f_value > big_f_value &&
+            !re_compact_single_successor)
+            continue;
+        worker.outboxes[get_owner(successor.values)].push_back(move(successor));
+    }
+    update_memory_usage(worker);
+    send_messages(worker_id);
+}
+
+void HashDistributedSearch::send_messages(int worker_id) {
+    Worker &worker = *workers[worker_id];
+    for (size_t owner = 0; owner < workers.size(); ++owner) {
+        vector<Message> &outbox = worker.outboxes[owner];
+        if (outbox.empty())
+            continue;
+        {
+            // Messages are counted before they become visible, so termination cannot be detected too early.
+            lock_guard<mutex> lock(termination_mutex);
+            num_messages_in_flight += outbox.size();
+        }
+        worker.num_messages += outbox.size();
+        Worker &receiver = *workers[owner];
+        lock_guard<mutex> lock(receiver.inbox_mutex);
+        move(outbox.begin(), outbox.end(), back_inserter(receiver.inbox));
+        outbox.clear();
+    }
+}
+
+bool HashDistributedSearch::deliver_messages(Worker &worker) {
+    {
+        lock_guard<mutex> lock(worker.inbox_mutex);
+        if (worker.inbox.empty())
+            return false;
+        swap(worker.inbox, worker.received);
+    }
+    set_idle(worker, false);
+    for (Message &message : worker.received)
+        receive(worker, message);
+    update_memory_usage(worker);
+    {
+        lock_guard<mutex> lock(termination_mutex);
+        num_messages_in_flight -= worker.received.size();
+    }
+    worker.received.clear();
+    return true;
+}
+
+void HashDistributedSearch::set_idle(Worker &worker, bool idle) {
+    lock_guard<mutex> lock(termination_mutex);
+    if (worker.idle != idle) {
+        worker.idle = idle;
+        num_idle_workers += idle ? 1 : -1;
+    }
+    if (num_idle_workers == static_cast<int>(workers.size()) && num_messages_in_flight == 0)
+        terminated = true;
+}
+
+void HashDistributedSearch::run_worker(int worker_id) {
+    Worker &worker = *workers[worker_id];
+    while (!terminated) {
+        if (deliver_messages(worker))
+            continue;
+        if (!open_limit_reached && !worker.open_list.empty() &&
+            worker.open_list.top().big_f_value < incumbent_cost) {
+            OpenNode expanding_node = worker.open_list.pop();
+            --open_size;
+            get_node_info(worker, expanding_node.state_id).status = NodeInfo::NEW;
+            expand(worker_id, expanding_node);
+            continue;
+        }
+        set_idle(worker, true);
+        this_thread::yield();
+    }
+}
+
+Status HashDistributedSearch::search() {
+    State initial_state = task_proxy.get_initial_state();
+    int initial_h_value = evaluate(*workers[0], initial_state, 0);
+    if (initial_h_value == INT_MAX)
+        return Status::FAILED;
+
+    vector<int> initial_values = initial_state.get_unpacked_values();
+    int owner = get_owner(initial_values);
+    workers[owner]->outboxes[owner].push_back(
+        {initial_values, 0, initial_h_value, 0, -1, -1, -1});
+    send_messages(owner);
+
+    vector<thread> threads;
+    for (size_t worker_id = 1; worker_id < workers.size(); ++worker_id)
+        threads.emplace_back(&HashDistributedSearch::run_worker, this, worker_id);
+    run_worker(0);
+    for (thread &worker_thread : threads)
+        worker_thread.join();
+
+    if (open_limit_reached)
+        return Status::OPEN_LIMIT_REACHED;
+    if (goal_worker != -1)
+        return Status::SOLVED;
+    return Status::FAILED;
+}
+
+void HashDistributedSearch::transfer_nodes(
+    StateRegistry &registry,
+    const function<void(StateID, bool, int, int, int, int, int)> &function) {
+    OperatorsProxy operators = task_proxy.get_operators();
+    transferred_state_id_values.assign(workers.size(), vector<int>());
+    for (size_t worker_id = 0; worker_id < workers.size(); ++worker_id)
+        transferred_state_id_values[worker_id].assign(workers[worker_id]->state_registry->size(), -1);
+
+    vector<pair<int, int>> chain;
+    for (size_t worker_id = 0; worker_id < workers.size(); ++worker_id) {
+        Worker &worker = *workers[worker_id];
+        int num_states = worker.state_registry->size();
+        for (int state_id_value = 0; state_id_value < num_states; ++state_id_value) {
+            NodeInfo &node_info = get_node_info(worker, StateID(state_id_value, true));
+            if (node_info.status == NodeInfo::NEW)
+                continue;
+
+            // Register the chain of predecessors that are not registered yet, starting from the oldest.
+            chain.clear();
+            pair<int, int> node(worker_id, state_id_value);
+            while (node.first != -1 && transferred_state_id_values[node.first][node.second] == -1) {
+                chain.push_back(node);
+                const NodeInfo &chain_node_info = get_node_info(*workers[node.first], StateID(node.second, true));
+                node = {chain_node_info.predecessor_worker, chain_node_info.predecessor_state_id_value};
+            }
+            while (!chain.empty()) {
+                pair<int, int> chain_node = chain.back();
+                chain.pop_back();
+                const NodeInfo &chain_node_info = get_node_info(*workers[chain_node.first], StateID(chain_node.second, true));
+                State state = chain_node_info.predecessor_worker == -1 ?
+                    registry.get_initial_state() :
+                    registry.get_successor_state(
+                        registry.lookup_state(StateID(transferred_state_id_values[chain_node_info.predecessor_worker][chain_node_info.predecessor_state_id_value], true)),
+                        operators[chain_node_info.generating_operator_proxy_id]);
+                transferred_state_id_values[chain_node.first][chain_node.second] = state.get_id().value;
+            }
+
+            StateID state_id(transferred_state_id_values[worker_id][state_id_value], true);
+            int predecessor_state_id_value = node_info.predecessor_worker == -1 ? -1 :
+                transferred_state_id_values[node_info.predecessor_worker][node_info.predecessor_state_id_value];
+            if (node_info.status == NodeInfo::OPEN) {
+                const OpenNode &open_node = worker.open_list.get(StateID(state_id_value, true));
+                function(state_id, true, open_node.g_value, open_node.big_f_value, open_node.depth,
+                         predecessor_state_id_value, node_info.generating_operator_proxy_id);
+            } else {
+                function(state_id, false, node_info.g_value, -1, -1,
+                         predecessor_state_id_value, node_info.generating_operator_proxy_id);
+            }
+        }
+    }
+}
+
+StateID HashDistributedSearch::get_transferred_goal_state_id() const {
+    assert(goal_worker != -1);
+    return StateID(transferred_state_id_values[goal_worker][goal_state_id_value], true);
+}
+
+long unsigned int HashDistributedSearch::get_num_expansions() const {
+    long unsigned int num_expansions = 0;
+    for (const unique_ptr<Worker> &worker : workers)
+        num_expansions += worker->num_expansions;
+    return num_expansions;
+}
+
+long unsigned int HashDistributedSearch::get_num_generations() const {
+    long unsigned int num_generations = 0;
+    for (const unique_ptr<Worker> &worker : workers)
+        num_generations += worker->num_generations;
+    return num_generations;
+}
+
+long unsigned int HashDistributedSearch::get_num_evaluations() const {
+    long unsigned int num_evaluations = 0;
+    for (const unique_ptr<Worker> &worker : workers)
+        num_evaluations += worker->num_evaluations;
+    return num_evaluations;
+}
+
+void HashDistributedSearch::print_statistics() const {
+    utils::g_log << "First phase threads: " << workers.size() << endl;
+    for (size_t worker_id = 0; worker_id < workers.size(); ++worker_id) {
+        const Worker &worker = *workers[worker_id];
+        utils::g_log << "First phase thread " << worker_id << " expansions: "
+                     << worker.num_expansions << ", registered states: "
+                     << worker.state_registry->size() << ", messages sent: "
+                     << worker.num_messages << endl;
+    }
+}
+}
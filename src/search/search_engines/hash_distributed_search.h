@@ -0,0 +1,203 @@
+#ifndef SEARCH_ENGINES_HASH_DISTRIBUTED_SEARCH_H
+#define SEARCH_ENGINES_HASH_DISTRIBUTED_SEARCH_H
+
+#include "../operator_id.h"
+#include "../per_state_information.h"
+#include "../state_registry.h"
+#include "../task_proxy.h"
+
+#include "../open_lists/f_g_bucket_open_list.h"
+#include "../utils/hash.h"
+
+#include <atomic>
+#include <climits>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+class AbstractTask;
+class AxiomEvaluator;
+class Evaluator;
+
+namespace successor_generator {
+class SuccessorGenerator;
+}
+
+/*
+  HashDistributedSearch is a hash-distributed (HDA*-style) parallel version
+  of the first phase of PEA*+IDA*.
+
+  Every state is owned by the worker thread its hash is mapped to. A worker
+  owns a state registry, the node information and the open list of its
+  states. When a worker expands a node, it evaluates the successors itself
+  (so that partial expansion can collapse successors with larger f values
+  into the expanded node as in the sequential first phase) and sends the
+  remaining ones to their owners in batches. Owners do the duplicate
+  detection when they receive them.
+
+  A goal is found when its node is selected for expansion. Its g value
+  becomes the incumbent solution cost, and workers only expand nodes with
+  smaller f values from then on. The search terminates when no worker has
+  such a node and no message is in flight, which proves that the incumbent
+  is optimal.
+
+  The open limit applies to the sum of the sizes of all open lists and the
+  open memory budget (if positive) to the sum of the memory used by the
+  state registries, node information and open lists of all workers, which
+  every worker publishes after each batch of work. When an expansion would
+  exceed either of them, the expanded node is put back, all workers stop
+  expanding, the messages in flight are delivered, and the caller takes over
+  all nodes with transfer_nodes().
+*/
+
+namespace hash_distributed_search {
+enum class Status {
+    SOLVED,
+    FAILED,
+    OPEN_LIMIT_REACHED
+};
+
+class HashDistributedSearch {
+    struct NodeInfo {
+        enum NodeStatus {
+            NEW = 0,
+            OPEN = 1,
+            CLOSED = 2
+        };
+
+        unsigned int status : 2;
+        int g_value : 30;
+        int predecessor_worker;
+        int predecessor_state_id_value;
+        int generating_operator_proxy_id;
+
+        NodeInfo()
+            : status(NEW), g_value(-1), predecessor_worker(-1),
+              predecessor_state_id_value(-1), generating_operator_proxy_id(-1) {
+        }
+    };
+
+    struct OpenNode {
+        StateID state_id;
+        int g_value;
+        int big_f_value;
+        int depth;
+
+        OpenNode(StateID state_id, int g_value, int big_f_value, int depth)
+            : state_id(state_id), g_value(g_value), big_f_value(big_f_value), depth(depth) {
+        }
+    };
+
+    struct Message {
+        std::vector<int> values;
+        int g_value;
+        int big_f_value;
+        int depth;
+        int predecessor_worker;
+        int predecessor_state_id_value;
+        int generating_operator_proxy_id;
+    };
+
+    struct Worker {
+        std::shared_ptr<Evaluator> evaluator;
+        std::unique_ptr<AxiomEvaluator> axiom_evaluator;
+
+        std::unique_ptr<StateRegistry> state_registry;
+        std::unique_ptr<PerStateInformation<NodeInfo>> node_infos;
+        f_g_bucket_open_list::FGBucketOpenList<OpenNode> open_list;
+
+        // Guards inbox, which all workers write to.
+        std::mutex inbox_mutex;
+        std::vector<Message> inbox;
+        std::vector<Message> received;
+        std::vector<std::vector<Message>> outboxes;
+
+        std::vector<OperatorID> applicable_operators;
+        std::vector<Message> successors;
+        utils::HashMap<std::vector<int>, int> expanding_hash;
+        bool idle;
+        // Written by the worker itself, read by all workers.
+        std::atomic<std::size_t> memory_usage;
+
+        long unsigned int num_expansions;
+        long unsigned int num_generations;
+        long unsigned int num_evaluations;
+        long unsigned int num_messages;
+    };
+
+    const std::shared_ptr<AbstractTask> task;
+    TaskProxy task_proxy;
+    const successor_generator::SuccessorGenerator &successor_generator;
+    const long unsigned int open_limit;
+    const std::size_t open_memory_budget;
+    const bool using_partial_expansion;
+    std::vector<std::unique_ptr<Worker>> workers;
+
+    std::atomic<long int> open_size;
+    std::atomic<bool> open_limit_reached;
+    std::atomic<int> incumbent_cost;
+    std::atomic<bool> terminated;
+
+    // Guards the termination detection data and the goal node.
+    std::mutex termination_mutex;
+    int num_idle_workers;
+    long int num_messages_in_flight;
+    int goal_worker;
+    int goal_state_id_value;
+
+    // StateID values in the registry passed to transfer_nodes() per worker and state.
+    std::vector<std::vector<int>> transferred_state_id_values;
+
+    int get_owner(const std::vector<int> &values) const;
+    NodeInfo &get_node_info(Worker &worker, StateID state_id);
+    void push(Worker &worker, const OpenNode &open_node);
+    std::size_t get_memory_usage_in_bytes(
+        const Worker &worker, long unsigned int num_new_open_nodes = 0) const;
+    void update_memory_usage(Worker &worker);
+    int evaluate(Worker &worker, const State &state, int g_value);
+    void receive(Worker &worker, Message &message);
+    void expand(int worker_id, OpenNode expanding_node);
+    void send_messages(int worker_id);
+    bool deliver_messages(Worker &worker);
+    void set_idle(Worker &worker, bool idle);
+    void run_worker(int worker_id);
+
+public:
+    /*
+      evaluators holds one independent instance of the (path-independent)
+      heuristic per worker thread.
+    */
+    HashDistributedSearch(
+        const std::shared_ptr<AbstractTask> &task,
+        const successor_generator::SuccessorGenerator &successor_generator,
+        const std::vector<std::shared_ptr<Evaluator>> &evaluators,
+        long unsigned int open_limit, std::size_t open_memory_budget,
+        bool using_partial_expansion);
+    ~HashDistributedSearch();
+
+    Status search();
+
+    /*
+      Register all open and closed states in registry, parents before their
+      children, and call the given function for each of them with its
+      StateID in registry, whether it is open, its g value, F value, depth,
+      the StateID value of its predecessor (-1 for the initial state) and
+      its generating operator.
+    */
+    void transfer_nodes(
+        StateRegistry &registry,
+        const std::function<void(StateID, bool, int, int, int, int, int)> &function);
+
+    /* Return the StateID of the goal node in the registry passed to
+       transfer_nodes(), if the search was solved. */
+    StateID get_transferred_goal_state_id() const;
+
+    long unsigned int get_num_expansions() const;
+    long unsigned int get_num_generations() const;
+    long unsigned int get_num_evaluations() const;
+    void print_statistics() const;
+};
+}
+
+#endif
@@ -0,0 +1,75 @@
+#include "move_pruning.h"
+
+#include "../task_utils/task_properties.h"
+#include "../utils/logging.h"
+
+#include <algorithm>
+#include <limits>
+
+using namespace std;
+
+namespace move_pruning {
+MovePruning::MovePruning(const TaskProxy &task_proxy)
+    : read_marks(task_proxy.get_variables().size(), 0),
+      written_marks(task_proxy.get_variables().size(), 0),
+      last_marker(0),
+      num_unpruned_operators(0),
+      num_pruned_operators(0) {
+    task_properties::verify_no_axioms(task_proxy);
+    task_properties::verify_no_conditional_effects(task_proxy);
+
+    OperatorsProxy operators = task_proxy.get_operators();
+    read_variables.resize(operators.size());
+    written_variables.resize(operators.size());
+    for (OperatorProxy op : operators) {
+        for (FactProxy pre : op.get_preconditions()) {
+            read_variables[op.get_id()].push_back(pre.get_variable().get_id());
+        }
+        for (EffectProxy effect : op.get_effects()) {
+            written_variables[op.get_id()].push_back(
+                effect.get_fact().get_variable().get_id());
+        }
+    }
+}
+
+void MovePruning::prune_operators(
+    OperatorID last_operator, vector<OperatorID> &op_ids) {
+    num_unpruned_operators += op_ids.size();
+
+    if (last_marker == numeric_limits<int>::max()) {
+        fill(read_marks.begin(), read_marks.end(), 0);
+        fill(written_marks.begin(), written_marks.end(), 0);
+        last_marker = 0;
+    }
+    ++last_marker;
+    int last_op_id = last_operator.get_index();
+    for (int var : read_variables[last_op_id])
+        read_marks[var] = last_marker;
+    for (int var : written_variables[last_op_id])
+        written_marks[var] = last_marker;
+
+    auto commutes_with_last_operator = [&](OperatorID op) {
+            int op_id = op.get_index();
+            if (op_id >= last_op_id)
+                return false;
+            for (int var : read_variables[op_id]) {
+                if (written_marks[var] == last_marker)
+                    return false;
+            }
+            for (int var : written_variables[op_id]) {
+                if (read_marks[var] == last_marker || written_marks[var] == last_marker)
+                    return false;
+            }
+            return true;
+        };
+    op_ids.erase(remove_if(op_ids.begin(), op_ids.end(), commutes_with_last_operator),
+                 op_ids.end());
+
+    num_pruned_operators += op_ids.size();
+}
+
+void MovePruning::print_statistics() const {
+    utils::g_log << "Operators before move pruning: " << num_unpruned_operators << endl;
+    utils::g_log << "Operators after move pruning: " << num_pruned_operators << endl;
+}
+}
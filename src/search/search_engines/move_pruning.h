@@ -0,0 +1,53 @@
+#ifndef SEARCH_ENGINES_MOVE_PRUNING_H
+#define SEARCH_ENGINES_MOVE_PRUNING_H
+
+#include "../operator_id.h"
+#include "../task_proxy.h"
+
+#include <vector>
+
+/*
+  Move pruning for depth-first searches without duplicate detection.
+
+  Two operators a and b commute if neither of them writes a variable that
+  the other one reads or writes. If both are applicable in a state, then
+  a; b and b; a are applicable in either order, lead to the same state and
+  cost the same. So only one of the two sequences has to be searched:
+  after applying an operator, the operators with a smaller ID that commute
+  with it are pruned, which keeps the sequences of commuting operators in
+  increasing order of their IDs.
+
+  The pruning is safe for tree searches with cycle checks (such as IDA*).
+  It is not safe in combination with other pruning methods that are based
+  on the same redundancy, such as partial-order reduction, or with
+  duplicate detection across different paths.
+*/
+
+namespace move_pruning {
+class MovePruning {
+    // Variables read (in preconditions) and written (in effects) by each operator.
+    std::vector<std::vector<int>> read_variables;
+    std::vector<std::vector<int>> written_variables;
+
+    // Variables read or written by the last operator, marked with last_marker.
+    std::vector<int> read_marks;
+    std::vector<int> written_marks;
+    int last_marker;
+
+    long unsigned int num_unpruned_operators;
+    long unsigned int num_pruned_operators;
+
+public:
+    explicit MovePruning(const TaskProxy &task_proxy);
+
+    /*
+      Remove the operators from op_ids that are redundant after
+      last_operator, which generated the state they are applicable in.
+    */
+    void prune_operators(OperatorID last_operator, std::vector<OperatorID> &op_ids);
+
+    void print_statistics() const;
+};
+}
+
+#endif
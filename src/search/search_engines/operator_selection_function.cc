@@ -0,0 +1,56 @@
+#include "operator_selection_function.h"
+
+#include "../pdbs/pattern_database.h"
+#include "../task_utils/task_properties.h"
+
+using namespace std;
+
+namespace operator_selection_function {
+PDBOperatorSelectionFunction::PDBOperatorSelectionFunction(
+    const TaskProxy &task_proxy, const shared_ptr<pdbs::PatternDatabase> &pdb)
+    : pdb(pdb) {
+    task_properties::verify_no_axioms(task_proxy);
+    task_properties::verify_no_conditional_effects(task_proxy);
+
+    const pdbs::Pattern &pattern = pdb->get_pattern();
+    const vector<int> &hash_multipliers = pdb->get_hash_multipliers();
+    vector<int> multiplier_by_var(task_proxy.get_variables().size(), 0);
+    for (size_t i = 0; i < pattern.size(); ++i) {
+        multiplier_by_var[pattern[i]] = hash_multipliers[i];
+    }
+
+    OperatorsProxy operators = task_proxy.get_operators();
+    pattern_effects_by_operator.resize(operators.size());
+    for (OperatorProxy op : operators) {
+        for (EffectProxy effect : op.get_effects()) {
+            FactPair fact = effect.get_fact().get_pair();
+            if (multiplier_by_var[fact.var] != 0) {
+                pattern_effects_by_operator[op.get_id()].push_back(
+                    {fact.var, fact.value, multiplier_by_var[fact.var]});
+            }
+        }
+    }
+}
+
+int PDBOperatorSelectionFunction::get_index(const State &state) const {
+    const pdbs::Pattern &pattern = pdb->get_pattern();
+    const vector<int> &hash_multipliers = pdb->get_hash_multipliers();
+    int index = 0;
+    for (size_t i = 0; i < pattern.size(); ++i) {
+        index += hash_multipliers[i] * state[pattern[i]].get_value();
+    }
+    return index;
+}
+
+int PDBOperatorSelectionFunction::get_h_value(int index) const {
+    return pdb->get_value_for_index(index);
+}
+
+int PDBOperatorSelectionFunction::get_successor_h_value(
+    const State &state, int index, OperatorID op) const {
+    for (const PatternEffect &effect : pattern_effects_by_operator[op.get_index()]) {
+        index += (effect.value - state[effect.var].get_value()) * effect.multiplier;
+    }
+    return pdb->get_value_for_index(index);
+}
+}
@@ -0,0 +1,64 @@
+#ifndef SEARCH_ENGINES_OPERATOR_SELECTION_FUNCTION_H
+#define SEARCH_ENGINES_OPERATOR_SELECTION_FUNCTION_H
+
+#include "../operator_id.h"
+#include "../task_proxy.h"
+
+#include <memory>
+#include <vector>
+
+namespace pdbs {
+class PatternDatabase;
+}
+
+/*
+  Operator selection function (OSF) for Enhanced Partial Expansion A*
+  (EPEA*), based on a pattern database.
+
+  An OSF tells, for a state and an applicable operator, the f-value of the
+  successor without generating it. Here, the change of the PDB index that an
+  operator causes is precomputed per operator from its effects on the
+  pattern variables, so the PDB value of a successor is one table lookup
+  away from the index of its parent:
+
+      index(succ) = index(s) + sum over effects (v := d) on the pattern
+                               of (d - s[v]) * multiplier(v)
+
+  Operators without effects on the pattern do not change the PDB value at
+  all. Since PDBs are consistent, g(s) + cost(o) + h_PDB(succ) is a lower
+  bound on the f-value of the successor for every admissible heuristic that
+  dominates the PDB, and it is exactly its f-value if the search uses the
+  same PDB.
+*/
+
+namespace operator_selection_function {
+class PDBOperatorSelectionFunction {
+    struct PatternEffect {
+        int var;
+        int value;
+        int multiplier;
+    };
+
+    std::shared_ptr<pdbs::PatternDatabase> pdb;
+    std::vector<std::vector<PatternEffect>> pattern_effects_by_operator;
+
+public:
+    PDBOperatorSelectionFunction(
+        const TaskProxy &task_proxy,
+        const std::shared_ptr<pdbs::PatternDatabase> &pdb);
+
+    // Return the PDB index of a (packed or unpacked) state.
+    int get_index(const State &state) const;
+
+    // Return the PDB value of the abstract state with the given index.
+    int get_h_value(int index) const;
+
+    /*
+      Return the PDB value of the successor of the state with the given
+      index when applying op, which must be applicable in state.
+    */
+    int get_successor_h_value(const State &state, int index, OperatorID op) const;
+};
+}
+
+#endif
@@ -0,0 +1,309 @@
+#include "parallel_bounded_dfs.h"
+
+#include "../axioms.h"
+#include "../evaluation_context.h"
+#include "../evaluator.h"
+
+#include "../task_utils/successor_generator.h"
+#include "../task_utils/task_properties.h"
+#include "../utils/logging.h"
+#include "../utils/system.h"
+
+#include <algorithm>
+#include <cassert>
+#include <chrono>
+#include <climits>
+#include <thread>
+
+using namespace std;
+
+namespace parallel_bounded_dfs {
+State get_unregistered_successor(
+    const AbstractTask &task, AxiomEvaluator *axiom_evaluator,
+    const State &state, const OperatorProxy &op) {
+    vector<int> new_values = state.get_unpacked_values();
+    for (EffectProxy effect : op.get_effects()) {
+        if (does_fire(effect, state)) {
+            FactPair effect_fact = effect.get_fact().get_pair();
+            new_values[effect_fact.var] = effect_fact.value;
+        }
+    }
+    if (axiom_evaluator)
+        axiom_evaluator->evaluate(new_values);
+    return State(task, move(new_values));
+}
+
+ParallelBoundedDfs::ParallelBoundedDfs(
+    const shared_ptr<AbstractTask> &task,
+    const successor_generator::SuccessorGenerator &successor_generator,
+    const vector<shared_ptr<Evaluator>> &evaluators,
+    size_t h_cache_memory_per_worker)
+    : task(task),
+      task_proxy(*task),
+      successor_generator(successor_generator),
+      threshold(-1),
+      prefix_on_path(nullptr),
+      new_threshold(INT_MAX),
+      solved(false),
+      num_idle_workers(0),
+      num_iterations(0),
+      total_wall_time(0) {
+    assert(!evaluators.empty());
+    if (evaluators.size() > 1)
+        utils::share_heap_between_threads();
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        unique_ptr<Worker> worker = make_unique<Worker>();
+        worker->evaluator = evaluator;
+        if (!task_proxy.get_axioms().empty())
+            worker->axiom_evaluator = make_unique<AxiomEvaluator>(task_proxy);
+        if (evaluator->does_cache_estimates())
+            worker->h_value_cache = make_unique<h_value_cache::HValueCache>(
+                h_cache_memory_per_worker);
+        worker->total_num_expansions = 0;
+        worker->total_num_steals = 0;
+        workers.push_back(move(worker));
+    }
+}
+
+ParallelBoundedDfs::~ParallelBoundedDfs() {
+}
+
+int ParallelBoundedDfs::evaluate(Worker &worker, const State &state, int g_value) {
+    auto compute_h_value = [&]() {
+        EvaluationContext eval_context(state, g_value, false, nullptr);
+        ++worker.num_evaluations;
+        return eval_context.get_evaluator_value_or_infinity(worker.evaluator.get());
+    };
+
+    if (worker.h_value_cache)
+        return worker.h_value_cache->get_h_value(state, compute_h_value);
+    return compute_h_value();
+}
+
+void ParallelBoundedDfs::expand(Worker &worker, const Node &node) {
+    if (task_properties::is_goal_state(task_proxy, node.state)) {
+        lock_guard<mutex> lock(solution_mutex);
+        if (!solved) {
+            solution_path.clear();
+            for (const Frame &frame : worker.frames)
+                solution_path.push_back(frame.node);
+            solution_path.push_back(node);
+            solved = true;
+        }
+        return;
+    }
+
+    ++worker.num_expansions;
+    worker.applicable_operators.clear();
+    successor_generator.generate_applicable_ops(node.state, worker.applicable_operators);
+    worker.expanding_hash.clear();
+    worker.expanding_hash[node.state.get_unpacked_values()] = node.g_value;
+    worker.children.clear();
+
+    OperatorsProxy operators = task_proxy.get_operators();
+    for (OperatorID op_id : worker.applicable_operators) {
+        OperatorProxy op = operators[op_id];
+        State successor = get_unregistered_successor(
+            *task, worker.axiom_evaluator.get(), node.state, op);
+        ++worker.num_generations;
+
+        const vector<int> &successor_values = successor.get_unpacked_values();
+        if (worker.on_path.count(successor_values))
+            continue;
+
+        int successor_g_value = node.g_value + op.get_cost();
+        auto it = worker.expanding_hash.find(successor_values);
+        if (it != worker.expanding_hash.end() && it->second <= successor_g_value)
+            continue;
+
+        int successor_h_value = evaluate(worker, successor, successor_g_value);
+        if (successor_h_value == INT_MAX)
+            continue;
+
+        int successor_f_value = successor_g_value + successor_h_value;
+        if (successor_f_value > threshold) {
+            int current_new_threshold = new_threshold;
+            while (successor_f_value < current_new_threshold &&
+                   !new_threshold.compare_exchange_weak(current_new_threshold, successor_f_value)) {
+            }
+            continue;
+        }
+
+        worker.expanding_hash[successor_values] = successor_g_value;
+        worker.children.push_back({Node(successor, successor_g_value, op.get_id()), successor_f_value});
+    }
+
+    // Drop children for whose state a sibling with a better g value was generated later.
+    worker.children.erase(
+        remove_if(worker.children.begin(), worker.children.end(),
+                  [&](const Child &child) {
+                      return worker.expanding_hash[child.node.state.get_unpacked_values()] <
+                      child.node.g_value;
+                  }),
+        worker.children.end());
+    // Expand children with smaller f values first and break ties in favour of larger g values.
+    sort(worker.children.begin(), worker.children.end(),
+         [](const Child &child_1, const Child &child_2) {
+             if (child_1.f_value != child_2.f_value)
+                 return child_1.f_value > child_2.f_value;
+             return child_1.node.g_value < child_2.node.g_value;
+         });
+
+    Frame frame(node);
+    frame.children.reserve(worker.children.size());
+    for (Child &child : worker.children)
+        frame.children.push_back(move(child.node));
+    worker.on_path.insert(node.state.get_unpacked_values());
+    lock_guard<mutex> lock(worker.frames_mutex);
+    worker.frames.push_back(move(frame));
+}
+
+bool ParallelBoundedDfs::pop_child(Worker &worker, vector<Node> &next) {
+    lock_guard<mutex> lock(worker.frames_mutex);
+    while (!worker.frames.empty() && worker.frames.back().children.empty()) {
+        worker.on_path.erase(worker.frames.back().node.state.get_unpacked_values());
+        worker.frames.pop_back();
+    }
+    if (worker.frames.empty())
+        return false;
+    next.push_back(move(worker.frames.back().children.back()));
+    worker.frames.back().children.pop_back();
+    return true;
+}
+
+bool ParallelBoundedDfs::steal(int worker_id, vector<Node> &path) {
+    int num_workers = workers.size();
+    for (int offset = 1; offset < num_workers; ++offset) {
+        Worker &victim = *workers[(worker_id + offset) % num_workers];
+        lock_guard<mutex> lock(victim.frames_mutex);
+        int num_frames = victim.frames.size();
+        for (int i = 0; i < num_frames; ++i) {
+            vector<Node> &children = victim.frames[i].children;
+            if (children.empty())
+                continue;
+            for (int j = 0; j <= i; ++j)
+                path.push_back(victim.frames[j].node);
+            // The first child is the one the victim would expand last.
+            path.push_back(move(children.front()));
+            children.erase(children.begin());
+            /*
+              The thief stops being idle before the victim can become idle,
+              so the number of idle workers never reaches the number of
+              workers while there is work left.
+            */
+            --num_idle_workers;
+            return true;
+        }
+    }
+    return false;
+}
+
+void ParallelBoundedDfs::run_worker(int worker_id) {
+    Worker &worker = *workers[worker_id];
+    int num_workers = workers.size();
+    vector<Node> next;
+
+    while (!solved) {
+        if (next.empty() && !pop_child(worker, next)) {
+            ++num_idle_workers;
+            while (!solved && num_idle_workers < num_workers) {
+                if (steal(worker_id, next))
+                    break;
+                this_thread::yield();
+            }
+            if (next.empty())
+                return;
+
+            ++worker.num_steals;
+            worker.on_path = *prefix_on_path;
+            lock_guard<mutex> lock(worker.frames_mutex);
+            assert(worker.frames.empty());
+            for (size_t i = 0; i + 1 < next.size(); ++i) {
+                worker.on_path.insert(next[i].state.get_unpacked_values());
+                worker.frames.emplace_back(next[i]);
+            }
+            next.erase(next.begin(), next.end() - 1);
+        }
+        assert(next.size() == 1);
+        expand(worker, next.back());
+        next.clear();
+    }
+}
+
+Result ParallelBoundedDfs::search(
+    const State &root, int root_g_value, int threshold,
+    const utils::HashSet<vector<int>> &prefix_on_path) {
+    assert(!root.get_registry());
+    auto start_time = chrono::steady_clock::now();
+
+    this->threshold = threshold;
+    this->prefix_on_path = &prefix_on_path;
+    new_threshold = INT_MAX;
+    solved = false;
+    num_idle_workers = 0;
+    solution_path.clear();
+    for (unique_ptr<Worker> &worker : workers) {
+        worker->frames.clear();
+        worker->on_path = prefix_on_path;
+        worker->num_expansions = 0;
+        worker->num_generations = 0;
+        worker->num_evaluations = 0;
+        worker->num_steals = 0;
+    }
+
+    // The root is expanded before the threads start, so that there is work to steal.
+    expand(*workers[0], Node(root, root_g_value, -1));
+
+    vector<thread> threads;
+    for (size_t worker_id = 1; worker_id < workers.size(); ++worker_id)
+        threads.emplace_back(&ParallelBoundedDfs::run_worker, this, worker_id);
+    run_worker(0);
+    for (thread &worker_thread : threads)
+        worker_thread.join();
+
+    Result result;
+    result.solved = solved;
+    result.solution_path = move(solution_path);
+    result.new_threshold = new_threshold;
+    result.num_expansions = 0;
+    result.num_generations = 0;
+    result.num_evaluations = 0;
+    for (unique_ptr<Worker> &worker : workers) {
+        result.num_expansions += worker->num_expansions;
+        result.num_generations += worker->num_generations;
+        result.num_evaluations += worker->num_evaluations;
+        worker->total_num_expansions += worker->num_expansions;
+        worker->total_num_steals += worker->num_steals;
+    }
+
+    ++num_iterations;
+    total_wall_time += chrono::duration<double>(chrono::steady_clock::now() - start_time).count();
+    return result;
+}
+
+int ParallelBoundedDfs::get_num_workers() const {
+    return workers.size();
+}
+
+void ParallelBoundedDfs::print_statistics() const {
+    long unsigned int total_num_expansions = 0;
+    long unsigned int max_num_expansions = 0;
+    for (const unique_ptr<Worker> &worker : workers) {
+        total_num_expansions += worker->total_num_expansions;
+        max_num_expansions = max(max_num_expansions, worker->total_num_expansions);
+    }
+    utils::g_log << "Second phase threads: " << workers.size() << endl;
+    for (size_t worker_id = 0; worker_id < workers.size(); ++worker_id) {
+        utils::g_log << "Second phase thread " << worker_id << " expansions: "
+                     << workers[worker_id]->total_num_expansions << ", steals: "
+                     << workers[worker_id]->total_num_steals << endl;
+    }
+    // Fraction of the expansions that would have been done with perfect load balancing.
+    double load_balance = max_num_expansions == 0 ? 1.0 :
+        double(total_num_expansions) / double(workers.size() * max_num_expansions);
+    utils::g_log << "Second phase load balance: " << load_balance << endl;
+    utils::g_log << "Second phase wall time: " << total_wall_time << "s" << endl;
+    utils::g_log << "Second phase expansions per second: "
+                 << (total_wall_time > 0 ? total_num_expansions / total_wall_time : 0) << endl;
+}
+}
@@ -0,0 +1,170 @@
+#ifndef SEARCH_ENGINES_PARALLEL_BOUNDED_DFS_H
+#define SEARCH_ENGINES_PARALLEL_BOUNDED_DFS_H
+
+#include "h_value_cache.h"
+
+#include "../operator_id.h"
+#include "../task_proxy.h"
+
+#include "../utils/hash.h"
+
+#include <atomic>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+class AbstractTask;
+class AxiomEvaluator;
+class Evaluator;
+
+namespace successor_generator {
+class SuccessorGenerator;
+}
+
+/*
+  ParallelBoundedDfs runs one iteration of a depth-first search bounded by
+  an f-threshold (as the iterations of IDA*) on several threads. States are
+  never registered, so the workers only share read-only task data. Every
+  worker has its own evaluator, axiom evaluator and successor buffers.
+
+  Every worker keeps its DFS stack as a sequence of frames. A frame holds a
+  node on the current path of the worker and the children of that node that
+  have not been expanded yet. A worker without work steals the child of the
+  frame closest to the root of another worker (i.e. the largest remaining
+  subtree), together with a copy of the path leading to it, which it needs
+  for cycle checks and to reconstruct a solution.
+
+  The threshold is the same for all workers, so every node with an f value
+  of at most the threshold is expanded by exactly one worker, as in the
+  sequential iteration. A goal found by any worker is reached with a cost
+  of at most the threshold, so the solution is optimal whenever the
+  threshold is a lower bound on the optimal solution cost.
+
+  All workers allocate from the main heap (see
+  utils::share_heap_between_threads), so the only memory a worker thread
+  adds beyond its own data is its stack, which reserves 8 MB of address
+  space on Linux. With n threads, the peak memory is about 8(n - 1) MB
+  above that of the sequential second phase.
+*/
+
+namespace parallel_bounded_dfs {
+struct Node {
+    State state;
+    int g_value;
+    int generating_operator_proxy_id;
+
+    Node(const State &state, int g_value, int generating_operator_proxy_id)
+        : state(state),
+          g_value(g_value),
+          generating_operator_proxy_id(generating_operator_proxy_id) {
+    }
+};
+
+/*
+  Same as State::get_unregistered_successor, but with the given axiom
+  evaluator (if the task has axioms) instead of the one shared by all users
+  of the task, so that it can be called from several threads.
+*/
+extern State get_unregistered_successor(
+    const AbstractTask &task, AxiomEvaluator *axiom_evaluator,
+    const State &state, const OperatorProxy &op);
+
+struct Result {
+    bool solved;
+    // From the root of the iteration to the goal, if solved.
+    std::vector<Node> solution_path;
+    // Smallest f value above the threshold, or INT_MAX if there is none.
+    int new_threshold;
+    long unsigned int num_expansions;
+    long unsigned int num_generations;
+    long unsigned int num_evaluations;
+};
+
+class ParallelBoundedDfs {
+    struct Frame {
+        Node node;
+        // Sorted so that the child to expand next is the last one.
+        std::vector<Node> children;
+
+        explicit Frame(const Node &node)
+            : node(node) {
+        }
+    };
+
+    struct Child {
+        Node node;
+        int f_value;
+    };
+
+    struct Worker {
+        std::shared_ptr<Evaluator> evaluator;
+        std::unique_ptr<AxiomEvaluator> axiom_evaluator;
+        std::unique_ptr<h_value_cache::HValueCache> h_value_cache;
+
+        // Guards frames, which other workers read when stealing.
+        std::mutex frames_mutex;
+        std::vector<Frame> frames;
+        utils::HashSet<std::vector<int>> on_path;
+
+        std::vector<OperatorID> applicable_operators;
+        std::vector<Child> children;
+        utils::HashMap<std::vector<int>, int> expanding_hash;
+
+        long unsigned int num_expansions;
+        long unsigned int num_generations;
+        long unsigned int num_evaluations;
+        long unsigned int num_steals;
+        long unsigned int total_num_expansions;
+        long unsigned int total_num_steals;
+    };
+
+    const std::shared_ptr<AbstractTask> task;
+    TaskProxy task_proxy;
+    const successor_generator::SuccessorGenerator &successor_generator;
+    std::vector<std::unique_ptr<Worker>> workers;
+
+    // State of the current iteration.
+    int threshold;
+    const utils::HashSet<std::vector<int>> *prefix_on_path;
+    std::atomic<int> new_threshold;
+    std::atomic<bool> solved;
+    std::atomic<int> num_idle_workers;
+    std::mutex solution_mutex;
+    std::vector<Node> solution_path;
+
+    int num_iterations;
+    double total_wall_time;
+
+    int evaluate(Worker &worker, const State &state, int g_value);
+    void expand(Worker &worker, const Node &node);
+    bool pop_child(Worker &worker, std::vector<Node> &next);
+    bool steal(int worker_id, std::vector<Node> &next);
+    void run_worker(int worker_id);
+
+public:
+    /*
+      evaluators holds one independent instance of the (path-independent)
+      heuristic per worker thread.
+    */
+    ParallelBoundedDfs(
+        const std::shared_ptr<AbstractTask> &task,
+        const successor_generator::SuccessorGenerator &successor_generator,
+        const std::vector<std::shared_ptr<Evaluator>> &evaluators,
+        std::size_t h_cache_memory_per_worker);
+    ~ParallelBoundedDfs();
+
+    /*
+      Search all paths from root (an unregistered state reached with g value
+      root_g_value) with f values of at most threshold that do not visit a
+      state of prefix_on_path.
+    */
+    Result search(
+        const State &root, int root_g_value, int threshold,
+        const utils::HashSet<std::vector<int>> &prefix_on_path);
+
+    int get_num_workers() const;
+    void print_statistics() const;
+};
+}
+
+#endif
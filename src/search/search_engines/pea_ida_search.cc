@@ -3,15 +3,22 @@
 #include "../evaluation_context.h"
 #include "../evaluator.h"
 #include "../option_parser.h"
+#include "../pruning_method.h"
 
 #include "../algorithms/ordered_set.h"
+#include "../pdbs/pattern_generator.h"
+#include "../pdbs/pattern_information.h"
+#include "../pruning/null_pruning_method.h"
 #include "../task_utils/task_properties.h"
 #include "../task_utils/successor_generator.h"
 
 #include "../utils/logging.h"
 
 #include <cassert>
+#include <cmath>
 #include <cstdlib>
+#include <cstring>
+#include <fstream>
 #include <memory>
 #include <optional.hh>
 #include <set>
@@ -24,56 +31,206 @@ namespace pea_ida_search
 {
     PeaIdaSearch::PeaIdaSearch(const Options &opts)
         : SearchEngine(opts),
-          h_evaluator(opts.get<shared_ptr<Evaluator>>("eval"))
+          h_evaluator(opts.get<shared_ptr<Evaluator>>("eval")),
+          best_first_mode_timer(false),
+          ida_mode_timer(false),
+          pruning_method(opts.get<shared_ptr<PruningMethod>>("pruning")),
+          first_phase_pruning_timer(false),
+          second_phase_pruning_timer(false)
     {
+        if (transposition_table_memory > 0)
+        {
+            second_phase_transposition_table = make_unique<transposition_table::TranspositionTable>(transposition_table_memory);
+        }
+        // Only evaluators that cache their own estimates are path-independent. They cache registered states themselves, so only the transient second phase needs a cache.
+        if (using_transient_second_phase and h_evaluator->does_cache_estimates())
+        {
+            h_value_cache = make_unique<h_value_cache::HValueCache>(h_cache_memory);
+        }
+        if (dead_end_memo_memory > 0)
+        {
+            dead_end_memo = make_unique<dead_end_memo::DeadEndMemo>(state_registry, using_transient_second_phase ? dead_end_memo_memory : 0);
+        }
+        vector<shared_ptr<Evaluator>> evaluators = {h_evaluator};
+        for (const shared_ptr<Evaluator> &worker_evaluator: opts.get<vector<shared_ptr<Evaluator>>>("worker_evals"))
+        {
+            evaluators.push_back(worker_evaluator);
+        }
+        if (first_phase_threads > 1)
+        {
+            first_phase_hash_distributed_search = make_unique<hash_distributed_search::HashDistributedSearch>(task, successor_generator, vector<shared_ptr<Evaluator>>(evaluators.begin(), evaluators.begin() + first_phase_threads), open_limit, open_memory_budget, using_partial_expansion);
+        }
+        if (using_enhanced_partial_expansion)
+        {
+            pdbs::PatternInformation pattern_information = opts.get<shared_ptr<pdbs::PatternGenerator>>("osf_pattern")->generate(task);
+            expansion_osf = make_unique<operator_selection_function::PDBOperatorSelectionFunction>(task_proxy, pattern_information.get_pdb());
+        }
+        if (using_move_pruning)
+        {
+            // Move pruning and partial-order reduction may each prune the only optimal path the other one keeps, and the transposition table detects duplicates across paths.
+            if (not dynamic_pointer_cast<null_pruning_method::NullPruningMethod>(pruning_method) or second_phase_transposition_table)
+            {
+                cerr << "Move pruning cannot be combined with a pruning method or a transposition table" << endl;
+                utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+            }
+            second_phase_move_pruning = make_unique<move_pruning::MovePruning>(task_proxy);
+        }
+        if (using_symmetry_pruning)
+        {
+            // Both move pruning and partial-order reduction prune operators of the states they are applied in, not of their orbit representatives.
+            if (not dynamic_pointer_cast<null_pruning_method::NullPruningMethod>(pruning_method) or using_move_pruning)
+            {
+                cerr << "Symmetry pruning cannot be combined with a pruning method or move pruning" << endl;
+                utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+            }
+            structural_symmetries = make_unique<structural_symmetries::StructuralSymmetries>(task_proxy);
+            if (not structural_symmetries->has_symmetries())
+            {
+                structural_symmetries = nullptr;
+            }
+        }
+        // Partial expansion keeps successors out of the open queue by their F-values, which deferred evaluation does not know when they are generated.
+        if (using_deferred_evaluation and using_partial_expansion)
+        {
+            cerr << "Deferred evaluation cannot be combined with partial expansion" << endl;
+            utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+        }
+        if (not spill_directory.empty())
+        {
+            first_phase_spilled_open_list = make_unique<spilled_open_list::SpilledOpenList>(spill_directory);
+        }
+        if (not checkpoint_file.empty())
+        {
+            checkpoint_writer = make_unique<checkpoint::CheckpointWriter>(checkpoint_file);
+        }
+        if (perimeter_memory > 0)
+        {
+            goal_perimeter = make_unique<goal_perimeter::GoalPerimeter>(task_proxy, perimeter_memory);
+        }
+        if (second_phase_threads > 1)
+        {
+            second_phase_parallel_dfs = make_unique<parallel_bounded_dfs::ParallelBoundedDfs>(task, successor_generator, vector<shared_ptr<Evaluator>>(evaluators.begin(), evaluators.begin() + second_phase_threads), h_cache_memory / second_phase_threads);
+        }
     }
 
     void PeaIdaSearch::initialize()
     {
-        State initial_state = state_registry.get_initial_state();
-
-        EvaluationContext eval_context(initial_state, 0, false, &statistics);
-        int initial_h_value = eval_context.get_evaluator_value_or_infinity(h_evaluator.get());
-        statistics.inc_evaluated_states();
-
-        first_phase_initial_node = {initial_state.get_id(), 0, initial_h_value, 0};
-
-        if (initial_h_value != INT_MAX)
-        {
-            push_in_first_phase_open_queue(first_phase_initial_node);
-        }
-
         current_phase = FIRST_PHASE;
         second_phase_needed = false;
         open_peak_size = 0;
         closed_peak_size = 0;
+        first_phase_memory_peak = 0;
+        first_phase_closed_size = 0;
+        first_phase_open_big_f_value_sum = 0;
+        first_phase_open_depth_sum = 0;
         number_of_first_phase_expansions = 0;
         number_of_second_phase_expansions = 0;
         number_of_first_phase_generations = 0;
         number_of_second_phase_generations = 0;
+        number_of_first_phase_evaluations = 0;
+        number_of_second_phase_evaluations = 0;
+        number_of_deferred_evaluations = 0;
+        number_of_performed_deferred_evaluations = 0;
         number_of_second_phase_transitions = 0;
+        number_of_mode_switches = 0;
+        number_of_stale_spilled_nodes = 0;
+        number_of_frontier_prunings = 0;
+        number_of_forgotten_nodes = 0;
+        number_of_reopened_predecessors = 0;
+        number_of_osf_deferred_successors = 0;
+        expanding_osf_generated_big_f_value = -1;
+        expanding_has_forgotten_successors = false;
+        number_of_first_phase_unpruned_operators = 0;
+        number_of_first_phase_pruned_operators = 0;
+        number_of_second_phase_unpruned_operators = 0;
+        number_of_second_phase_pruned_operators = 0;
+        number_of_grown_thresholds = 0;
+        number_of_bounded_sweeps = 0;
+        number_of_second_phase_reexpansions = 0;
         expanding = false;
+        pruning_method->initialize(task);
+
+        if (not resume_file.empty())
+        {
+            first_phase_hash_distributed_search = nullptr;
+            read_checkpoint(resume_file);
+        }
+        else
+        {
+            State initial_state = state_registry.get_initial_state();
+
+            int initial_h_value = evaluate(initial_state, 0);
+
+            first_phase_initial_node = {initial_state.get_id(), 0, initial_h_value, 0};
+
+            // The hash-distributed first phase starts from the initial state itself.
+            if (initial_h_value != INT_MAX and not first_phase_hash_distributed_search)
+            {
+                push_in_first_phase_open_queue(first_phase_initial_node);
+            }
+        }
+
+        if (second_phase_needed)
+        {
+            ida_mode_timer.resume();
+        }
+        else
+        {
+            best_first_mode_timer.resume();
+        }
     }
 
     void PeaIdaSearch::print_statistics() const
     {
         statistics.print_detailed_statistics();
         search_space.print_statistics();
+        pruning_method->print_statistics();
+        if (second_phase_move_pruning)
+        {
+            second_phase_move_pruning->print_statistics();
+        }
     }
 
     SearchStatus PeaIdaSearch::step()
     {
         open_peak_size = max(open_peak_size, first_phase_open_queue.size());
-        closed_peak_size = max(closed_peak_size, first_phase_closed_hash.size());
+        closed_peak_size = max(closed_peak_size, first_phase_closed_size);
 
         if (current_phase == FIRST_PHASE)
         {
+            first_phase_memory_peak = max(first_phase_memory_peak, get_first_phase_memory_usage_in_bytes());
+
+            // Between two expansions of the sequential first phase, the whole search is described by its first-phase data.
+            if (checkpoint_writer and not expanding and not first_phase_hash_distributed_search and checkpoint_timer() >= checkpoint_interval and not checkpoint_writer->is_busy())
+            {
+                // The child process that writes the checkpoint has its own CPU clock, so the search time is taken here.
+                double search_time = resumed_search_time + best_first_mode_timer() + ida_mode_timer();
+                checkpoint_writer->write([&](ostream &out)
+                {
+                    write_checkpoint(out, search_time);
+                });
+                checkpoint_timer.reset();
+            }
+
+            if (first_phase_hash_distributed_search)
+            {
+                return first_phase_hash_distributed_step();
+            }
             return first_phase_step();
         }
         if (current_phase == SECOND_PHASE)
         {
+            if (second_phase_parallel_dfs)
+            {
+                return second_phase_parallel_step();
+            }
+            if (using_transient_second_phase)
+            {
+                return second_phase_transient_step();
+            }
             return second_phase_step();
         }
+        utils::exit_with(utils::ExitCode::SEARCH_CRITICAL_ERROR);
     }
 
     SearchStatus PeaIdaSearch::first_phase_step()
@@ -82,71 +239,61 @@ namespace pea_ida_search
         {
             if (not expanding_operators.empty())
             {
-                OperatorID applicable_operator = expanding_operators.back();
-                expanding_operators.pop_back();
-
                 State expanding_state = state_registry.lookup_state(expanding_node.state_id);
-                OperatorProxy applicable_operator_proxy = task_proxy.get_operators()[applicable_operator];
-                State successor_state = state_registry.get_successor_state(expanding_state, applicable_operator_proxy);
-                statistics.inc_generated();
-                number_of_first_phase_generations++;
 
-                StateID successor_state_id = successor_state.get_id();
-                int successor_g_value = expanding_node.g_value + applicable_operator_proxy.get_cost();
-
-                if (expanding_hash.find(successor_state_id) != expanding_hash.end() and expanding_hash[successor_state_id] <= successor_g_value)
+                do
                 {
-                    return IN_PROGRESS;
-                }
+                    OperatorID applicable_operator = expanding_operators.back();
+                    expanding_operators.pop_back();
 
-                if (first_phase_closed_hash.find(successor_state_id) != first_phase_closed_hash.end())
-                {
-                    if (first_phase_closed_hash[successor_state_id] <= successor_g_value)
-                    {
-                        return IN_PROGRESS;
-                    }
+                    generate_in_first_phase(expanding_state, applicable_operator);
+                } while (using_whole_node_expansion and not expanding_operators.empty());
 
-                    first_phase_closed_hash.erase(successor_state_id);
+                if (not using_whole_node_expansion)
+                {
+                    return IN_PROGRESS;
                 }
+            }
 
-                if (first_phase_open_queue_hash.find(successor_state_id) != first_phase_open_queue_hash.end())
+            if (using_deferred_evaluation)
+            {
+                // The F-value of the expanding node is a lower bound for the F-values of its successors, which are evaluated when they are popped.
+                for (GeneratedSuccessor &generated_successor: generated_successors)
                 {
-                    if (first_phase_open_queue_hash[successor_state_id].first <= successor_g_value)
-                    {
-                        return IN_PROGRESS;
-                    }
-
-                    pop_from_first_phase_open_queue(first_phase_open_queue_hash[successor_state_id].second);
+                    generated_successor.h_value = max(0, expanding_node.big_f_value - generated_successor.g_value);
                 }
-
-                EvaluationContext eval_context(successor_state, successor_g_value, false, &statistics);
-                int successor_h_value = eval_context.get_evaluator_value_or_infinity(h_evaluator.get());
-                statistics.inc_evaluated_states();
-
-                if (successor_h_value == INT_MAX)
+                number_of_deferred_evaluations += generated_successors.size();
+            }
+            else
+            {
+                evaluate_generated_successors(state_registry.lookup_state(expanding_node.state_id));
+            }
+            for (const GeneratedSuccessor &generated_successor: generated_successors)
+            {
+                if (generated_successor.h_value == INT_MAX)
                 {
-                    return IN_PROGRESS;
+                    continue;
                 }
 
-                generating_nodes.push_back({successor_state_id, successor_g_value, successor_g_value + successor_h_value, expanding_node.depth + 1});
+                generating_nodes.push_back({generated_successor.state.get_id(), generated_successor.g_value, generated_successor.g_value + generated_successor.h_value, expanding_node.depth + 1});
 
-                first_phase_generating_operators_proxy_ids[successor_state_id] = applicable_operator_proxy.get_id();
-                first_phase_predecessors_state_ids_values[successor_state_id] = expanding_node.state_id.value;
-                expanding_hash[successor_state_id] = successor_g_value;
-
-                return IN_PROGRESS;
+                NodeInfo &successor_node_info = first_phase_node_infos[generated_successor.state];
+                successor_node_info.generating_operator_proxy_id = generated_successor.generating_operator_proxy_id;
+                successor_node_info.predecessor_state_id_value = expanding_node.state_id.value;
+                successor_node_info.evaluation_deferred = using_deferred_evaluation;
             }
+            generated_successors.clear();
 
             int new_big_f_value = INT_MAX;
-            vector<OpenNode> generating_nodes_to_put_in_open;
-            vector<OpenNode> generating_nodes_to_re_compact;
+            generating_nodes_to_put_in_open.clear();
+            generating_nodes_to_re_compact.clear();
 
             while (not generating_nodes.empty())
             {
                 OpenNode generating_node = generating_nodes.back();
                 generating_nodes.pop_back();
 
-                if (expanding_hash[generating_node.state_id] < generating_node.g_value)
+                if (expanding_hash[generating_node.state_id.value] < generating_node.g_value)
                 {
                     continue;
                 }
@@ -162,28 +309,48 @@ namespace pea_ida_search
                 }
             }
 
-            if (first_phase_open_queue.size() + generating_nodes_to_put_in_open.size() + min((long unsigned int)1, generating_nodes_to_re_compact.size()) > open_limit)
+            // Successors deferred by the operator selection function are only represented by the expanding node.
+            bool has_deferred_successors = expanding_deferred_big_f_value != INT_MAX;
+            long unsigned int number_of_new_open_nodes = generating_nodes_to_put_in_open.size() + min((long unsigned int)1, generating_nodes_to_re_compact.size() + has_deferred_successors);
+
+            if (exceeds_open_limits(number_of_new_open_nodes) and not (first_phase_spilled_open_list and spill_first_phase_open_queue(number_of_new_open_nodes, expanding_node.big_f_value)) and not (using_frontier_pruning and prune_first_phase_open_queue(number_of_new_open_nodes, expanding_node.big_f_value)))
             {
-                print_infos_about_big_f_values_at_phase_transition();
-                print_infos_about_depths_at_phase_transition();
-                second_phase_needed = true;
+                // After a return to best-first expansion, only the transition records are printed.
+                if (number_of_second_phase_transitions == 0)
+                {
+                    print_infos_about_big_f_values_at_phase_transition();
+                    print_infos_about_depths_at_phase_transition();
+                }
+                set_second_phase_needed(true);
 
                 push_in_first_phase_open_queue(expanding_node);
             }
             else
             {
-                if (generating_nodes_to_re_compact.size() == 0)
+                // Frontier pruning may have backed up forgotten successors into the expanding node.
+                has_deferred_successors = expanding_deferred_big_f_value != INT_MAX;
+
+                if (generating_nodes_to_re_compact.size() == 0 and not has_deferred_successors)
                 {
-                    first_phase_closed_hash[expanding_node.state_id] = expanding_node.g_value;
+                    close_in_first_phase(expanding_node);
                 }
-                else if (generating_nodes_to_re_compact.size() == 1)
+                else if (generating_nodes_to_re_compact.size() == 1 and not has_deferred_successors)
                 {
-                    first_phase_closed_hash[expanding_node.state_id] = expanding_node.g_value;
+                    close_in_first_phase(expanding_node);
                     generating_nodes_to_put_in_open.push_back(generating_nodes_to_re_compact.back());
                 }
                 else
                 {
-                    expanding_node.big_f_value = new_big_f_value;
+                    // If only successors deferred by the operator selection function are left, the next expansion does not generate the others again.
+                    if (expansion_osf and generating_nodes_to_re_compact.empty() and not expanding_has_forgotten_successors)
+                    {
+                        first_phase_osf_generated_big_f_values[expanding_node.state_id.value] = expanding_node.big_f_value;
+                    }
+                    else if (expansion_osf)
+                    {
+                        first_phase_osf_generated_big_f_values.erase(expanding_node.state_id.value);
+                    }
+                    expanding_node.big_f_value = min(new_big_f_value, expanding_deferred_big_f_value);
 
                     push_in_first_phase_open_queue(expanding_node);
                 }
@@ -201,14 +368,37 @@ namespace pea_ida_search
         }
         else
         {
+            /*
+              Spilled nodes are merged back before the in-memory open queue would expand a node with a larger F-value.
+              Nodes with the same F-value as the best in-memory node are only merged back while the open limit allows it.
+            */
+            while (first_phase_spilled_open_list and not first_phase_spilled_open_list->empty() and (first_phase_open_queue.empty() or first_phase_spilled_open_list->get_min_big_f_value() < first_phase_open_queue.get_min_f() or (first_phase_spilled_open_list->get_min_big_f_value() == first_phase_open_queue.get_min_f() and first_phase_open_queue.size() < open_limit)))
+            {
+                if (first_phase_open_queue.size() >= open_limit)
+                {
+                    spill_first_phase_open_queue(1, first_phase_spilled_open_list->get_min_big_f_value());
+                }
+                merge_back_first_phase_spilled_nodes();
+            }
+
             if (first_phase_open_queue.empty())
             {
                 print_solution(true);
                 return FAILED;
             }
 
+            if (second_phase_needed and is_below_low_water_mark())
+            {
+                set_second_phase_needed(false);
+            }
+
             expanding_node = pop_from_first_phase_open_queue();
 
+            if (get_first_phase_node_info(expanding_node.state_id).evaluation_deferred and not evaluate_deferred_first_phase_node())
+            {
+                return IN_PROGRESS;
+            }
+
             if (second_phase_needed)
             {
                 if (second_phase_lower_bound.has_value() and second_phase_lower_bound.value() > expanding_node.big_f_value) // A*+IDA* \uparrow
@@ -218,19 +408,15 @@ namespace pea_ida_search
                 }
                 else
                 {
-                    second_phase_initial_node = expanding_node;
-                    second_phase_initial_node_new_big_f_value = INT_MAX;
-                    second_phase_open_queue.push(second_phase_initial_node);
-
-                    current_phase = SECOND_PHASE;
-                    number_of_second_phase_transitions++;
+                    start_second_phase();
                 }
                 return IN_PROGRESS;
             }
 
             State expanding_state = state_registry.lookup_state(expanding_node.state_id);
 
-            if (task_properties::is_goal_state(task_proxy, expanding_state))
+            // A node in the goal perimeter has an exact F-value, so it is popped only if its plan is optimal.
+            if (get_goal_distance(expanding_state, expanding_node.big_f_value - expanding_node.g_value) != -1)
             {
                 print_solution();
                 return SOLVED;
@@ -238,12 +424,88 @@ namespace pea_ida_search
 
             statistics.inc_expanded();
             number_of_first_phase_expansions++;
-            successor_generator.generate_applicable_ops(expanding_state, expanding_operators);
-            expanding_hash = {}; // Avoids generating two nodes with same state, or a node with the same state as the expanding node.
-            expanding_hash[expanding_node.state_id] = expanding_node.g_value;
+            generate_expanding_operators(expanding_state);
+            prune_expanding_operators(expanding_state, -1);
+            if (expansion_osf)
+            {
+                expanding_osf_index = expansion_osf->get_index(expanding_state);
+                expanding_osf_generated_big_f_value = get_first_phase_osf_generated_big_f_value(expanding_node.state_id);
+            }
+            expanding_deferred_big_f_value = INT_MAX;
+            expanding_has_forgotten_successors = false;
+            expanding_hash.clear(); // Avoids generating two nodes with same state, or a node with the same state as the expanding node.
+            expanding_hash[expanding_node.state_id.value] = expanding_node.g_value;
 
             expanding = true;
+
+            if (using_whole_node_expansion)
+            {
+                return first_phase_step();
+            }
+        }
+        return IN_PROGRESS;
+    }
+
+    SearchStatus PeaIdaSearch::first_phase_hash_distributed_step()
+    {
+        // The first phase runs in parallel until the global open limit is reached for the first time; then its nodes are taken over by the sequential first phase.
+        hash_distributed_search::Status status = first_phase_hash_distributed_search->search();
+        first_phase_hash_distributed_search->transfer_nodes(state_registry, [&](StateID state_id, bool open, int g_value, int big_f_value, int depth, int predecessor_state_id_value, int generating_operator_proxy_id)
+        {
+            if (open)
+            {
+                push_in_first_phase_open_queue({state_id, g_value, big_f_value, depth});
+            }
+            else
+            {
+                close_in_first_phase({state_id, g_value, -1, -1});
+            }
+            NodeInfo &node_info = get_first_phase_node_info(state_id);
+            node_info.predecessor_state_id_value = predecessor_state_id_value;
+            node_info.generating_operator_proxy_id = generating_operator_proxy_id;
+        });
+
+        statistics.inc_expanded(first_phase_hash_distributed_search->get_num_expansions());
+        statistics.inc_generated(first_phase_hash_distributed_search->get_num_generations());
+        statistics.inc_evaluated_states(first_phase_hash_distributed_search->get_num_evaluations());
+        number_of_first_phase_evaluations += first_phase_hash_distributed_search->get_num_evaluations();
+        number_of_first_phase_expansions += first_phase_hash_distributed_search->get_num_expansions();
+        number_of_first_phase_generations += first_phase_hash_distributed_search->get_num_generations();
+        open_peak_size = max(open_peak_size, first_phase_open_queue.size());
+        closed_peak_size = max(closed_peak_size, first_phase_closed_size);
+        first_phase_memory_peak = max(first_phase_memory_peak, get_first_phase_memory_usage_in_bytes());
+        first_phase_hash_distributed_search->print_statistics();
+
+        StateID goal_state_id = StateID::no_state;
+        if (status == hash_distributed_search::Status::SOLVED)
+        {
+            goal_state_id = first_phase_hash_distributed_search->get_transferred_goal_state_id();
+        }
+        first_phase_hash_distributed_search = nullptr;
+
+        if (status == hash_distributed_search::Status::SOLVED)
+        {
+            expanding_node = first_phase_open_queue.get(goal_state_id);
+            print_solution();
+            return SOLVED;
+        }
+        if (status == hash_distributed_search::Status::FAILED)
+        {
+            print_solution(true);
+            return FAILED;
+        }
+
+        if (first_phase_spilled_open_list)
+        {
+            // The sequential first phase continues by spilling instead of switching to the second phase.
+            return IN_PROGRESS;
         }
+
+        expanding_node = pop_from_first_phase_open_queue();
+        print_infos_about_big_f_values_at_phase_transition();
+        print_infos_about_depths_at_phase_transition();
+        push_in_first_phase_open_queue(expanding_node);
+        set_second_phase_needed(true);
         return IN_PROGRESS;
     }
 
@@ -253,247 +515,1502 @@ namespace pea_ida_search
         {
             if (not expanding_operators.empty())
             {
-                OperatorID applicable_operator = expanding_operators.back();
-                expanding_operators.pop_back();
-
                 State expanding_state = state_registry.lookup_state(expanding_node.state_id);
-                OperatorProxy applicable_operator_proxy = task_proxy.get_operators()[applicable_operator];
-                State successor_state = state_registry.get_successor_state(expanding_state, applicable_operator_proxy);
-                statistics.inc_generated();
-                number_of_second_phase_generations++;
 
-                StateID successor_state_id = successor_state.get_id();
-
-                for (int ancestral_state_id_value: second_phase_predecessors_state_ids_values)
-                {
-                    if (successor_state_id.value == ancestral_state_id_value)
-                    {
-                        return IN_PROGRESS;
-                    }
-                }
-                int ancestral_state_id_value = second_phase_initial_node.state_id.value;
-                while (ancestral_state_id_value != first_phase_initial_node.state_id.value)
+                do
                 {
-                    ancestral_state_id_value = first_phase_predecessors_state_ids_values[StateID(ancestral_state_id_value, true)];
-                    if (successor_state_id.value == ancestral_state_id_value)
-                    {
-                        return IN_PROGRESS;
-                    }
-                }
+                    OperatorID applicable_operator = expanding_operators.back();
+                    expanding_operators.pop_back();
 
-                int successor_g_value = expanding_node.g_value + applicable_operator_proxy.get_cost();
+                    generate_in_second_phase(expanding_state, applicable_operator);
+                } while (using_whole_node_expansion and not expanding_operators.empty());
 
-                if (expanding_hash.find(successor_state_id) != expanding_hash.end() and expanding_hash[successor_state_id] <= successor_g_value)
+                if (not using_whole_node_expansion)
                 {
                     return IN_PROGRESS;
                 }
+            }
 
-                EvaluationContext eval_context(successor_state, successor_g_value, false, &statistics);
-                int successor_h_value = eval_context.get_evaluator_value_or_infinity(h_evaluator.get());
-                statistics.inc_evaluated_states();
-
-                if (successor_h_value == INT_MAX)
+            evaluate_generated_successors(state_registry.lookup_state(expanding_node.state_id));
+            size_t number_of_open_nodes = second_phase_open_stack.size();
+            for (const GeneratedSuccessor &generated_successor: generated_successors)
+            {
+                if (generated_successor.h_value == INT_MAX)
                 {
-                    return IN_PROGRESS;
+                    continue;
                 }
 
-                if (successor_g_value + successor_h_value > second_phase_initial_node.big_f_value)
+                int successor_big_f_value = generated_successor.g_value + generated_successor.h_value;
+
+                if (successor_big_f_value > second_phase_threshold)
                 {
-                    second_phase_initial_node_new_big_f_value = min(second_phase_initial_node_new_big_f_value, successor_g_value + successor_h_value);
-                    return IN_PROGRESS;
+                    exceed_second_phase_threshold(successor_big_f_value);
+                    continue;
                 }
 
-                generating_nodes.push_back({successor_state_id, successor_g_value, successor_g_value + successor_h_value, expanding_node.depth + 1});
-
-                second_phase_generating_operators_proxy_ids.back()[successor_state_id] = applicable_operator_proxy.get_id();
-                expanding_hash[successor_state_id] = successor_g_value;
+                if (expanding_hash[generated_successor.state.get_id().value] < generated_successor.g_value)
+                {
+                    continue;
+                }
 
-                return IN_PROGRESS;
+                second_phase_open_stack.emplace_back(OpenNode(generated_successor.state.get_id(), generated_successor.g_value, successor_big_f_value, expanding_node.depth + 1), generated_successor.generating_operator_proxy_id);
             }
+            generated_successors.clear();
 
-            while (not generating_nodes.empty())
+            sort(second_phase_open_stack.begin() + number_of_open_nodes, second_phase_open_stack.end(), [](const SecondPhaseNode &open_node_1, const SecondPhaseNode &open_node_2)
             {
-                OpenNode generating_node = generating_nodes.back();
-                generating_nodes.pop_back();
-
-                if (expanding_hash[generating_node.state_id] < generating_node.g_value)
+                if (open_node_1.big_f_value not_eq open_node_2.big_f_value)
                 {
-                    continue;
+                    return open_node_1.big_f_value > open_node_2.big_f_value;
                 }
-
-                second_phase_open_queue.push(generating_node);
-            }
+                return open_node_1.g_value < open_node_2.g_value;
+            });
 
             expanding = false;
         }
         else
         {
-            if (second_phase_open_queue.empty())
+            if (second_phase_open_stack.empty())
             {
-                if (second_phase_initial_node_new_big_f_value != INT_MAX)
-                {
-                    second_phase_initial_node.big_f_value = second_phase_initial_node_new_big_f_value;
-                    push_in_first_phase_open_queue(second_phase_initial_node);
-                }
-                else
-                {
-                    first_phase_closed_hash[second_phase_initial_node.state_id] = second_phase_initial_node.g_value;
-                }
-
-                current_phase = FIRST_PHASE;
+                finish_second_phase();
                 return IN_PROGRESS;
             }
 
-            expanding_node = second_phase_open_queue.top();
-            second_phase_open_queue.pop();
+            expanding_node = second_phase_open_stack.back();
+            int generating_operator_proxy_id = second_phase_open_stack.back().generating_operator_proxy_id;
+            second_phase_open_stack.pop_back();
 
-            while (second_phase_predecessors_state_ids_values.size() > expanding_node.depth - second_phase_initial_node.depth)
+            int path_depth = expanding_node.depth - second_phase_initial_node.depth;
+            while (second_phase_predecessors_state_ids_values.size() > static_cast<size_t>(path_depth))
             {
+                unmark_on_second_phase_path(second_phase_predecessors_state_ids_values.back());
                 second_phase_predecessors_state_ids_values.pop_back();
-                second_phase_generating_operators_proxy_ids.pop_back();
+            }
+            second_phase_generating_operators_proxy_ids.resize(path_depth);
+            second_phase_generating_operators_proxy_ids.push_back(generating_operator_proxy_id);
+
+            // The threshold may have been lowered after the node was generated.
+            if (expanding_node.big_f_value > second_phase_threshold)
+            {
+                exceed_second_phase_threshold(expanding_node.big_f_value);
+                return IN_PROGRESS;
             }
 
             State expanding_state = state_registry.lookup_state(expanding_node.state_id);
 
-            if (task_properties::is_goal_state(task_proxy, expanding_state))
+            int goal_distance = get_goal_distance(expanding_state, expanding_node.big_f_value - expanding_node.g_value);
+            if (goal_distance != -1)
             {
-                print_solution();
-                return SOLVED;
+                if (is_optimal_second_phase_goal(expanding_node.g_value + goal_distance))
+                {
+                    print_solution();
+                    return SOLVED;
+                }
+                return IN_PROGRESS;
             }
 
             statistics.inc_expanded();
             number_of_second_phase_expansions++;
-            successor_generator.generate_applicable_ops(expanding_state, expanding_operators);
-            expanding_hash = {}; // Avoids generating two nodes with same state, or a node with the same state as the expanding node.
-            expanding_hash[expanding_node.state_id] = expanding_node.g_value;
+            generate_expanding_operators(expanding_state);
+            prune_expanding_operators(expanding_state, generating_operator_proxy_id);
+            if (expansion_osf)
+            {
+                expanding_osf_index = expansion_osf->get_index(expanding_state);
+                // The other successors of the initial node are already in the open queue of the first phase.
+                expanding_osf_generated_big_f_value = path_depth == 0 ? get_first_phase_osf_generated_big_f_value(expanding_node.state_id) : -1;
+            }
+            expanding_hash.clear(); // Avoids generating two nodes with same state, or a node with the same state as the expanding node.
+            expanding_hash[expanding_node.state_id.value] = expanding_node.g_value;
 
             second_phase_predecessors_state_ids_values.push_back(expanding_node.state_id.value);
-            second_phase_generating_operators_proxy_ids.push_back(Hash());
+            mark_on_second_phase_path(expanding_node.state_id.value);
 
             expanding = true;
+
+            if (using_whole_node_expansion)
+            {
+                return second_phase_step();
+            }
         }
         return IN_PROGRESS;
     }
 
-    PeaIdaSearch::OpenNode PeaIdaSearch::pop_from_first_phase_open_queue(optional<PeaIdaSearch::FBestQueue::handle_type> handle)
+    SearchStatus PeaIdaSearch::second_phase_transient_step()
     {
-        OpenNode open_node;
-        if (handle.has_value())
-        {
-            open_node = **handle;
-            first_phase_open_queue.erase(*handle);
-        }
-        else
+        if (expanding)
         {
-            open_node = first_phase_open_queue.top();
-            first_phase_open_queue.pop();
-        }
+            if (not expanding_operators.empty())
+            {
+                const TransientNode &expanding_transient_node = second_phase_transient_path.back();
 
-        first_phase_open_queue_hash.erase(open_node.state_id);
+                do
+                {
+                    OperatorID applicable_operator = expanding_operators.back();
+                    expanding_operators.pop_back();
 
-        return open_node;
-    }
+                    generate_in_second_phase_transient(expanding_transient_node, applicable_operator);
+                } while (using_whole_node_expansion and not expanding_operators.empty());
 
-    void PeaIdaSearch::push_in_first_phase_open_queue(PeaIdaSearch::OpenNode open_node)
-    {
-        FBestQueue::handle_type handle = first_phase_open_queue.push(open_node);
-        first_phase_open_queue_hash[open_node.state_id] = std::pair<int, FBestQueue::handle_type>{open_node.g_value, handle};
-    }
+                if (not using_whole_node_expansion)
+                {
+                    return IN_PROGRESS;
+                }
+            }
 
-    void PeaIdaSearch::print_solution(bool insolution)
-    {
-        if (insolution)
-        {
-            utils::g_log << "Insolution found!" << endl;
+            const TransientNode &expanding_transient_node = second_phase_transient_path.back();
+            evaluate_generated_successors(expanding_transient_node.state);
+            for (const GeneratedSuccessor &generated_successor: generated_successors)
+            {
+                if (generated_successor.h_value == INT_MAX)
+                {
+                    continue;
+                }
+
+                int successor_big_f_value = generated_successor.g_value + generated_successor.h_value;
+
+                if (successor_big_f_value > second_phase_threshold)
+                {
+                    exceed_second_phase_threshold(successor_big_f_value);
+                    continue;
+                }
+
+                generating_transient_nodes.emplace_back(generated_successor.state, generated_successor.g_value, successor_big_f_value, expanding_transient_node.depth + 1, generated_successor.generating_operator_proxy_id);
+            }
+            generated_successors.clear();
+
+            while (not generating_transient_nodes.empty())
+            {
+                TransientNode generating_transient_node = generating_transient_nodes.back();
+                generating_transient_nodes.pop_back();
+
+                if (expanding_transient_hash[generating_transient_node.state.get_unpacked_values()] < generating_transient_node.g_value)
+                {
+                    continue;
+                }
+
+                second_phase_transient_open_queue.push(generating_transient_node);
+            }
+
+            expanding = false;
         }
         else
         {
-            utils::g_log << "Solution found!" << endl;
+            if (second_phase_transient_open_queue.empty())
+            {
+                finish_second_phase();
+                return IN_PROGRESS;
+            }
 
-            Plan plan;
-            int ancestral_state_id_value = expanding_node.state_id.value;
-            while (not second_phase_predecessors_state_ids_values.empty())
+            TransientNode expanding_transient_node = second_phase_transient_open_queue.top();
+            second_phase_transient_open_queue.pop();
+
+            while (second_phase_transient_path.size() > static_cast<size_t>(expanding_transient_node.depth - second_phase_initial_node.depth))
             {
-                plan.push_back(OperatorID(second_phase_generating_operators_proxy_ids.back()[StateID(ancestral_state_id_value, true)]));
-                ancestral_state_id_value = second_phase_predecessors_state_ids_values.back();
-                second_phase_generating_operators_proxy_ids.pop_back();
-                second_phase_predecessors_state_ids_values.pop_back();
+                second_phase_transient_on_path.erase(second_phase_transient_path.back().state.get_unpacked_values());
+                second_phase_transient_path.pop_back();
             }
-            while (ancestral_state_id_value != first_phase_initial_node.state_id.value)
+
+            // The threshold may have been lowered after the node was generated.
+            if (expanding_transient_node.big_f_value > second_phase_threshold)
             {
-                plan.push_back(OperatorID(first_phase_generating_operators_proxy_ids[StateID(ancestral_state_id_value, true)]));
-                ancestral_state_id_value = first_phase_predecessors_state_ids_values[StateID(ancestral_state_id_value, true)];
+                exceed_second_phase_threshold(expanding_transient_node.big_f_value);
+                return IN_PROGRESS;
             }
-            reverse(plan.begin(), plan.end());
-            set_plan(plan);
-        }
 
-        utils::g_log << "Open peak size: " << open_peak_size << endl;
-        utils::g_log << "Closed peak size: " << closed_peak_size << endl;
-        utils::g_log << "Number of first phase expansions: " << number_of_first_phase_expansions << endl;
-        utils::g_log << "Number of second phase expansions: " << number_of_second_phase_expansions << endl;
-        utils::g_log << "Number of first phase generations: " << number_of_first_phase_generations << endl;
-        utils::g_log << "Number of second phase generations: " << number_of_second_phase_generations << endl;
-        utils::g_log << "Number of second phase iterations: " << number_of_second_phase_transitions << endl;
+            int goal_distance = get_goal_distance(expanding_transient_node.state, expanding_transient_node.big_f_value - expanding_transient_node.g_value);
+            if (goal_distance != -1)
+            {
+                if (is_optimal_second_phase_goal(expanding_transient_node.g_value + goal_distance))
+                {
+                    second_phase_transient_path.push_back(expanding_transient_node);
+                    print_solution();
+                    return SOLVED;
+                }
+                return IN_PROGRESS;
+            }
+
+            second_phase_transient_path.push_back(expanding_transient_node);
+            second_phase_transient_on_path.insert(expanding_transient_node.state.get_unpacked_values());
+
+            statistics.inc_expanded();
+            number_of_second_phase_expansions++;
+            successor_generator.generate_applicable_ops(expanding_transient_node.state, expanding_operators);
+            prune_expanding_operators(expanding_transient_node.state, expanding_transient_node.generating_operator_proxy_id);
+            if (expansion_osf)
+            {
+                expanding_osf_index = expansion_osf->get_index(expanding_transient_node.state);
+                // The other successors of the initial node are already in the open queue of the first phase.
+                expanding_osf_generated_big_f_value = expanding_transient_node.depth == second_phase_initial_node.depth ? get_first_phase_osf_generated_big_f_value(second_phase_initial_node.state_id) : -1;
+            }
+            expanding_transient_hash.clear(); // Avoids generating two nodes with same state, or a node with the same state as the expanding node.
+            expanding_transient_hash[expanding_transient_node.state.get_unpacked_values()] = expanding_transient_node.g_value;
+
+            expanding = true;
+
+            if (using_whole_node_expansion)
+            {
+                return second_phase_transient_step();
+            }
+        }
+        return IN_PROGRESS;
+    }
+
+    SearchStatus PeaIdaSearch::second_phase_parallel_step()
+    {
+        // A whole iteration is run at once, since the worker threads cannot be interrupted between steps.
+        State second_phase_initial_state = state_registry.lookup_state(second_phase_initial_node.state_id);
+        second_phase_initial_state.unpack();
+        State root(*task, vector<int>(second_phase_initial_state.get_unpacked_values()));
+
+        parallel_bounded_dfs::Result result = second_phase_parallel_dfs->search(root, second_phase_initial_node.g_value, second_phase_threshold, second_phase_transient_on_path);
+
+        statistics.inc_expanded(result.num_expansions);
+        statistics.inc_generated(result.num_generations);
+        statistics.inc_evaluated_states(result.num_evaluations);
+        number_of_second_phase_evaluations += result.num_evaluations;
+        number_of_second_phase_expansions += result.num_expansions;
+        number_of_second_phase_generations += result.num_generations;
+
+        if (result.solved)
+        {
+            for (const parallel_bounded_dfs::Node &node: result.solution_path)
+            {
+                second_phase_transient_path.emplace_back(node.state, node.g_value, node.g_value, second_phase_initial_node.depth + second_phase_transient_path.size(), node.generating_operator_proxy_id);
+            }
+            print_solution();
+            return SOLVED;
+        }
+
+        second_phase_initial_node_new_big_f_value = result.new_threshold;
+        finish_second_phase();
+        return IN_PROGRESS;
+    }
+
+    State PeaIdaSearch::get_registered_successor_state(const State &expanding_state, const OperatorProxy &applicable_operator_proxy)
+    {
+        if (not structural_symmetries)
+        {
+            return state_registry.get_successor_state(expanding_state, applicable_operator_proxy);
+        }
+
+        expanding_state.unpack();
+        canonical_values = expanding_state.get_unregistered_successor(applicable_operator_proxy).get_unpacked_values();
+        structural_symmetries->canonicalize(canonical_values);
+        return state_registry.insert_state(canonical_values);
+    }
+
+    void PeaIdaSearch::generate_in_first_phase(const State &expanding_state, OperatorID applicable_operator)
+    {
+        if (expansion_osf and is_deferred_by_osf(expanding_state, expanding_node.g_value, applicable_operator, expanding_node.big_f_value, expanding_deferred_big_f_value))
+        {
+            return;
+        }
+
+        OperatorProxy applicable_operator_proxy = task_proxy.get_operators()[applicable_operator];
+        State successor_state = get_registered_successor_state(expanding_state, applicable_operator_proxy);
+        statistics.inc_generated();
+        number_of_first_phase_generations++;
+
+        StateID successor_state_id = successor_state.get_id();
+        int successor_g_value = expanding_node.g_value + applicable_operator_proxy.get_cost();
+
+        const int *expanding_g_value = expanding_hash.find(successor_state_id.value);
+        if (expanding_g_value and *expanding_g_value <= successor_g_value)
+        {
+            return;
+        }
+
+        NodeInfo &successor_node_info = first_phase_node_infos[successor_state];
+
+        if (successor_node_info.status == NodeInfo::CLOSED)
+        {
+            if (successor_node_info.g_value <= successor_g_value)
+            {
+                return;
+            }
+
+            successor_node_info.status = NodeInfo::NEW;
+            first_phase_closed_size--;
+        }
+
+        if (successor_node_info.status == NodeInfo::OPEN)
+        {
+            if (successor_node_info.g_value <= successor_g_value)
+            {
+                return;
+            }
+
+            pop_from_first_phase_open_queue(successor_state_id);
+        }
+
+        if (successor_node_info.status == NodeInfo::FORGOTTEN)
+        {
+            /*
+              Successors of a forgotten node may still be stored, so it is only generated again on a cheaper path or from its remembered predecessor.
+              Another path of the same cost would replace the predecessor, which creates predecessor cycles with operators of cost 0.
+            */
+            if (successor_node_info.g_value < successor_g_value or (successor_node_info.g_value == successor_g_value and successor_node_info.predecessor_state_id_value != expanding_node.state_id.value))
+            {
+                return;
+            }
+
+            successor_node_info.status = NodeInfo::NEW;
+        }
+
+        if (successor_node_info.status == NodeInfo::SPILLED)
+        {
+            if (successor_node_info.g_value <= successor_g_value)
+            {
+                return;
+            }
+
+            successor_node_info.status = NodeInfo::NEW; // The spilled node becomes stale and is dropped when it is merged back.
+        }
+
+        // With a smaller g-value, none of the successors of the node have been generated yet.
+        if (expansion_osf)
+        {
+            first_phase_osf_generated_big_f_values.erase(successor_state_id.value);
+        }
+
+        // The successor is evaluated together with its siblings once all of them are generated.
+        generated_successors.push_back({successor_state, successor_g_value, -1, applicable_operator_proxy.get_id()});
+        expanding_hash[successor_state_id.value] = successor_g_value;
+    }
+
+    void PeaIdaSearch::generate_in_second_phase(const State &expanding_state, OperatorID applicable_operator)
+    {
+        if (expansion_osf and is_deferred_by_osf(expanding_state, expanding_node.g_value, applicable_operator, second_phase_threshold, second_phase_initial_node_new_big_f_value))
+        {
+            return;
+        }
+
+        OperatorProxy applicable_operator_proxy = task_proxy.get_operators()[applicable_operator];
+        State successor_state = get_registered_successor_state(expanding_state, applicable_operator_proxy);
+        statistics.inc_generated();
+        number_of_second_phase_generations++;
+
+        StateID successor_state_id = successor_state.get_id();
+
+        if (is_on_second_phase_path(successor_state_id.value))
+        {
+            return;
+        }
+
+        int successor_g_value = expanding_node.g_value + applicable_operator_proxy.get_cost();
+
+        const int *expanding_g_value = expanding_hash.find(successor_state_id.value);
+        if (expanding_g_value and *expanding_g_value <= successor_g_value)
+        {
+            return;
+        }
+
+        if (second_phase_transposition_table and second_phase_transposition_table->check_and_store(successor_state_id.value, successor_g_value, expanding_node.depth + 1))
+        {
+            return;
+        }
+
+        generated_successors.push_back({successor_state, successor_g_value, -1, applicable_operator_proxy.get_id()});
+        expanding_hash[successor_state_id.value] = successor_g_value;
+    }
+
+    void PeaIdaSearch::generate_in_second_phase_transient(const TransientNode &expanding_transient_node, OperatorID applicable_operator)
+    {
+        if (expansion_osf and is_deferred_by_osf(expanding_transient_node.state, expanding_transient_node.g_value, applicable_operator, second_phase_threshold, second_phase_initial_node_new_big_f_value))
+        {
+            return;
+        }
+
+        OperatorProxy applicable_operator_proxy = task_proxy.get_operators()[applicable_operator];
+        State successor_state = expanding_transient_node.state.get_unregistered_successor(applicable_operator_proxy);
+        statistics.inc_generated();
+        number_of_second_phase_generations++;
+
+        const vector<int> &successor_values = successor_state.get_unpacked_values();
+
+        if (second_phase_transient_on_path.count(successor_values))
+        {
+            return;
+        }
+
+        int successor_g_value = expanding_transient_node.g_value + applicable_operator_proxy.get_cost();
+
+        TransientHash::iterator expanding_transient_hash_iterator = expanding_transient_hash.find(successor_values);
+        if (expanding_transient_hash_iterator != expanding_transient_hash.end() and expanding_transient_hash_iterator->second <= successor_g_value)
+        {
+            return;
+        }
+
+        // Transient states have no StateID, so they are keyed by a 64-bit hash of their values (or of those of their orbit representatives).
+        if (second_phase_transposition_table)
+        {
+            const vector<int> *key_values = &successor_values;
+            if (structural_symmetries)
+            {
+                canonical_values = successor_values;
+                structural_symmetries->canonicalize(canonical_values);
+                key_values = &canonical_values;
+            }
+            if (second_phase_transposition_table->check_and_store(utils::get_hash64(*key_values), successor_g_value, expanding_transient_node.depth + 1))
+            {
+                return;
+            }
+        }
+
+        expanding_transient_hash[successor_values] = successor_g_value;
+        generated_successors.push_back({successor_state, successor_g_value, -1, applicable_operator_proxy.get_id()});
+    }
+
+    void PeaIdaSearch::generate_expanding_operators(const State &expanding_state)
+    {
+        // Registered states are packed; unpacking one would allocate its values on every expansion.
+        expanding_state_values.resize(expanding_state.size());
+        for (size_t var = 0; var < expanding_state_values.size(); ++var)
+        {
+            expanding_state_values[var] = expanding_state[var].get_value();
+        }
+        successor_generator.generate_applicable_ops(expanding_state_values, expanding_operators);
+    }
+
+    void PeaIdaSearch::prune_expanding_operators(const State &expanding_state, int generating_operator_proxy_id)
+    {
+        utils::Timer &pruning_timer = current_phase == FIRST_PHASE ? first_phase_pruning_timer : second_phase_pruning_timer;
+        long unsigned int number_of_unpruned_operators = expanding_operators.size();
+
+        pruning_timer.resume();
+        pruning_method->prune_operators(expanding_state, expanding_operators);
+        if (second_phase_move_pruning and current_phase == SECOND_PHASE and generating_operator_proxy_id != -1)
+        {
+            second_phase_move_pruning->prune_operators(OperatorID(generating_operator_proxy_id), expanding_operators);
+        }
+        pruning_timer.stop();
+
+        if (current_phase == FIRST_PHASE)
+        {
+            number_of_first_phase_unpruned_operators += number_of_unpruned_operators;
+            number_of_first_phase_pruned_operators += number_of_unpruned_operators - expanding_operators.size();
+        }
+        else
+        {
+            number_of_second_phase_unpruned_operators += number_of_unpruned_operators;
+            number_of_second_phase_pruned_operators += number_of_unpruned_operators - expanding_operators.size();
+        }
+    }
+
+    bool PeaIdaSearch::is_deferred_by_osf(const State &expanding_state, int expanding_g_value, OperatorID applicable_operator, int max_big_f_value, int &deferred_big_f_value)
+    {
+        // The successor is neither registered nor evaluated if its F-value bound shows that it is a dead end or beyond max_big_f_value.
+        int successor_osf_h_value = expansion_osf->get_successor_h_value(expanding_state, expanding_osf_index, applicable_operator);
+
+        if (successor_osf_h_value == INT_MAX)
+        {
+            number_of_osf_deferred_successors++;
+            return true;
+        }
+
+        int successor_osf_big_f_value = expanding_g_value + task_proxy.get_operators()[applicable_operator].get_cost() + successor_osf_h_value;
+
+        // Only the successors of the current F-value bucket are generated when a partially expanded node is expanded again.
+        if (successor_osf_big_f_value <= expanding_osf_generated_big_f_value)
+        {
+            return true;
+        }
+
+        if (successor_osf_big_f_value > max_big_f_value)
+        {
+            deferred_big_f_value = min(deferred_big_f_value, successor_osf_big_f_value);
+            number_of_osf_deferred_successors++;
+            return true;
+        }
+        return false;
+    }
+
+    int PeaIdaSearch::evaluate(const State &state, int g_value)
+    {
+        if (dead_end_memo and dead_end_memo->is_dead_end(state))
+        {
+            return INT_MAX;
+        }
+
+        if (goal_perimeter)
+        {
+            state.unpack();
+            int goal_distance = goal_perimeter->get_goal_distance(state);
+            if (goal_distance != -1)
+            {
+                return goal_distance;
+            }
+        }
+
+        auto compute_h_value = [&]()
+        {
+            EvaluationContext eval_context(state, g_value, false, &statistics);
+            int h_value = eval_context.get_evaluator_value_or_infinity(h_evaluator.get());
+            count_evaluation(eval_context.get_result(h_evaluator.get()));
+            return h_value;
+        };
+
+        int h_value = h_value_cache ? h_value_cache->get_h_value(state, compute_h_value) : compute_h_value();
+        if (dead_end_memo and h_value == INT_MAX)
+        {
+            dead_end_memo->store_dead_end(state);
+        }
+        return goal_perimeter ? goal_perimeter->get_outside_h_value(h_value) : h_value;
+    }
+
+    void PeaIdaSearch::count_evaluation(const EvaluationResult &result)
+    {
+        // Values taken from the cache of the evaluator are not evaluations.
+        if (not result.get_count_evaluation())
+        {
+            return;
+        }
+        statistics.inc_evaluated_states();
+        if (current_phase == FIRST_PHASE)
+        {
+            number_of_first_phase_evaluations++;
+        }
+        else
+        {
+            number_of_second_phase_evaluations++;
+        }
+    }
+
+    int PeaIdaSearch::get_goal_distance(const State &state, int h_lower_bound)
+    {
+        if (task_properties::is_goal_state(task_proxy, state))
+        {
+            return 0;
+        }
+        // A state whose goal distance is known to exceed the radius is not looked up.
+        if (goal_perimeter and h_lower_bound <= goal_perimeter->get_radius())
+        {
+            state.unpack();
+            return goal_perimeter->get_goal_distance(state);
+        }
+        return -1;
+    }
+
+    void PeaIdaSearch::evaluate_generated_successors(const State &expanding_state)
+    {
+        // Successors whose h-values are not cached are evaluated in one batch, so that the evaluator can reuse its work for the expanding state.
+        successor_eval_contexts.clear();
+        successor_generating_operators.clear();
+        evaluated_successors.clear();
+        // Successors in the goal perimeter get their exact goal distance without being evaluated.
+        outside_perimeter_successors.clear();
+        for (GeneratedSuccessor &generated_successor: generated_successors)
+        {
+            // Known dead ends are neither looked up in the cache nor evaluated again.
+            if (dead_end_memo and dead_end_memo->is_dead_end(generated_successor.state))
+            {
+                generated_successor.h_value = INT_MAX;
+                continue;
+            }
+            if (goal_perimeter)
+            {
+                generated_successor.state.unpack();
+                generated_successor.h_value = goal_perimeter->get_goal_distance(generated_successor.state);
+                if (generated_successor.h_value != -1)
+                {
+                    continue;
+                }
+                outside_perimeter_successors.push_back(&generated_successor);
+            }
+            if (h_value_cache and h_value_cache->lookup_h_value(generated_successor.state, generated_successor.h_value))
+            {
+                continue;
+            }
+            successor_eval_contexts.emplace_back(generated_successor.state, generated_successor.g_value, false, &statistics);
+            successor_generating_operators.emplace_back(generated_successor.generating_operator_proxy_id);
+            evaluated_successors.push_back(&generated_successor);
+        }
+
+        if (not successor_eval_contexts.empty())
+        {
+            h_evaluator->compute_successor_results(expanding_state, successor_generating_operators, successor_eval_contexts);
+        }
+
+        for (size_t i = 0; i < evaluated_successors.size(); i++)
+        {
+            GeneratedSuccessor &generated_successor = *evaluated_successors[i];
+            generated_successor.h_value = successor_eval_contexts[i].get_evaluator_value_or_infinity(h_evaluator.get());
+            count_evaluation(successor_eval_contexts[i].get_result(h_evaluator.get()));
+            if (h_value_cache)
+            {
+                h_value_cache->store_h_value(generated_successor.state, generated_successor.h_value);
+            }
+            if (dead_end_memo and generated_successor.h_value == INT_MAX)
+            {
+                dead_end_memo->store_dead_end(generated_successor.state);
+            }
+        }
+
+        for (GeneratedSuccessor *generated_successor: outside_perimeter_successors)
+        {
+            generated_successor->h_value = goal_perimeter->get_outside_h_value(generated_successor->h_value);
+        }
+    }
+
+    bool PeaIdaSearch::evaluate_deferred_first_phase_node()
+    {
+        // Returns false if the popped node turns out to be a dead end or is queued again with its evaluated F-value.
+        get_first_phase_node_info(expanding_node.state_id).evaluation_deferred = false;
+        number_of_performed_deferred_evaluations++;
+
+        int h_value = evaluate(state_registry.lookup_state(expanding_node.state_id), expanding_node.g_value);
+
+        if (h_value == INT_MAX)
+        {
+            close_in_first_phase(expanding_node);
+            return false;
+        }
+
+        if (expanding_node.g_value + h_value > expanding_node.big_f_value)
+        {
+            expanding_node.big_f_value = expanding_node.g_value + h_value;
+            push_in_first_phase_open_queue(expanding_node);
+            return false;
+        }
+        return true;
+    }
+
+    void PeaIdaSearch::start_second_phase()
+    {
+        print_phase_transition_record();
+
+        second_phase_initial_node = expanding_node;
+        second_phase_initial_node_new_big_f_value = INT_MAX;
+
+        // The F-value of the initial node stays the lower bound for goals; only the threshold of the iteration grows.
+        second_phase_threshold = second_phase_initial_node.big_f_value;
+        second_phase_found_goal_above_lower_bound = false;
+        second_phase_iteration_start_expansions = number_of_second_phase_expansions;
+        auto root_info = second_phase_root_infos.find(second_phase_initial_node.state_id.value);
+        if (root_info != second_phase_root_infos.end())
+        {
+            number_of_second_phase_reexpansions += root_info->second.number_of_expansions;
+            if (is_using_threshold_growth() and root_info->second.threshold_increment > 0)
+            {
+                // The nodes of the other roots come first in best-first order, so the threshold does not grow beyond the next F-value of the open list.
+                int next_open_big_f_value = first_phase_open_queue.empty() ? INT_MAX : first_phase_open_queue.get_min_f();
+                if (first_phase_spilled_open_list and not first_phase_spilled_open_list->empty())
+                {
+                    next_open_big_f_value = min(next_open_big_f_value, first_phase_spilled_open_list->get_min_big_f_value());
+                }
+                int grown_threshold = min(second_phase_threshold + root_info->second.threshold_increment, max(second_phase_threshold, next_open_big_f_value));
+                if (grown_threshold > second_phase_threshold)
+                {
+                    second_phase_threshold = grown_threshold;
+                    number_of_grown_thresholds++;
+                }
+            }
+        }
+
+        // The first-phase prefix is put on the path once here, so that cycle checks during the iteration are O(1).
+        second_phase_prefix_state_ids_values.clear();
+        int ancestral_state_id_value = second_phase_initial_node.state_id.value;
+        while (ancestral_state_id_value != first_phase_initial_node.state_id.value)
+        {
+            ancestral_state_id_value = get_first_phase_predecessor_state_id_value(ancestral_state_id_value);
+            second_phase_prefix_state_ids_values.push_back(ancestral_state_id_value);
+        }
+
+        if (second_phase_parallel_dfs)
+        {
+            // The worker threads start from an unregistered copy of the initial node and only share the prefix.
+            for (int prefix_state_id_value: second_phase_prefix_state_ids_values)
+            {
+                State prefix_state = state_registry.lookup_state(StateID(prefix_state_id_value, true));
+                prefix_state.unpack();
+                second_phase_transient_on_path.insert(prefix_state.get_unpacked_values());
+            }
+        }
+        else if (using_transient_second_phase)
+        {
+            // Only the first-phase prefix is registered; states generated from here on are never interned in the registry.
+            for (int prefix_state_id_value: second_phase_prefix_state_ids_values)
+            {
+                State prefix_state = state_registry.lookup_state(StateID(prefix_state_id_value, true));
+                prefix_state.unpack();
+                second_phase_transient_on_path.insert(prefix_state.get_unpacked_values());
+            }
+
+            State second_phase_initial_state = state_registry.lookup_state(second_phase_initial_node.state_id);
+            second_phase_initial_state.unpack();
+            second_phase_transient_open_queue.push(TransientNode(second_phase_initial_state, second_phase_initial_node.g_value, second_phase_initial_node.big_f_value, second_phase_initial_node.depth, -1));
+        }
+        else
+        {
+            for (int prefix_state_id_value: second_phase_prefix_state_ids_values)
+            {
+                mark_on_second_phase_path(prefix_state_id_value);
+            }
+
+            second_phase_open_stack.emplace_back(second_phase_initial_node, -1);
+        }
+
+        if (second_phase_transposition_table)
+        {
+            second_phase_transposition_table->start_iteration();
+        }
+
+        current_phase = SECOND_PHASE;
+        number_of_second_phase_transitions++;
+    }
+
+    void PeaIdaSearch::finish_second_phase()
+    {
+        if (second_phase_initial_node_new_big_f_value != INT_MAX)
+        {
+            SecondPhaseRootInfo &root_info = second_phase_root_infos[second_phase_initial_node.state_id.value];
+            long unsigned int previous_iteration_expansions = root_info.number_of_expansions;
+            int previous_iteration_threshold = root_info.threshold;
+            root_info.number_of_expansions = number_of_second_phase_expansions - second_phase_iteration_start_expansions;
+            root_info.threshold = second_phase_threshold;
+            root_info.threshold_increment = 0;
+            if (second_phase_found_goal_above_lower_bound)
+            {
+                number_of_bounded_sweeps++;
+            }
+            else if (is_using_threshold_growth())
+            {
+                root_info.threshold_increment = choose_second_phase_threshold_increment(previous_iteration_expansions, previous_iteration_threshold);
+            }
+
+            second_phase_initial_node.big_f_value = second_phase_initial_node_new_big_f_value;
+            push_in_first_phase_open_queue(second_phase_initial_node);
+        }
+        else
+        {
+            second_phase_root_infos.erase(second_phase_initial_node.state_id.value);
+            close_in_first_phase(second_phase_initial_node);
+        }
+        second_phase_exceeded_big_f_values = {};
+
+        for (int prefix_state_id_value: second_phase_prefix_state_ids_values)
+        {
+            unmark_on_second_phase_path(prefix_state_id_value);
+        }
+        for (int ancestral_state_id_value: second_phase_predecessors_state_ids_values)
+        {
+            unmark_on_second_phase_path(ancestral_state_id_value);
+        }
+        second_phase_prefix_state_ids_values.clear();
+        second_phase_predecessors_state_ids_values.clear();
+        second_phase_generating_operators_proxy_ids.clear();
+
+        second_phase_transient_path.clear();
+        second_phase_transient_on_path.clear();
+
+        current_phase = FIRST_PHASE;
     }
 
-    void PeaIdaSearch::print_infos_about_big_f_values_at_phase_transition()
+    bool PeaIdaSearch::is_using_threshold_growth() const
+    {
+        // The worker threads of the parallel search only report the smallest exceeded F-value.
+        return threshold_growth_ratio != 0 and not second_phase_parallel_dfs;
+    }
+
+    void PeaIdaSearch::exceed_second_phase_threshold(int big_f_value)
     {
-        int min_big_f_value = expanding_node.big_f_value;
-        int max_big_f_value = expanding_node.big_f_value;
-        long long int sum_of_big_f_value = expanding_node.big_f_value;
-        unsigned long int count_of_min_big_f_value = 1;
+        second_phase_initial_node_new_big_f_value = min(second_phase_initial_node_new_big_f_value, big_f_value);
+        if (is_using_threshold_growth())
+        {
+            second_phase_exceeded_big_f_values.add(big_f_value);
+        }
+    }
 
-        FBestQueue::iterator first_phase_open_queue_iterator = first_phase_open_queue.begin();
-        for (unsigned long int i = 0; i < first_phase_open_queue.size(); i++)
+    bool PeaIdaSearch::is_optimal_second_phase_goal(int g_value)
+    {
+        // A goal beyond the F-value of the initial node may be undercut by another open node, so it only bounds the rest of the iteration.
+        if (g_value <= second_phase_initial_node.big_f_value)
         {
-            int big_f_value = first_phase_open_queue_iterator->big_f_value;
-            sum_of_big_f_value += big_f_value;
-            max_big_f_value = max(max_big_f_value, big_f_value);
+            return true;
+        }
+        second_phase_initial_node_new_big_f_value = min(second_phase_initial_node_new_big_f_value, g_value);
+        second_phase_threshold = g_value - 1;
+        second_phase_found_goal_above_lower_bound = true;
+        return false;
+    }
 
-            if (big_f_value == min_big_f_value)
+    int PeaIdaSearch::choose_second_phase_threshold_increment(long unsigned int previous_iteration_expansions, int previous_iteration_threshold) const
+    {
+        /*
+          The largest exceeded F-value for which the next iteration is expected to expand at most threshold_growth_ratio times as many nodes as this one.
+          The growth per unit of threshold is measured between the previous iteration from the same state and this one. A node cut off at F-value f
+          is the root of a subtree that grows by this factor for every unit by which the threshold exceeds f; the size of the subtrees at the
+          smallest exceeded F-value makes the iteration grow by that factor up to it.
+        */
+        long unsigned int iteration_expansions = number_of_second_phase_expansions - second_phase_iteration_start_expansions;
+        if (previous_iteration_expansions == 0 or iteration_expansions == 0 or second_phase_threshold <= previous_iteration_threshold or second_phase_exceeded_big_f_values.size == 0)
+        {
+            return 0;
+        }
+        double growth_per_unit = pow(double(iteration_expansions) / double(previous_iteration_expansions), 1.0 / double(second_phase_threshold - previous_iteration_threshold));
+        auto smallest_bucket = second_phase_exceeded_big_f_values.counts.begin();
+        double expansions_at_smallest_big_f_value = double(iteration_expansions) * pow(growth_per_unit, smallest_bucket->first - second_phase_threshold);
+        double subtree_size = max(1.0, (expansions_at_smallest_big_f_value - double(iteration_expansions)) / double(smallest_bucket->second));
+
+        double wanted_expansions = double(iteration_expansions) * threshold_growth_ratio;
+        int chosen_big_f_value = second_phase_initial_node_new_big_f_value;
+        for (const auto &threshold_bucket: second_phase_exceeded_big_f_values.counts)
+        {
+            double expected_expansions = double(iteration_expansions);
+            for (const auto &[big_f_value, count]: second_phase_exceeded_big_f_values.counts)
+            {
+                if (big_f_value > threshold_bucket.first)
+                {
+                    break;
+                }
+                expected_expansions += double(count) * subtree_size * pow(growth_per_unit, threshold_bucket.first - big_f_value);
+            }
+            if (expected_expansions > wanted_expansions)
             {
-                count_of_min_big_f_value++;
+                break;
             }
+            chosen_big_f_value = max(chosen_big_f_value, threshold_bucket.first);
+        }
+        return chosen_big_f_value - second_phase_initial_node_new_big_f_value;
+    }
 
-            std::advance(first_phase_open_queue_iterator, 1);
+    void PeaIdaSearch::mark_on_second_phase_path(int state_id_value)
+    {
+        if (state_id_value >= (int)second_phase_on_path.size())
+        {
+            second_phase_on_path.resize(state_registry.size(), false);
         }
+        second_phase_on_path[state_id_value] = true;
+    }
 
-        float percentage_of_min_big_f_values = {float(count_of_min_big_f_value) / float(first_phase_open_queue.size() + 1)};
-        float mean_big_f_value = {float(sum_of_big_f_value) / float(first_phase_open_queue.size() + 1)};
+    void PeaIdaSearch::unmark_on_second_phase_path(int state_id_value)
+    {
+        if (state_id_value < (int)second_phase_on_path.size())
+        {
+            second_phase_on_path[state_id_value] = false;
+        }
+    }
 
-        utils::g_log << "Mininum F-value at phase transition: " << min_big_f_value << endl;
-        utils::g_log << "Mean F-value at phase transition: " << mean_big_f_value << endl;
-        utils::g_log << "Maximum F-value at phase transition: " << max_big_f_value << endl;
-        utils::g_log << "Percentage of minimum F-values at phase transition: " << percentage_of_min_big_f_values << endl;
+    bool PeaIdaSearch::is_on_second_phase_path(int state_id_value) const
+    {
+        return state_id_value < (int)second_phase_on_path.size() and second_phase_on_path[state_id_value];
     }
 
-    void PeaIdaSearch::print_infos_about_depths_at_phase_transition()
+    PeaIdaSearch::OpenNode PeaIdaSearch::pop_from_first_phase_open_queue(optional<StateID> state_id)
+    {
+        OpenNode open_node = state_id.has_value() ? first_phase_open_queue.erase(*state_id) : first_phase_open_queue.pop();
+        remove_from_first_phase_open_statistics(open_node);
+
+        get_first_phase_node_info(open_node.state_id).status = NodeInfo::NEW;
+
+        return open_node;
+    }
+
+    void PeaIdaSearch::push_in_first_phase_open_queue(PeaIdaSearch::OpenNode open_node)
+    {
+        first_phase_open_queue.push(open_node.state_id, open_node.big_f_value, open_node.g_value, open_node.depth, open_node);
+        add_to_first_phase_open_statistics(open_node);
+
+        NodeInfo &open_node_info = get_first_phase_node_info(open_node.state_id);
+        open_node_info.status = NodeInfo::OPEN;
+        set_first_phase_g_value(open_node_info, open_node.g_value);
+    }
+
+    void PeaIdaSearch::close_in_first_phase(PeaIdaSearch::OpenNode closed_node)
+    {
+        NodeInfo &closed_node_info = get_first_phase_node_info(closed_node.state_id);
+        if (closed_node_info.status != NodeInfo::CLOSED)
+        {
+            first_phase_closed_size++;
+        }
+        closed_node_info.status = NodeInfo::CLOSED;
+        set_first_phase_g_value(closed_node_info, closed_node.g_value);
+        if (expansion_osf)
+        {
+            first_phase_osf_generated_big_f_values.erase(closed_node.state_id.value);
+        }
+    }
+
+    int PeaIdaSearch::get_first_phase_osf_generated_big_f_value(StateID state_id) const
+    {
+        auto osf_generated_big_f_value = first_phase_osf_generated_big_f_values.find(state_id.value);
+        return osf_generated_big_f_value == first_phase_osf_generated_big_f_values.end() ? -1 : osf_generated_big_f_value->second;
+    }
+
+    bool PeaIdaSearch::spill_first_phase_open_queue(long unsigned int number_of_new_open_nodes, int max_kept_big_f_value)
+    {
+        // Whole F-layers above max_kept_big_f_value are spilled until the open queue is half full, so that spilling does not happen at every expansion.
+        vector<OpenNode> spilled_nodes;
+        while (not first_phase_open_queue.empty() and first_phase_open_queue.get_max_f() > max_kept_big_f_value and (first_phase_open_queue.size() + number_of_new_open_nodes > open_limit / 2 or exceeds_open_limits(number_of_new_open_nodes)))
+        {
+            first_phase_open_queue.pop_max_f_bucket(spilled_nodes);
+        }
+
+        vector<spilled_open_list::Record> records;
+        records.reserve(spilled_nodes.size());
+        for (const OpenNode &spilled_node: spilled_nodes)
+        {
+            remove_from_first_phase_open_statistics(spilled_node);
+            get_first_phase_node_info(spilled_node.state_id).status = NodeInfo::SPILLED;
+            records.push_back({spilled_node.state_id.value, spilled_node.g_value, spilled_node.big_f_value, spilled_node.depth});
+        }
+        first_phase_spilled_open_list->spill(records);
+
+        return not exceeds_open_limits(number_of_new_open_nodes);
+    }
+
+    void PeaIdaSearch::merge_back_first_phase_spilled_nodes()
+    {
+        first_phase_spilled_open_list->merge_layer([&](const spilled_open_list::Record &record)
+        {
+            StateID state_id(record.state_id_value, true);
+            NodeInfo &node_info = get_first_phase_node_info(state_id);
+            // Delayed duplicate detection: the state was reached again with a better g-value after it was spilled.
+            if (node_info.status != NodeInfo::SPILLED or node_info.g_value != record.g_value)
+            {
+                number_of_stale_spilled_nodes++;
+                return;
+            }
+            push_in_first_phase_open_queue({state_id, record.g_value, record.big_f_value, record.depth});
+        }, max((long unsigned int)1, open_limit - min(open_limit, first_phase_open_queue.size())));
+    }
+
+    bool PeaIdaSearch::prune_first_phase_open_queue(long unsigned int number_of_new_open_nodes, int max_kept_big_f_value)
+    {
+        /*
+          SMA*-style frontier pruning: whole F-layers above max_kept_big_f_value are forgotten until the open queue is half full.
+          The predecessor of a forgotten node is reopened with the F-value of the node, so that the node is generated again when
+          the search comes back to that F-value. Reopened predecessors may be forgotten in turn, up to the initial node, which is kept.
+        */
+        number_of_frontier_prunings++;
+        vector<OpenNode> forgotten_nodes;
+        while (not first_phase_open_queue.empty() and first_phase_open_queue.get_max_f() > max_kept_big_f_value and (first_phase_open_queue.size() + number_of_new_open_nodes > open_limit / 2 or exceeds_open_limits(number_of_new_open_nodes)))
+        {
+            forgotten_nodes.clear();
+            first_phase_open_queue.pop_max_f_bucket(forgotten_nodes);
+
+            bool is_only_initial_node = forgotten_nodes.size() == 1 and forgotten_nodes.back().state_id == first_phase_initial_node.state_id;
+            // All nodes of the layer are marked first, since a predecessor in the same layer is no longer in the open queue.
+            for (const OpenNode &forgotten_node: forgotten_nodes)
+            {
+                remove_from_first_phase_open_statistics(forgotten_node);
+                get_first_phase_node_info(forgotten_node.state_id).status = NodeInfo::FORGOTTEN;
+            }
+            for (const OpenNode &forgotten_node: forgotten_nodes)
+            {
+                if (forgotten_node.state_id == first_phase_initial_node.state_id)
+                {
+                    push_in_first_phase_open_queue(forgotten_node);
+                    continue;
+                }
+
+                number_of_forgotten_nodes++;
+                back_up_forgotten_first_phase_node(forgotten_node);
+            }
+
+            if (is_only_initial_node)
+            {
+                break;
+            }
+        }
+
+        return not exceeds_open_limits(number_of_new_open_nodes);
+    }
+
+    void PeaIdaSearch::back_up_forgotten_first_phase_node(const OpenNode &forgotten_node)
+    {
+        StateID predecessor_state_id(get_first_phase_node_info(forgotten_node.state_id).predecessor_state_id_value, true);
+
+        // The forgotten node may have been generated below the F-value of the last expansion of its predecessor.
+        if (expansion_osf)
+        {
+            first_phase_osf_generated_big_f_values.erase(predecessor_state_id.value);
+        }
+
+        // The expanding node is not in the open queue; it is queued again with the backed-up F-value after its expansion.
+        if (expanding and predecessor_state_id == expanding_node.state_id)
+        {
+            expanding_deferred_big_f_value = min(expanding_deferred_big_f_value, forgotten_node.big_f_value);
+            expanding_has_forgotten_successors = true;
+            return;
+        }
+
+        NodeInfo &predecessor_node_info = get_first_phase_node_info(predecessor_state_id);
+
+        if (predecessor_node_info.status == NodeInfo::CLOSED)
+        {
+            predecessor_node_info.status = NodeInfo::NEW;
+            first_phase_closed_size--;
+            push_in_first_phase_open_queue({predecessor_state_id, predecessor_node_info.g_value, forgotten_node.big_f_value, forgotten_node.depth - 1});
+            number_of_reopened_predecessors++;
+        }
+        else if (predecessor_node_info.status == NodeInfo::OPEN)
+        {
+            OpenNode predecessor_node = first_phase_open_queue.get(predecessor_state_id);
+            if (predecessor_node.big_f_value > forgotten_node.big_f_value)
+            {
+                pop_from_first_phase_open_queue(predecessor_state_id);
+                predecessor_node.big_f_value = forgotten_node.big_f_value;
+                push_in_first_phase_open_queue(predecessor_node);
+            }
+        }
+        // Spilled and forgotten predecessors generate the node again once they are merged back or generated again themselves.
+    }
+
+    PeaIdaSearch::NodeInfo &PeaIdaSearch::get_first_phase_node_info(StateID state_id)
+    {
+        return first_phase_node_infos[state_registry.lookup_state(state_id)];
+    }
+
+    void PeaIdaSearch::set_first_phase_g_value(NodeInfo &node_info, int g_value) const
+    {
+        // The g-value is a bit-field of the node info, which would silently wrap around beyond its maximum.
+        if (g_value > NodeInfo::MAX_G_VALUE)
+        {
+            cerr << "g-value " << g_value << " exceeds the maximum g-value " << NodeInfo::MAX_G_VALUE << " of the first phase" << endl;
+            utils::exit_with(utils::ExitCode::SEARCH_UNSUPPORTED);
+        }
+        node_info.g_value = g_value;
+    }
+
+    size_t PeaIdaSearch::get_first_phase_memory_usage_in_bytes(long unsigned int number_of_new_open_nodes) const
+    {
+        // Closed nodes and the predecessors of all nodes live in the node infos, one per registered state.
+        return state_registry.get_memory_usage_in_bytes() + state_registry.size() * sizeof(NodeInfo) + first_phase_open_queue.get_estimated_memory_usage_in_bytes(number_of_new_open_nodes);
+    }
+
+    bool PeaIdaSearch::exceeds_open_limits(long unsigned int number_of_new_open_nodes) const
+    {
+        if (first_phase_open_queue.size() + number_of_new_open_nodes > open_limit)
+        {
+            return true;
+        }
+        return open_memory_budget > 0 and get_first_phase_memory_usage_in_bytes(number_of_new_open_nodes) > open_memory_budget;
+    }
+
+    bool PeaIdaSearch::is_below_low_water_mark() const
+    {
+        /*
+          The low-water mark is relative to the open size when the second phase became needed, so the open queue has to shrink
+          (by closing the roots of second-phase iterations) before every return to best-first expansion. The open size also
+          stands for the open-node memory of a memory budget: the rest of the first-phase memory (registered states and their
+          node infos) never shrinks, so it would keep the engine in the second phase.
+        */
+        return low_water_mark != 0 and first_phase_open_queue.size() <= low_water_mark * open_size_at_mode_switch;
+    }
+
+    void PeaIdaSearch::set_second_phase_needed(bool needed)
+    {
+        if (needed)
+        {
+            open_size_at_mode_switch = first_phase_open_queue.size();
+            best_first_mode_timer.stop();
+            ida_mode_timer.resume();
+        }
+        else
+        {
+            ida_mode_timer.stop();
+            best_first_mode_timer.resume();
+            utils::g_log << "Resuming best-first expansion with " << first_phase_open_queue.size() << " open nodes" << endl;
+        }
+        second_phase_needed = needed;
+        number_of_mode_switches++;
+    }
+
+    int PeaIdaSearch::get_first_phase_predecessor_state_id_value(int state_id_value)
     {
-        int min_depth = expanding_node.depth;
-        int max_depth = expanding_node.depth;
-        long long int sum_of_depth = expanding_node.depth;
+        return get_first_phase_node_info(StateID(state_id_value, true)).predecessor_state_id_value;
+    }
+
+    static const int CHECKPOINT_VERSION = 8;
+
+    void PeaIdaSearch::write_checkpoint(ostream &out, double search_time)
+    {
+        checkpoint::write_value<int>(out, CHECKPOINT_VERSION);
+        checkpoint::write_value<int>(out, task_proxy.get_variables().size());
+        checkpoint::write_value<int>(out, task_proxy.get_operators().size());
+        checkpoint::write_value<int>(out, state_registry.get_state_size_in_bytes());
+
+        checkpoint::write_value(out, search_time);
+        checkpoint::write_value(out, second_phase_needed);
+        checkpoint::write_value(out, open_peak_size);
+        checkpoint::write_value(out, closed_peak_size);
+        checkpoint::write_value(out, first_phase_memory_peak);
+        checkpoint::write_value(out, first_phase_closed_size);
+        checkpoint::write_value(out, number_of_first_phase_expansions);
+        checkpoint::write_value(out, number_of_second_phase_expansions);
+        checkpoint::write_value(out, number_of_first_phase_generations);
+        checkpoint::write_value(out, number_of_second_phase_generations);
+        checkpoint::write_value(out, number_of_first_phase_evaluations);
+        checkpoint::write_value(out, number_of_second_phase_evaluations);
+        checkpoint::write_value(out, number_of_deferred_evaluations);
+        checkpoint::write_value(out, number_of_performed_deferred_evaluations);
+        checkpoint::write_value(out, number_of_osf_deferred_successors);
+        checkpoint::write_value(out, number_of_first_phase_unpruned_operators);
+        checkpoint::write_value(out, number_of_first_phase_pruned_operators);
+        checkpoint::write_value(out, number_of_second_phase_transitions);
+        checkpoint::write_value(out, number_of_grown_thresholds);
+        checkpoint::write_value(out, number_of_bounded_sweeps);
+        checkpoint::write_value(out, number_of_second_phase_reexpansions);
+        checkpoint::write_value(out, number_of_mode_switches);
+        checkpoint::write_value(out, open_size_at_mode_switch);
+        checkpoint::write_value(out, number_of_stale_spilled_nodes);
+        checkpoint::write_value(out, number_of_frontier_prunings);
+        checkpoint::write_value(out, number_of_forgotten_nodes);
+        checkpoint::write_value(out, number_of_reopened_predecessors);
+        checkpoint::write_value(out, statistics.get_expanded());
+        checkpoint::write_value(out, statistics.get_evaluated_states());
+        checkpoint::write_value(out, statistics.get_evaluations());
+        checkpoint::write_value(out, statistics.get_generated());
+        checkpoint::write_value(out, statistics.get_reopened());
+        checkpoint::write_value(out, first_phase_initial_node);
+
+        // States in the order of their IDs, so that they get the same IDs when they are registered again.
+        long long int number_of_states = state_registry.size();
+        checkpoint::write_value(out, number_of_states);
+        for (int state_id_value = 0; state_id_value < number_of_states; state_id_value++)
+        {
+            out.write(reinterpret_cast<const char *>(state_registry.lookup_state(StateID(state_id_value, true)).get_buffer()), state_registry.get_state_size_in_bytes());
+        }
+        for (int state_id_value = 0; state_id_value < number_of_states; state_id_value++)
+        {
+            checkpoint::write_value(out, get_first_phase_node_info(StateID(state_id_value, true)));
+        }
+
+        vector<OpenNode> open_nodes;
+        open_nodes.reserve(first_phase_open_queue.size());
+        first_phase_open_queue.for_each([&](const OpenNode &open_node)
+        {
+            open_nodes.push_back(open_node);
+        });
+        checkpoint::write_values(out, open_nodes);
+    }
+
+    void PeaIdaSearch::read_checkpoint(const string &filename)
+    {
+        ifstream in(filename, ios::binary);
+        if (not in)
+        {
+            cerr << "Could not open checkpoint " << filename << endl;
+            utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+        }
+        int state_size_in_bytes = state_registry.get_state_size_in_bytes();
+        if (checkpoint::read_value<int>(in) != CHECKPOINT_VERSION or checkpoint::read_value<int>(in) != (int)task_proxy.get_variables().size() or checkpoint::read_value<int>(in) != (int)task_proxy.get_operators().size() or checkpoint::read_value<int>(in) != state_size_in_bytes)
+        {
+            cerr << "Checkpoint " << filename << " does not match the task" << endl;
+            utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+        }
+
+        resumed_search_time = checkpoint::read_value<double>(in);
+        second_phase_needed = checkpoint::read_value<bool>(in);
+        open_peak_size = checkpoint::read_value<long unsigned int>(in);
+        closed_peak_size = checkpoint::read_value<long unsigned int>(in);
+        first_phase_memory_peak = checkpoint::read_value<size_t>(in);
+        first_phase_closed_size = checkpoint::read_value<long unsigned int>(in);
+        number_of_first_phase_expansions = checkpoint::read_value<long unsigned int>(in);
+        number_of_second_phase_expansions = checkpoint::read_value<long unsigned int>(in);
+        number_of_first_phase_generations = checkpoint::read_value<long unsigned int>(in);
+        number_of_second_phase_generations = checkpoint::read_value<long unsigned int>(in);
+        number_of_first_phase_evaluations = checkpoint::read_value<long unsigned int>(in);
+        number_of_second_phase_evaluations = checkpoint::read_value<long unsigned int>(in);
+        number_of_deferred_evaluations = checkpoint::read_value<long unsigned int>(in);
+        number_of_performed_deferred_evaluations = checkpoint::read_value<long unsigned int>(in);
+        number_of_osf_deferred_successors = checkpoint::read_value<long unsigned int>(in);
+        number_of_first_phase_unpruned_operators = checkpoint::read_value<long unsigned int>(in);
+        number_of_first_phase_pruned_operators = checkpoint::read_value<long unsigned int>(in);
+        number_of_second_phase_transitions = checkpoint::read_value<long unsigned int>(in);
+        number_of_grown_thresholds = checkpoint::read_value<long unsigned int>(in);
+        number_of_bounded_sweeps = checkpoint::read_value<long unsigned int>(in);
+        number_of_second_phase_reexpansions = checkpoint::read_value<long unsigned int>(in);
+        number_of_mode_switches = checkpoint::read_value<long unsigned int>(in);
+        open_size_at_mode_switch = checkpoint::read_value<long unsigned int>(in);
+        number_of_stale_spilled_nodes = checkpoint::read_value<long unsigned int>(in);
+        number_of_frontier_prunings = checkpoint::read_value<long unsigned int>(in);
+        number_of_forgotten_nodes = checkpoint::read_value<long unsigned int>(in);
+        number_of_reopened_predecessors = checkpoint::read_value<long unsigned int>(in);
+        statistics.inc_expanded(checkpoint::read_value<long long int>(in));
+        statistics.inc_evaluated_states(checkpoint::read_value<long long int>(in));
+        statistics.inc_evaluations(checkpoint::read_value<long long int>(in));
+        statistics.inc_generated(checkpoint::read_value<long long int>(in));
+        statistics.inc_reopened(checkpoint::read_value<long long int>(in));
+        first_phase_initial_node = checkpoint::read_value<OpenNode>(in);
+
+        long long int number_of_states = checkpoint::read_value<long long int>(in);
+        vector<char> buffer(state_size_in_bytes);
+        for (int state_id_value = 0; state_id_value < number_of_states; state_id_value++)
+        {
+            if (not in.read(buffer.data(), state_size_in_bytes))
+            {
+                cerr << "Checkpoint " << filename << " is truncated" << endl;
+                utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+            }
+            const PackedStateBin *packed_state = reinterpret_cast<const PackedStateBin *>(buffer.data());
+            State state = state_id_value == 0 ? state_registry.get_initial_state() : state_registry.insert_packed_state(packed_state);
+            if (state.get_id().value != state_id_value or memcmp(state.get_buffer(), packed_state, state_size_in_bytes) != 0)
+            {
+                cerr << "Checkpoint " << filename << " does not match the task" << endl;
+                utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+            }
+        }
+        for (int state_id_value = 0; state_id_value < number_of_states; state_id_value++)
+        {
+            get_first_phase_node_info(StateID(state_id_value, true)) = checkpoint::read_value<NodeInfo>(in);
+        }
+
+        for (const OpenNode &open_node: checkpoint::read_values<OpenNode>(in))
+        {
+            push_in_first_phase_open_queue(open_node);
+        }
+
+        // Spilled nodes are not part of the checkpoint; they are put back in open with their g+h as F-value, which is admissible.
+        for (int state_id_value = 0; state_id_value < number_of_states; state_id_value++)
+        {
+            StateID state_id(state_id_value, true);
+            NodeInfo &node_info = get_first_phase_node_info(state_id);
+            if (node_info.status != NodeInfo::SPILLED)
+            {
+                continue;
+            }
+            int h_value = evaluate(state_registry.lookup_state(state_id), node_info.g_value);
+            node_info.evaluation_deferred = false;
+            if (h_value == INT_MAX)
+            {
+                get_first_phase_node_info(state_id).status = NodeInfo::NEW;
+                continue;
+            }
+            int depth = 0;
+            for (int ancestral_state_id_value = state_id_value; ancestral_state_id_value != first_phase_initial_node.state_id.value; ancestral_state_id_value = get_first_phase_predecessor_state_id_value(ancestral_state_id_value))
+            {
+                depth++;
+            }
+            push_in_first_phase_open_queue({state_id, node_info.g_value, node_info.g_value + h_value, depth});
+        }
+
+        utils::g_log << "Resumed from checkpoint " << filename << " with " << state_registry.size() << " registered states and " << first_phase_open_queue.size() << " open nodes" << endl;
+    }
+
+    void PeaIdaSearch::print_solution(bool insolution)
+    {
+        if (insolution)
+        {
+            utils::g_log << "Insolution found!" << endl;
+        }
+        else
+        {
+            utils::g_log << "Solution found!" << endl;
+
+            Plan plan;
+            vector<State> path_states;
+            int ancestral_state_id_value = expanding_node.state_id.value;
+            if (current_phase == SECOND_PHASE and (using_transient_second_phase or second_phase_parallel_dfs))
+            {
+                for (int i = second_phase_transient_path.size() - 1; i > 0; i--)
+                {
+                    plan.push_back(OperatorID(second_phase_transient_path[i].generating_operator_proxy_id));
+                    path_states.push_back(second_phase_transient_path[i].state);
+                }
+                ancestral_state_id_value = second_phase_initial_node.state_id.value;
+            }
+            while (not second_phase_predecessors_state_ids_values.empty())
+            {
+                plan.push_back(OperatorID(second_phase_generating_operators_proxy_ids.back()));
+                path_states.push_back(state_registry.lookup_state(StateID(ancestral_state_id_value, true)));
+                ancestral_state_id_value = second_phase_predecessors_state_ids_values.back();
+                second_phase_generating_operators_proxy_ids.pop_back();
+                second_phase_predecessors_state_ids_values.pop_back();
+            }
+            while (ancestral_state_id_value != first_phase_initial_node.state_id.value)
+            {
+                plan.push_back(OperatorID(get_first_phase_node_info(StateID(ancestral_state_id_value, true)).generating_operator_proxy_id));
+                path_states.push_back(state_registry.lookup_state(StateID(ancestral_state_id_value, true)));
+                ancestral_state_id_value = get_first_phase_predecessor_state_id_value(ancestral_state_id_value);
+            }
+            path_states.push_back(state_registry.lookup_state(first_phase_initial_node.state_id));
+            reverse(plan.begin(), plan.end());
+            reverse(path_states.begin(), path_states.end());
+            State solution_state = path_states.back();
+            if (structural_symmetries)
+            {
+                // The stored operators lead to orbit representatives, so the plan is rebuilt along states symmetric to them.
+                solution_state = structural_symmetries->reconstruct_plan(path_states, plan);
+            }
+            if (goal_perimeter and not task_properties::is_goal_state(task_proxy, solution_state))
+            {
+                // The solution node lies in the goal perimeter instead of being a goal state.
+                solution_state.unpack();
+                goal_perimeter->extract_plan(solution_state, plan);
+            }
+            set_plan(plan);
+            utils::g_log << "Time to solution: " << utils::g_timer << endl;
+        }
+
+        utils::g_log << "Open peak size: " << open_peak_size << endl;
+        utils::g_log << "Closed peak size: " << closed_peak_size << endl;
+        utils::g_log << "Number of first phase expansions: " << number_of_first_phase_expansions << endl;
+        utils::g_log << "Number of second phase expansions: " << number_of_second_phase_expansions << endl;
+        utils::g_log << "Number of first phase generations: " << number_of_first_phase_generations << endl;
+        utils::g_log << "Number of second phase generations: " << number_of_second_phase_generations << endl;
+        utils::g_log << "Number of first phase evaluations: " << number_of_first_phase_evaluations << endl;
+        utils::g_log << "Number of second phase evaluations: " << number_of_second_phase_evaluations << endl;
+        utils::g_log << "First phase evaluations per expansion: " << (number_of_first_phase_expansions ? float(number_of_first_phase_evaluations) / float(number_of_first_phase_expansions) : 0) << endl;
+        utils::g_log << "Second phase evaluations per expansion: " << (number_of_second_phase_expansions ? float(number_of_second_phase_evaluations) / float(number_of_second_phase_expansions) : 0) << endl;
+        utils::g_log << "Number of first phase pruned operators: " << number_of_first_phase_pruned_operators << " of " << number_of_first_phase_unpruned_operators << endl;
+        utils::g_log << "Number of second phase pruned operators: " << number_of_second_phase_pruned_operators << " of " << number_of_second_phase_unpruned_operators << endl;
+        utils::g_log << "First phase pruning ratio: " << (number_of_first_phase_unpruned_operators ? double(number_of_first_phase_pruned_operators) / double(number_of_first_phase_unpruned_operators) : 0) << endl;
+        utils::g_log << "Second phase pruning ratio: " << (number_of_second_phase_unpruned_operators ? double(number_of_second_phase_pruned_operators) / double(number_of_second_phase_unpruned_operators) : 0) << endl;
+        utils::g_log << "First phase pruning time: " << first_phase_pruning_timer << endl;
+        utils::g_log << "Second phase pruning time: " << second_phase_pruning_timer << endl;
+        if (using_deferred_evaluation)
+        {
+            utils::g_log << "Number of deferred evaluations: " << number_of_deferred_evaluations << endl;
+            utils::g_log << "Number of saved evaluations: " << number_of_deferred_evaluations - number_of_performed_deferred_evaluations << endl;
+        }
+        if (expansion_osf)
+        {
+            utils::g_log << "Number of successors deferred by the operator selection function: " << number_of_osf_deferred_successors << endl;
+        }
+        utils::g_log << "Number of second phase iterations: " << number_of_second_phase_transitions << endl;
+        utils::g_log << "Number of second phase iterations with a grown threshold: " << number_of_grown_thresholds << endl;
+        utils::g_log << "Number of second phase bounded sweeps: " << number_of_bounded_sweeps << endl;
+        utils::g_log << "Second phase re-expansion ratio: " << (number_of_second_phase_expansions ? double(number_of_second_phase_reexpansions) / double(number_of_second_phase_expansions) : 0) << " of " << number_of_second_phase_expansions << " expansions" << endl;
+        utils::g_log << "Number of registered states: " << state_registry.size() << endl;
+        utils::g_log << "Number of mode switches: " << number_of_mode_switches << endl;
+        utils::g_log << "Time in best-first mode: " << best_first_mode_timer() << endl;
+        utils::g_log << "Time in IDA* mode: " << ida_mode_timer() << endl;
+        utils::g_log << "First phase memory peak: " << first_phase_memory_peak / 1024 << " KB" << endl;
+        utils::g_log << "Node store memory: " << (state_registry.size() * sizeof(NodeInfo) + first_phase_open_queue.get_memory_usage_in_bytes()) / 1024 << " KB" << endl;
+        if (h_value_cache)
+        {
+            h_value_cache->print_statistics();
+        }
+        if (dead_end_memo)
+        {
+            dead_end_memo->print_statistics();
+        }
+        if (goal_perimeter)
+        {
+            goal_perimeter->print_statistics();
+        }
+        if (structural_symmetries)
+        {
+            structural_symmetries->print_statistics();
+        }
+        if (second_phase_parallel_dfs)
+        {
+            second_phase_parallel_dfs->print_statistics();
+        }
+        if (second_phase_transposition_table)
+        {
+            second_phase_transposition_table->print_statistics();
+        }
+        if (first_phase_spilled_open_list)
+        {
+            first_phase_spilled_open_list->print_statistics();
+            utils::g_log << "Stale spilled nodes: " << number_of_stale_spilled_nodes << endl;
+        }
+        if (using_frontier_pruning)
+        {
+            utils::g_log << "Number of frontier prunings: " << number_of_frontier_prunings << endl;
+            utils::g_log << "Number of forgotten nodes: " << number_of_forgotten_nodes << endl;
+            utils::g_log << "Number of reopened predecessors: " << number_of_reopened_predecessors << endl;
+        }
+    }
+
+    void PeaIdaSearch::add_to_first_phase_open_statistics(const OpenNode &open_node)
+    {
+        first_phase_open_big_f_value_sum += open_node.big_f_value;
+        first_phase_open_depth_sum += open_node.depth;
+        if (open_node.depth >= (int)first_phase_open_depth_counts.size())
+        {
+            first_phase_open_depth_counts.resize(open_node.depth + 1, 0);
+        }
+        first_phase_open_depth_counts[open_node.depth]++;
+    }
+
+    void PeaIdaSearch::remove_from_first_phase_open_statistics(const OpenNode &open_node)
+    {
+        assert(first_phase_open_depth_counts[open_node.depth] > 0);
+        first_phase_open_big_f_value_sum -= open_node.big_f_value;
+        first_phase_open_depth_sum -= open_node.depth;
+        first_phase_open_depth_counts[open_node.depth]--;
+    }
+
+    PeaIdaSearch::FrontierStatistics PeaIdaSearch::get_first_phase_frontier_statistics() const
+    {
+        // The expanding node was popped from the open queue, but it is part of the frontier.
+        FrontierStatistics statistics;
+        statistics.size = first_phase_open_queue.size() + 1;
 
-        FBestQueue::iterator first_phase_open_queue_iterator = first_phase_open_queue.begin();
-        for (unsigned long int i = 0; i < first_phase_open_queue.size(); i++)
+        statistics.min_big_f_value = expanding_node.big_f_value;
+        statistics.max_big_f_value = expanding_node.big_f_value;
+        if (not first_phase_open_queue.empty())
         {
-            int depth = first_phase_open_queue_iterator->depth;
-            sum_of_depth += depth;
-            max_depth = max(max_depth, depth);
-            min_depth = min(min_depth, depth);
+            statistics.min_big_f_value = min(statistics.min_big_f_value, first_phase_open_queue.get_min_f());
+            statistics.max_big_f_value = max(statistics.max_big_f_value, first_phase_open_queue.get_max_f());
+        }
+        long unsigned int number_of_min_big_f_values = first_phase_open_queue.count(statistics.min_big_f_value) + (expanding_node.big_f_value == statistics.min_big_f_value);
+        statistics.mean_big_f_value = float(first_phase_open_big_f_value_sum + expanding_node.big_f_value) / float(statistics.size);
+        statistics.percentage_of_min_big_f_values = float(number_of_min_big_f_values) / float(statistics.size);
 
-            std::advance(first_phase_open_queue_iterator, 1);
+        statistics.min_depth = expanding_node.depth;
+        statistics.max_depth = expanding_node.depth;
+        for (int depth = 0; depth < (int)first_phase_open_depth_counts.size(); depth++)
+        {
+            if (first_phase_open_depth_counts[depth] > 0)
+            {
+                statistics.min_depth = min(statistics.min_depth, depth);
+                statistics.max_depth = max(statistics.max_depth, depth);
+            }
         }
+        statistics.mean_depth = float(first_phase_open_depth_sum + expanding_node.depth) / float(statistics.size);
+
+        return statistics;
+    }
+
+    void PeaIdaSearch::print_infos_about_big_f_values_at_phase_transition()
+    {
+        FrontierStatistics statistics = get_first_phase_frontier_statistics();
+
+        utils::g_log << "Mininum F-value at phase transition: " << statistics.min_big_f_value << endl;
+        utils::g_log << "Mean F-value at phase transition: " << statistics.mean_big_f_value << endl;
+        utils::g_log << "Maximum F-value at phase transition: " << statistics.max_big_f_value << endl;
+        utils::g_log << "Percentage of minimum F-values at phase transition: " << statistics.percentage_of_min_big_f_values << endl;
+    }
+
+    void PeaIdaSearch::print_infos_about_depths_at_phase_transition()
+    {
+        FrontierStatistics statistics = get_first_phase_frontier_statistics();
 
-        float mean_depth = {float(sum_of_depth) / float(first_phase_open_queue.size() + 1)};
+        utils::g_log << "Mininum depth at phase transition: " << statistics.min_depth << endl;
+        utils::g_log << "Mean depth at phase transition: " << statistics.mean_depth << endl;
+        utils::g_log << "Maximum depth at phase transition: " << statistics.max_depth << endl;
+    }
 
-        utils::g_log << "Mininum depth at phase transition: " << min_depth << endl;
-        utils::g_log << "Mean depth at phase transition: " << mean_depth << endl;
-        utils::g_log << "Maximum depth at phase transition: " << max_depth << endl;
+    void PeaIdaSearch::print_phase_transition_record()
+    {
+        // One JSON object per transition to the second phase, which is collected by tests/processor.py.
+        FrontierStatistics statistics = get_first_phase_frontier_statistics();
+
+        utils::g_log << "Phase transition record: {"
+                     << "\"transition\": " << number_of_second_phase_transitions + 1
+                     << ", \"open_size\": " << statistics.size
+                     << ", \"closed_size\": " << first_phase_closed_size
+                     << ", \"memory_kb\": " << get_first_phase_memory_usage_in_bytes() / 1024
+                     << ", \"first_phase_expansions\": " << number_of_first_phase_expansions
+                     << ", \"second_phase_expansions\": " << number_of_second_phase_expansions
+                     << ", \"min_f\": " << statistics.min_big_f_value
+                     << ", \"mean_f\": " << statistics.mean_big_f_value
+                     << ", \"max_f\": " << statistics.max_big_f_value
+                     << ", \"pct_min_f\": " << statistics.percentage_of_min_big_f_values
+                     << ", \"min_depth\": " << statistics.min_depth
+                     << ", \"mean_depth\": " << statistics.mean_depth
+                     << ", \"max_depth\": " << statistics.max_depth
+                     << "}" << endl;
     }
 
     void add_options_to_parser(OptionParser &parser)
     {
+        parser.add_option<shared_ptr<pdbs::PatternGenerator>>("osf_pattern", "pattern of the PDB used as operator selection function with --enhanced-partial-expansion", "greedy()");
         SearchEngine::add_pruning_option(parser);
         SearchEngine::add_options_to_parser(parser);
     }
@@ -1,16 +1,39 @@
 #ifndef SEARCH_ENGINES_EAGER_SEARCH_H
 #define SEARCH_ENGINES_EAGER_SEARCH_H
 
+#include "../evaluation_context.h"
+#include "../per_state_information.h"
 #include "../search_engine.h"
 
+#include "checkpoint.h"
+#include "dead_end_memo.h"
+#include "goal_perimeter.h"
+#include "h_value_cache.h"
+#include "hash_distributed_search.h"
+#include "move_pruning.h"
+#include "operator_selection_function.h"
+#include "parallel_bounded_dfs.h"
+#include "spilled_open_list.h"
+#include "structural_symmetries.h"
+#include "transposition_table.h"
+
+#include "../algorithms/flat_int_map.h"
+#include "../open_lists/f_g_bucket_open_list.h"
+#include "../utils/hash.h"
+#include "../utils/timer.h"
+
 #include <vector>
 
 #include <boost/heap/pairing_heap.hpp>
 
+#include <cassert>
+#include <map>
+#include <memory>
 #include <unordered_map>
 #include <optional>
 
 class Evaluator;
+class PruningMethod;
 
 namespace options
 {
@@ -46,32 +69,67 @@ namespace pea_ida_search
             }
         };
 
-        struct FBestOrdering
+        struct NodeInfo
         {
-            bool operator()(const OpenNode open_node_1, const OpenNode open_node_2) const
+            enum NodeStatus
             {
-                if (open_node_1.big_f_value not_eq open_node_2.big_f_value)
-                {
-                    return open_node_1.big_f_value > open_node_2.big_f_value;
-                }
+                NEW = 0,
+                OPEN = 1,
+                CLOSED = 2,
+                SPILLED = 3,
+                FORGOTTEN = 4
+            };
+
+            unsigned int status : 3;
+            // Whether the F-value of the node is only the lower bound given by its predecessor.
+            unsigned int evaluation_deferred : 1;
+            // Only set through set_first_phase_g_value, which checks that the g-value fits in the field.
+            int g_value : 28;
+            int predecessor_state_id_value;
+            int generating_operator_proxy_id;
+
+            static const int MAX_G_VALUE = (1 << 27) - 1;
+
+            NodeInfo() : status(NEW), evaluation_deferred(false), g_value(-1), predecessor_state_id_value(-1), generating_operator_proxy_id(-1)
+            {
+            }
+        };
 
-                if (open_node_1.g_value not_eq open_node_2.g_value)
-                {
-                    return open_node_1.g_value < open_node_2.g_value;
-                }
+        struct TransientNode
+        {
+            State state;
+            int g_value;
+            int big_f_value;
+            int depth;
+            int generating_operator_proxy_id;
 
-                if (open_node_1.depth not_eq open_node_2.depth)
-                {
-                    return open_node_1.depth < open_node_2.depth;
-                }
+            TransientNode(State state, int g_value, int big_f_value, int depth, int generating_operator_proxy_id) : state(std::move(state)), g_value(g_value), big_f_value(big_f_value), depth(depth), generating_operator_proxy_id(generating_operator_proxy_id)
+            {
+            }
+        };
 
-                return true;
+        // The registered second phase keeps the generating operator with the node, so that the path only needs one operator per depth.
+        struct SecondPhaseNode : OpenNode
+        {
+            int generating_operator_proxy_id;
+
+            SecondPhaseNode(const OpenNode &open_node, int generating_operator_proxy_id) : OpenNode(open_node), generating_operator_proxy_id(generating_operator_proxy_id)
+            {
             }
         };
 
+        struct GeneratedSuccessor
+        {
+            State state;
+            int g_value;
+            int h_value;
+            int generating_operator_proxy_id;
+        };
+
         struct DepthOrdering
         {
-            bool operator()(const OpenNode open_node_1, const OpenNode open_node_2) const
+            template<typename Node>
+            bool operator()(const Node &open_node_1, const Node &open_node_2) const
             {
                 if (open_node_1.depth not_eq open_node_2.depth)
                 {
@@ -92,52 +150,215 @@ namespace pea_ida_search
             }
         };
 
-        typedef boost::heap::pairing_heap<OpenNode, boost::heap::stable<true>, boost::heap::compare<FBestOrdering>> FBestQueue;
-        typedef boost::heap::pairing_heap<OpenNode, boost::heap::stable<true>, boost::heap::compare<DepthOrdering>> DepthQueue;
+        // Counts of the values of the nodes exceeding the threshold of a second phase iteration, in increasing order of value.
+        struct Histogram
+        {
+            std::map<int, long unsigned int> counts;
+            long unsigned int size = 0;
+
+            void add(int value)
+            {
+                counts[value]++;
+                size++;
+            }
+        };
+
+        // Distribution of the F-values and depths of the frontier of the first phase, i.e. of its open queue and the expanding node.
+        struct FrontierStatistics
+        {
+            long unsigned int size;
+            int min_big_f_value;
+            float mean_big_f_value;
+            int max_big_f_value;
+            float percentage_of_min_big_f_values;
+            int min_depth;
+            float mean_depth;
+            int max_depth;
+        };
 
-        typedef std::unordered_map<StateID, std::pair<int, FBestQueue::handle_type>> FBestQueueHash;
-        typedef std::unordered_map<StateID, FBestQueue::handle_type> FBestQueueSingleHash;
-        typedef std::unordered_map<StateID, int> Hash;
+        // What the previous iteration of the second phase from a state left for the next one.
+        struct SecondPhaseRootInfo
+        {
+            int threshold_increment;
+            int threshold;
+            long unsigned int number_of_expansions;
+        };
+
+        typedef f_g_bucket_open_list::FGBucketOpenList<OpenNode> FBestQueue;
+        typedef boost::heap::pairing_heap<TransientNode, boost::heap::stable<true>, boost::heap::compare<DepthOrdering>> TransientDepthQueue;
+
+        typedef utils::HashMap<std::vector<int>, int> TransientHash;
+        typedef utils::HashSet<std::vector<int>> TransientSet;
 
         Phase current_phase;
         bool second_phase_needed;
         long unsigned int open_peak_size;
         long unsigned int closed_peak_size;
+        std::size_t first_phase_memory_peak;
         long unsigned int number_of_first_phase_expansions;
         long unsigned int number_of_second_phase_expansions;
         long unsigned int number_of_first_phase_generations;
         long unsigned int number_of_second_phase_generations;
+        long unsigned int number_of_first_phase_evaluations;
+        long unsigned int number_of_second_phase_evaluations;
+        long unsigned int number_of_deferred_evaluations;
+        long unsigned int number_of_performed_deferred_evaluations;
         long unsigned int number_of_second_phase_transitions;
+        long unsigned int number_of_mode_switches;
+        long unsigned int open_size_at_mode_switch;
+        utils::Timer best_first_mode_timer;
+        utils::Timer ida_mode_timer;
 
         bool expanding;
         OpenNode expanding_node;
         std::vector<OperatorID> expanding_operators;
+        std::vector<int> expanding_state_values;
         std::vector<OpenNode> generating_nodes;
-        Hash expanding_hash;
+        std::vector<GeneratedSuccessor> generated_successors;
+        flat_int_map::FlatIntMap<int> expanding_hash;
+
+        // Scratch buffers of an expansion, which are cleared instead of allocated again.
+        std::vector<OpenNode> generating_nodes_to_put_in_open;
+        std::vector<OpenNode> generating_nodes_to_re_compact;
+        std::vector<EvaluationContext> successor_eval_contexts;
+        std::vector<OperatorID> successor_generating_operators;
+        std::vector<GeneratedSuccessor *> evaluated_successors;
+        std::vector<GeneratedSuccessor *> outside_perimeter_successors;
+
+        // Enhanced partial expansion: successors whose F-value bound exceeds the F-value of the expanding node are not generated.
+        std::unique_ptr<operator_selection_function::PDBOperatorSelectionFunction> expansion_osf;
+        int expanding_osf_index;
+        int expanding_deferred_big_f_value;
+        long unsigned int number_of_osf_deferred_successors;
+        // Successors whose F-value bound is at most this value were generated at an earlier expansion of the expanding node.
+        int expanding_osf_generated_big_f_value;
+        // Whether frontier pruning backed up forgotten successors into the expanding node.
+        bool expanding_has_forgotten_successors;
+        // F-value of the last expansion of queued nodes whose remaining successors are all deferred by the operator selection function.
+        std::unordered_map<int, int> first_phase_osf_generated_big_f_values;
+
+        std::shared_ptr<PruningMethod> pruning_method;
+        // Only used in the second phase, which has no duplicate detection across paths.
+        std::unique_ptr<move_pruning::MovePruning> second_phase_move_pruning;
+        long unsigned int number_of_first_phase_unpruned_operators;
+        long unsigned int number_of_first_phase_pruned_operators;
+        long unsigned int number_of_second_phase_unpruned_operators;
+        long unsigned int number_of_second_phase_pruned_operators;
+        utils::Timer first_phase_pruning_timer;
+        utils::Timer second_phase_pruning_timer;
 
         FBestQueue first_phase_open_queue;
-        FBestQueueHash first_phase_open_queue_hash;
-        Hash first_phase_closed_hash;
-        DepthQueue second_phase_open_queue;
+        // The counts of the F-values of the open queue are kept by its f-buckets, so only their sum is kept here, with the counts of the depths.
+        long long int first_phase_open_big_f_value_sum;
+        long long int first_phase_open_depth_sum;
+        std::vector<long unsigned int> first_phase_open_depth_counts;
+        PerStateInformation<NodeInfo> first_phase_node_infos;
+        std::unique_ptr<spilled_open_list::SpilledOpenList> first_phase_spilled_open_list;
+        long unsigned int number_of_stale_spilled_nodes;
+        long unsigned int number_of_frontier_prunings;
+        long unsigned int number_of_forgotten_nodes;
+        long unsigned int number_of_reopened_predecessors;
+        long unsigned int first_phase_closed_size;
+        // Depth-first order: the children of the expanded node are deeper than all other nodes, so they are pushed sorted with the best one on top.
+        std::vector<SecondPhaseNode> second_phase_open_stack;
 
-        Hash first_phase_predecessors_state_ids_values;
-        Hash first_phase_generating_operators_proxy_ids;
         std::vector<int> second_phase_predecessors_state_ids_values;
-        std::vector<Hash> second_phase_generating_operators_proxy_ids;
+        std::vector<int> second_phase_prefix_state_ids_values;
+        std::vector<bool> second_phase_on_path;
+        // The generating operator of the node at each depth of the path, relative to the initial node.
+        std::vector<int> second_phase_generating_operators_proxy_ids;
         OpenNode first_phase_initial_node;
         OpenNode second_phase_initial_node;
         int second_phase_initial_node_new_big_f_value;
 
+        // IDA*_CR-style threshold growth: an iteration may search beyond the F-value of its initial node, which stays a lower bound.
+        int second_phase_threshold;
+        bool second_phase_found_goal_above_lower_bound;
+        long unsigned int second_phase_iteration_start_expansions;
+        Histogram second_phase_exceeded_big_f_values;
+        std::unordered_map<int, SecondPhaseRootInfo> second_phase_root_infos;
+        long unsigned int number_of_grown_thresholds;
+        long unsigned int number_of_bounded_sweeps;
+        long unsigned int number_of_second_phase_reexpansions;
+
+        std::vector<TransientNode> generating_transient_nodes;
+        TransientHash expanding_transient_hash;
+        TransientDepthQueue second_phase_transient_open_queue;
+        std::vector<TransientNode> second_phase_transient_path;
+        TransientSet second_phase_transient_on_path;
+
+        std::unique_ptr<transposition_table::TranspositionTable> second_phase_transposition_table;
+        std::unique_ptr<h_value_cache::HValueCache> h_value_cache;
+        std::unique_ptr<dead_end_memo::DeadEndMemo> dead_end_memo;
+        std::unique_ptr<goal_perimeter::GoalPerimeter> goal_perimeter;
+        // Orbit search: the registered states are representatives of the orbits of the generated ones.
+        std::unique_ptr<structural_symmetries::StructuralSymmetries> structural_symmetries;
+        std::vector<int> canonical_values;
+        std::unique_ptr<parallel_bounded_dfs::ParallelBoundedDfs> second_phase_parallel_dfs;
+        std::unique_ptr<hash_distributed_search::HashDistributedSearch> first_phase_hash_distributed_search;
+        std::unique_ptr<checkpoint::CheckpointWriter> checkpoint_writer;
+        utils::Timer checkpoint_timer;
+
         SearchStatus first_phase_step();
+        SearchStatus first_phase_hash_distributed_step();
         SearchStatus second_phase_step();
-
-        OpenNode pop_from_first_phase_open_queue(std::optional<FBestQueue::handle_type> handle = {});
+        SearchStatus second_phase_transient_step();
+        SearchStatus second_phase_parallel_step();
+
+        State get_registered_successor_state(const State &expanding_state, const OperatorProxy &applicable_operator_proxy);
+        void generate_in_first_phase(const State &expanding_state, OperatorID applicable_operator);
+        void generate_in_second_phase(const State &expanding_state, OperatorID applicable_operator);
+        void generate_in_second_phase_transient(const TransientNode &expanding_transient_node, OperatorID applicable_operator);
+
+        void generate_expanding_operators(const State &expanding_state);
+        void prune_expanding_operators(const State &expanding_state, int generating_operator_proxy_id);
+        bool is_deferred_by_osf(const State &expanding_state, int expanding_g_value, OperatorID applicable_operator, int max_big_f_value, int &deferred_big_f_value);
+        int evaluate(const State &state, int g_value);
+        void count_evaluation(const EvaluationResult &result);
+        int get_goal_distance(const State &state, int h_lower_bound);
+        void evaluate_generated_successors(const State &expanding_state);
+
+        bool evaluate_deferred_first_phase_node();
+
+        void start_second_phase();
+        void finish_second_phase();
+        bool is_using_threshold_growth() const;
+        void exceed_second_phase_threshold(int big_f_value);
+        bool is_optimal_second_phase_goal(int g_value);
+        int choose_second_phase_threshold_increment(long unsigned int previous_iteration_expansions, int previous_iteration_threshold) const;
+
+        void mark_on_second_phase_path(int state_id_value);
+        void unmark_on_second_phase_path(int state_id_value);
+        bool is_on_second_phase_path(int state_id_value) const;
+
+        OpenNode pop_from_first_phase_open_queue(std::optional<StateID> state_id = {});
         void push_in_first_phase_open_queue(OpenNode open_node);
+        void close_in_first_phase(OpenNode closed_node);
+        int get_first_phase_osf_generated_big_f_value(StateID state_id) const;
+        bool spill_first_phase_open_queue(long unsigned int number_of_new_open_nodes, int max_kept_big_f_value);
+        void merge_back_first_phase_spilled_nodes();
+        bool prune_first_phase_open_queue(long unsigned int number_of_new_open_nodes, int max_kept_big_f_value);
+        void back_up_forgotten_first_phase_node(const OpenNode &forgotten_node);
+
+        NodeInfo &get_first_phase_node_info(StateID state_id);
+        void set_first_phase_g_value(NodeInfo &node_info, int g_value) const;
+        std::size_t get_first_phase_memory_usage_in_bytes(long unsigned int number_of_new_open_nodes = 0) const;
+        bool exceeds_open_limits(long unsigned int number_of_new_open_nodes) const;
+        bool is_below_low_water_mark() const;
+        void set_second_phase_needed(bool needed);
+        int get_first_phase_predecessor_state_id_value(int state_id_value);
+
+        void write_checkpoint(std::ostream &out, double search_time);
+        void read_checkpoint(const std::string &filename);
 
         void print_solution(bool insolution = false);
 
+        void add_to_first_phase_open_statistics(const OpenNode &open_node);
+        void remove_from_first_phase_open_statistics(const OpenNode &open_node);
+        FrontierStatistics get_first_phase_frontier_statistics() const;
         void print_infos_about_big_f_values_at_phase_transition();
         void print_infos_about_depths_at_phase_transition();
+        void print_phase_transition_record();
 
     protected:
         virtual void initialize() override;
@@ -1,6 +1,7 @@
 #include "pea_ida_search.h"
 #include "search_common.h"
 
+#include "../evaluator.h"
 #include "../option_parser.h"
 #include "../plugin.h"
 
@@ -18,6 +19,21 @@ static shared_ptr<SearchEngine> _parse(OptionParser &parser) {
 
     shared_ptr<pea_ida_search::PeaIdaSearch> engine;
     if (!parser.dry_run()) {
+        /*
+          Every thread of a parallel phase evaluates states with its own
+          instance of the evaluator. The command line has already been
+          parsed once in dry-run mode at this point, so the numbers of
+          threads are known.
+        */
+        vector<shared_ptr<Evaluator>> worker_evals;
+        int num_threads = max(SearchEngine::first_phase_threads, SearchEngine::second_phase_threads);
+        for (int i = 1; i < num_threads; ++i) {
+            OptionParser eval_parser(
+                opts.get<shared_ptr<Evaluator>>("eval")->get_description(),
+                parser.get_registry(), parser.get_predefinitions(), false);
+            worker_evals.push_back(eval_parser.start_parsing<shared_ptr<Evaluator>>());
+        }
+        opts.set("worker_evals", worker_evals);
         engine = make_shared<pea_ida_search::PeaIdaSearch>(opts);
     }
 
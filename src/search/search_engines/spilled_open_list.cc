@@ -0,0 +1,155 @@
+#include "spilled_open_list.h"
+
+#include "../utils/logging.h"
+#include "../utils/system.h"
+
+#include <algorithm>
+#include <cassert>
+#include <climits>
+#include <cstdio>
+#include <iostream>
+
+using namespace std;
+
+namespace spilled_open_list {
+static bool comes_before(const Record &record_1, const Record &record_2) {
+    if (record_1.big_f_value != record_2.big_f_value)
+        return record_1.big_f_value < record_2.big_f_value;
+    if (record_1.g_value != record_2.g_value)
+        return record_1.g_value > record_2.g_value;
+    return record_1.depth > record_2.depth;
+}
+
+void SpilledOpenList::Run::read_head() {
+    has_head = static_cast<bool>(
+        file.read(reinterpret_cast<char *>(&head), sizeof(Record)));
+}
+
+SpilledOpenList::SpilledOpenList(const string &directory)
+    : directory(directory),
+      num_created_runs(0),
+      num_records(0),
+      num_spilled_records(0),
+      num_merged_records(0),
+      num_bytes_written(0),
+      peak_num_records(0) {
+}
+
+SpilledOpenList::~SpilledOpenList() {
+    for (const unique_ptr<Run> &run : runs) {
+        run->file.close();
+        remove(run->filename.c_str());
+    }
+}
+
+void SpilledOpenList::write_run(vector<Record> &records) {
+    unique_ptr<Run> run = make_unique<Run>();
+    run->filename = directory + "/pea_ida_spill_" + to_string(utils::get_process_id()) +
+        "_" + to_string(num_created_runs++) + ".run";
+    {
+        ofstream file(run->filename, ios::binary | ios::trunc);
+        file.write(reinterpret_cast<const char *>(records.data()),
+                   records.size() * sizeof(Record));
+        if (!file) {
+            cerr << "Could not write spill file " << run->filename << endl;
+            utils::exit_with(utils::ExitCode::SEARCH_CRITICAL_ERROR);
+        }
+    }
+    num_bytes_written += records.size() * sizeof(Record);
+    run->file.open(run->filename, ios::binary);
+    if (!run->file) {
+        cerr << "Could not read spill file " << run->filename << endl;
+        utils::exit_with(utils::ExitCode::SEARCH_CRITICAL_ERROR);
+    }
+    run->read_head();
+    runs.push_back(move(run));
+}
+
+void SpilledOpenList::merge_all_runs() {
+    vector<Record> buffer;
+    const size_t buffer_size = 1 << 16;
+    buffer.reserve(buffer_size);
+    unique_ptr<Run> merged_run = make_unique<Run>();
+    merged_run->filename = directory + "/pea_ida_spill_" + to_string(utils::get_process_id()) +
+        "_" + to_string(num_created_runs++) + ".run";
+    ofstream file(merged_run->filename, ios::binary | ios::trunc);
+    while (true) {
+        Run *best_run = nullptr;
+        for (const unique_ptr<Run> &run : runs) {
+            if (run->has_head && (!best_run || comes_before(run->head, best_run->head)))
+                best_run = run.get();
+        }
+        if (!best_run || buffer.size() == buffer_size) {
+            file.write(reinterpret_cast<const char *>(buffer.data()),
+                       buffer.size() * sizeof(Record));
+            num_bytes_written += buffer.size() * sizeof(Record);
+            buffer.clear();
+        }
+        if (!best_run)
+            break;
+        buffer.push_back(best_run->head);
+        best_run->read_head();
+    }
+    file.close();
+    if (!file) {
+        cerr << "Could not write spill file " << merged_run->filename << endl;
+        utils::exit_with(utils::ExitCode::SEARCH_CRITICAL_ERROR);
+    }
+    remove_exhausted_runs();
+    assert(runs.empty());
+    merged_run->file.open(merged_run->filename, ios::binary);
+    merged_run->read_head();
+    runs.push_back(move(merged_run));
+}
+
+void SpilledOpenList::remove_exhausted_runs() {
+    for (const unique_ptr<Run> &run : runs) {
+        if (!run->has_head) {
+            run->file.close();
+            remove(run->filename.c_str());
+        }
+    }
+    runs.erase(remove_if(runs.begin(), runs.end(),
+                         [](const unique_ptr<Run> &run) {
+                             return !run->has_head;
+                         }),
+               runs.end());
+}
+
+void SpilledOpenList::spill(vector<Record> &records) {
+    if (records.empty())
+        return;
+    sort(records.begin(), records.end(), comes_before);
+    write_run(records);
+    num_records += records.size();
+    num_spilled_records += records.size();
+    peak_num_records = max(peak_num_records, num_records);
+    if (static_cast<int>(runs.size()) > MAX_NUM_RUNS)
+        merge_all_runs();
+}
+
+bool SpilledOpenList::empty() const {
+    return num_records == 0;
+}
+
+long unsigned int SpilledOpenList::size() const {
+    return num_records;
+}
+
+int SpilledOpenList::get_min_big_f_value() const {
+    int min_big_f_value = INT_MAX;
+    for (const unique_ptr<Run> &run : runs) {
+        assert(run->has_head);
+        min_big_f_value = min(min_big_f_value, run->head.big_f_value);
+    }
+    return min_big_f_value;
+}
+
+void SpilledOpenList::print_statistics() const {
+    utils::g_log << "Spilled nodes: " << num_spilled_records << endl;
+    utils::g_log << "Merged back nodes: " << num_merged_records << endl;
+    utils::g_log << "Spilled peak size: " << peak_num_records << endl;
+    utils::g_log << "Spill runs: " << num_created_runs << endl;
+    utils::g_log << "Spill bytes written: " << num_bytes_written / 1024 << " KB" << endl;
+}
+}
@@ -0,0 +1,101 @@
+#ifndef SEARCH_ENGINES_SPILLED_OPEN_LIST_H
+#define SEARCH_ENGINES_SPILLED_OPEN_LIST_H
+
+#include <fstream>
+#include <memory>
+#include <string>
+#include <vector>
+
+/*
+  SpilledOpenList keeps open nodes on disk for a best-first search whose
+  in-memory open list is bounded (e.g. the first phase of PEA*+IDA*).
+
+  The search spills the nodes with the largest f values of its in-memory
+  open list with spill(). Every call writes one run file whose records are
+  sorted by increasing f, decreasing g and decreasing depth, i.e. in the
+  order in which the search would expand them. When the smallest f value of
+  the in-memory open list is not smaller than get_min_big_f_value(), the
+  search reads back the spilled nodes of that f-layer with merge_layer().
+
+  The records only hold the StateID value of the state (which stays in the
+  state registry), so no duplicate detection happens on disk. The search
+  does it when a record is read back, by comparing the g value of the record
+  with the best g value of its state (delayed duplicate detection).
+
+  Run files are read sequentially through a buffer, so memory usage is
+  independent of the number of spilled nodes. When there are too many runs,
+  they are merged into a single one.
+*/
+
+namespace spilled_open_list {
+struct Record {
+    int state_id_value;
+    int g_value;
+    int big_f_value;
+    int depth;
+};
+
+class SpilledOpenList {
+    static const int MAX_NUM_RUNS = 32;
+
+    struct Run {
+        std::string filename;
+        std::ifstream file;
+        Record head;
+        bool has_head;
+
+        void read_head();
+    };
+
+    const std::string directory;
+    int num_created_runs;
+    std::vector<std::unique_ptr<Run>> runs;
+    long unsigned int num_records;
+
+    long unsigned int num_spilled_records;
+    long unsigned int num_merged_records;
+    long unsigned int num_bytes_written;
+    long unsigned int peak_num_records;
+
+    void write_run(std::vector<Record> &records);
+    void merge_all_runs();
+    void remove_exhausted_runs();
+
+public:
+    explicit SpilledOpenList(const std::string &directory);
+    ~SpilledOpenList();
+
+    // Write the given records, in any order, to a new run file.
+    void spill(std::vector<Record> &records);
+
+    bool empty() const;
+    long unsigned int size() const;
+    int get_min_big_f_value() const;
+
+    /*
+      Remove up to max_num_records records with the smallest f value from
+      disk and call function for each of them, in expansion order within
+      every run.
+    */
+    template<typename Function>
+    void merge_layer(Function function, long unsigned int max_num_records) {
+        int big_f_value = get_min_big_f_value();
+        long unsigned int num_merged_layer_records = 0;
+        for (const std::unique_ptr<Run> &run : runs) {
+            while (run->has_head && run->head.big_f_value == big_f_value &&
+                   num_merged_layer_records < max_num_records) {
+                ++num_merged_layer_records;
+                function(run->head);
+                --num_records;
+                ++num_merged_records;
+                run->read_head();
+            }
+        }
+        remove_exhausted_runs();
+    }
+
+    void print_statistics() const;
+};
+}
+
+#endif
@@ -0,0 +1,225 @@
+#include "structural_symmetries.h"
+
+#include "../algorithms/graph_automorphisms.h"
+#include "../task_utils/task_properties.h"
+#include "../utils/logging.h"
+#include "../utils/timer.h"
+
+#include <algorithm>
+#include <cassert>
+
+using namespace std;
+
+namespace structural_symmetries {
+// The automorphism search returns the generators found so far when it runs out of time.
+static const double MAX_AUTOMORPHISM_SEARCH_TIME = 60.0;
+
+enum VertexColour {
+    VARIABLE = 0,
+    FACT = 1,
+    GOAL_FACT = 2,
+    // Operators of the i-th smallest cost get the colour OPERATOR + i.
+    OPERATOR = 3
+};
+
+enum EdgeLabel {
+    VALUE = 0,
+    PRECONDITION = 1,
+    EFFECT = 2
+};
+
+void StructuralSymmetries::Permutation::apply(const vector<int> &state_values, vector<int> &permuted_state_values) const {
+    permuted_state_values.resize(state_values.size());
+    for (size_t var = 0; var < state_values.size(); ++var) {
+        permuted_state_values[variables[var]] = values[var][state_values[var]];
+    }
+}
+
+StructuralSymmetries::StructuralSymmetries(const TaskProxy &task_proxy)
+    : task_proxy(task_proxy),
+      num_canonicalizations(0),
+      num_mapped_states(0) {
+    task_properties::verify_no_axioms(task_proxy);
+    task_properties::verify_no_conditional_effects(task_proxy);
+    utils::Timer timer;
+
+    VariablesProxy variables = task_proxy.get_variables();
+    OperatorsProxy operators = task_proxy.get_operators();
+
+    vector<bool> goal_facts;
+    vector<int> fact_offsets;
+    int num_facts = 0;
+    for (VariableProxy var : variables) {
+        fact_offsets.push_back(variables.size() + num_facts);
+        num_facts += var.get_domain_size();
+    }
+    goal_facts.resize(num_facts, false);
+    for (FactProxy goal : task_proxy.get_goals()) {
+        goal_facts[fact_offsets[goal.get_variable().get_id()] - variables.size() + goal.get_value()] = true;
+    }
+    vector<int> costs;
+    for (OperatorProxy op : operators) {
+        costs.push_back(op.get_cost());
+    }
+    sort(costs.begin(), costs.end());
+    costs.erase(unique(costs.begin(), costs.end()), costs.end());
+
+    graph_automorphisms::Graph graph;
+    for (size_t var = 0; var < variables.size(); ++var) {
+        graph.add_vertex(VARIABLE);
+    }
+    for (VariableProxy var : variables) {
+        for (int value = 0; value < var.get_domain_size(); ++value) {
+            int fact_vertex = fact_offsets[var.get_id()] + value;
+            graph.add_vertex(goal_facts[fact_vertex - variables.size()] ? GOAL_FACT : FACT);
+            graph.add_edge(var.get_id(), fact_vertex, VALUE);
+        }
+    }
+    for (OperatorProxy op : operators) {
+        int cost_index = lower_bound(costs.begin(), costs.end(), op.get_cost()) - costs.begin();
+        int op_vertex = graph.add_vertex(OPERATOR + cost_index);
+        for (FactProxy pre : op.get_preconditions()) {
+            graph.add_edge(op_vertex, fact_offsets[pre.get_variable().get_id()] + pre.get_value(), PRECONDITION);
+        }
+        for (EffectProxy effect : op.get_effects()) {
+            FactProxy fact = effect.get_fact();
+            graph.add_edge(op_vertex, fact_offsets[fact.get_variable().get_id()] + fact.get_value(), EFFECT);
+        }
+    }
+
+    vector<vector<int>> vertex_permutations = graph.compute_generators(MAX_AUTOMORPHISM_SEARCH_TIME);
+    for (const vector<int> &vertex_permutation : vertex_permutations) {
+        Permutation generator;
+        bool is_identity = true;
+        for (VariableProxy var : variables) {
+            int var_id = var.get_id();
+            int permuted_var_id = vertex_permutation[var_id];
+            assert(permuted_var_id < static_cast<int>(variables.size()));
+            generator.variables.push_back(permuted_var_id);
+            generator.values.emplace_back();
+            for (int value = 0; value < var.get_domain_size(); ++value) {
+                int permuted_value = vertex_permutation[fact_offsets[var_id] + value] - fact_offsets[permuted_var_id];
+                generator.values.back().push_back(permuted_value);
+                if (permuted_var_id != var_id || permuted_value != value)
+                    is_identity = false;
+            }
+        }
+        // Generators that only permute operators (e.g. duplicate ones) do not map states.
+        if (!is_identity)
+            generators.push_back(move(generator));
+    }
+
+    utils::g_log << "Structural symmetries: " << generators.size() << " generators of "
+                 << graph.get_num_vertices() << " graph vertices, computed in " << timer << endl;
+}
+
+StructuralSymmetries::Permutation StructuralSymmetries::get_identity() const {
+    Permutation identity;
+    for (VariableProxy var : task_proxy.get_variables()) {
+        identity.variables.push_back(var.get_id());
+        identity.values.emplace_back(var.get_domain_size());
+        for (int value = 0; value < var.get_domain_size(); ++value) {
+            identity.values.back()[value] = value;
+        }
+    }
+    return identity;
+}
+
+StructuralSymmetries::Permutation StructuralSymmetries::compose(const Permutation &outer, const Permutation &inner) const {
+    Permutation composition;
+    for (size_t var = 0; var < inner.variables.size(); ++var) {
+        int inner_var = inner.variables[var];
+        composition.variables.push_back(outer.variables[inner_var]);
+        composition.values.emplace_back();
+        for (int inner_value : inner.values[var]) {
+            composition.values.back().push_back(outer.values[inner_var][inner_value]);
+        }
+    }
+    return composition;
+}
+
+StructuralSymmetries::Permutation StructuralSymmetries::invert(const Permutation &permutation) const {
+    Permutation inverse = get_identity();
+    for (size_t var = 0; var < permutation.variables.size(); ++var) {
+        int permuted_var = permutation.variables[var];
+        inverse.variables[permuted_var] = var;
+        for (size_t value = 0; value < permutation.values[var].size(); ++value) {
+            inverse.values[permuted_var][permutation.values[var][value]] = value;
+        }
+    }
+    return inverse;
+}
+
+void StructuralSymmetries::canonicalize(vector<int> &state_values, Permutation *applied_permutation) {
+    ++num_canonicalizations;
+    bool mapped = false;
+    bool changed = true;
+    while (changed) {
+        changed = false;
+        for (const Permutation &generator : generators) {
+            generator.apply(state_values, permuted_values);
+            if (permuted_values < state_values) {
+                state_values.swap(permuted_values);
+                if (applied_permutation)
+                    *applied_permutation = compose(generator, *applied_permutation);
+                mapped = true;
+                changed = true;
+            }
+        }
+    }
+    if (mapped)
+        ++num_mapped_states;
+}
+
+void StructuralSymmetries::canonicalize(vector<int> &state_values) {
+    canonicalize(state_values, nullptr);
+}
+
+State StructuralSymmetries::reconstruct_plan(const vector<State> &path_states, vector<OperatorID> &plan) {
+    assert(path_states.size() == plan.size() + 1);
+    OperatorsProxy operators = task_proxy.get_operators();
+    State current_state = path_states[0];
+    current_state.unpack();
+    // Maps the current state to the stored state at the same position of the path.
+    Permutation current_to_stored = get_identity();
+    for (size_t i = 0; i < plan.size(); ++i) {
+        OperatorProxy stored_op = operators[plan[i]];
+        path_states[i].unpack();
+        State stored_successor = path_states[i].get_unregistered_successor(stored_op);
+        vector<int> successor_values = stored_successor.get_unpacked_values();
+        Permutation successor_to_stored = get_identity();
+        path_states[i + 1].unpack();
+        if (successor_values != path_states[i + 1].get_unpacked_values()) {
+            canonicalize(successor_values, &successor_to_stored);
+            assert(successor_values == path_states[i + 1].get_unpacked_values());
+        }
+
+        vector<int> target_values;
+        invert(current_to_stored).apply(stored_successor.get_unpacked_values(), target_values);
+        bool found = false;
+        for (OperatorProxy op : operators) {
+            if (op.get_cost() != stored_op.get_cost() || !task_properties::is_applicable(op, current_state))
+                continue;
+            State successor = current_state.get_unregistered_successor(op);
+            if (successor.get_unpacked_values() == target_values) {
+                plan[i] = OperatorID(op.get_id());
+                current_state = move(successor);
+                found = true;
+                break;
+            }
+        }
+        assert(found);
+        utils::unused_variable(found);
+        current_to_stored = compose(successor_to_stored, current_to_stored);
+    }
+    return current_state;
+}
+
+void StructuralSymmetries::print_statistics() const {
+    utils::g_log << "Symmetry generators: " << generators.size() << endl;
+    utils::g_log << "Symmetry canonicalizations: " << num_canonicalizations << endl;
+    utils::g_log << "States mapped to another orbit representative: " << num_mapped_states << endl;
+    utils::g_log << "Orbit reduction ratio: "
+                 << (num_canonicalizations ? double(num_mapped_states) / double(num_canonicalizations) : 0) << endl;
+}
+}
@@ -0,0 +1,80 @@
+#ifndef SEARCH_ENGINES_STRUCTURAL_SYMMETRIES_H
+#define SEARCH_ENGINES_STRUCTURAL_SYMMETRIES_H
+
+#include "../operator_id.h"
+#include "../task_proxy.h"
+
+#include <vector>
+
+/*
+  StructuralSymmetries are state space symmetries of a task without axioms
+  and conditional effects, derived from the automorphisms of its problem
+  description graph (Shleyfman et al., AAAI 2015).
+
+  The graph has a vertex for each variable, fact and operator. Facts are
+  connected to their variables, and operators to the facts of their
+  preconditions and effects by edges of different labels. Goal facts and
+  operators of different costs get different colours, so an automorphism
+  maps goal states to goal states and operators to operators of the same
+  cost. Its restriction to the facts maps every state to a symmetric state
+  with the same goal distance.
+
+  For orbit search, states are replaced by representatives of their
+  orbits. The representative of a state is found by applying generators
+  as long as one of them makes the state lexicographically smaller. This
+  is not a canonical form (two symmetric states may get different
+  representatives), so only part of the orbit reduction is achieved, but
+  a state is only ever mapped to a symmetric one.
+*/
+
+namespace structural_symmetries {
+class StructuralSymmetries {
+    // A permutation of the facts: the fact (var, value) is mapped to (variables[var], values[var][value]).
+    struct Permutation {
+        std::vector<int> variables;
+        std::vector<std::vector<int>> values;
+
+        void apply(const std::vector<int> &state_values, std::vector<int> &permuted_state_values) const;
+    };
+
+    TaskProxy task_proxy;
+    std::vector<Permutation> generators;
+    std::vector<int> permuted_values;
+
+    long unsigned int num_canonicalizations;
+    long unsigned int num_mapped_states;
+
+    Permutation get_identity() const;
+    Permutation compose(const Permutation &outer, const Permutation &inner) const;
+    Permutation invert(const Permutation &permutation) const;
+    void canonicalize(std::vector<int> &state_values, Permutation *applied_permutation);
+
+public:
+    explicit StructuralSymmetries(const TaskProxy &task_proxy);
+
+    bool has_symmetries() const {
+        return !generators.empty();
+    }
+
+    /*
+      Replace the values of a state by those of the representative of its
+      orbit.
+    */
+    void canonicalize(std::vector<int> &state_values);
+
+    /*
+      Rebuild the plan of an orbit search. path_states holds the stored
+      states along the path, starting with the initial state, and plan the
+      stored operators between them: the operator plan[i] leads from
+      path_states[i] to a state whose representative is path_states[i + 1],
+      or to path_states[i + 1] itself. The operators of plan are replaced
+      by operators that lead from the initial state along states symmetric
+      to the stored ones. Return the last of these states.
+    */
+    State reconstruct_plan(const std::vector<State> &path_states, std::vector<OperatorID> &plan);
+
+    void print_statistics() const;
+};
+}
+
+#endif
@@ -0,0 +1,77 @@
+#include "transposition_table.h"
+
+#include "../utils/logging.h"
+
+#include <cassert>
+
+using namespace std;
+
+namespace transposition_table {
+TranspositionTable::TranspositionTable(size_t memory_budget_in_bytes)
+    : current_iteration(0),
+      num_hits(0),
+      num_misses(0),
+      num_evictions(0) {
+    size_t num_buckets = 1;
+    while (2 * num_buckets * BUCKET_SIZE * sizeof(Entry) <= memory_budget_in_bytes)
+        num_buckets *= 2;
+    entries.resize(num_buckets * BUCKET_SIZE);
+    bucket_mask = num_buckets - 1;
+}
+
+void TranspositionTable::start_iteration() {
+    ++current_iteration;
+}
+
+bool TranspositionTable::check_and_store(uint64_t key, int g_value, int depth) {
+    Entry *bucket = &entries[(key & bucket_mask) * BUCKET_SIZE];
+
+    for (int i = 0; i < BUCKET_SIZE; ++i) {
+        Entry &entry = bucket[i];
+        if (entry.iteration == current_iteration && entry.key == key) {
+            if (entry.g_value <= g_value) {
+                ++num_hits;
+                return true;
+            }
+            entry.g_value = g_value;
+            entry.depth = depth;
+            ++num_misses;
+            return false;
+        }
+    }
+    ++num_misses;
+
+    Entry *victim = nullptr;
+    for (int i = 0; i < BUCKET_SIZE; ++i) {
+        if (bucket[i].iteration != current_iteration) {
+            victim = &bucket[i];
+            break;
+        }
+        if (bucket[i].depth >= depth && (!victim || bucket[i].depth > victim->depth))
+            victim = &bucket[i];
+    }
+    if (!victim)
+        // All entries of the bucket root larger subtrees than the new one.
+        return false;
+    if (victim->iteration == current_iteration)
+        ++num_evictions;
+
+    victim->key = key;
+    victim->g_value = g_value;
+    victim->depth = depth;
+    victim->iteration = current_iteration;
+    return false;
+}
+
+size_t TranspositionTable::get_memory_usage_in_bytes() const {
+    return entries.capacity() * sizeof(Entry);
+}
+
+void TranspositionTable::print_statistics() const {
+    utils::g_log << "Transposition table hits: " << num_hits << endl;
+    utils::g_log << "Transposition table misses: " << num_misses << endl;
+    utils::g_log << "Transposition table evictions: " << num_evictions << endl;
+    utils::g_log << "Transposition table memory: "
+                 << get_memory_usage_in_bytes() / 1024 << " KB" << endl;
+}
+}
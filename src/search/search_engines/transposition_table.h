@@ -0,0 +1,65 @@
+#ifndef SEARCH_ENGINES_TRANSPOSITION_TABLE_H
+#define SEARCH_ENGINES_TRANSPOSITION_TABLE_H
+
+#include <cstdint>
+#include <vector>
+
+/*
+  TranspositionTable is a fixed-size table for depth-first searches with an
+  f-threshold (e.g. the second phase of PEA*+IDA*). It remembers the best g
+  value with which a state was reached during the current iteration, so that
+  subtrees below states reached again with an equal or worse g value can be
+  cut.
+
+  States are identified by 64-bit keys (e.g. StateID values or hashes of the
+  unpacked state values). The table is organized in buckets of two entries;
+  when both entries of a bucket are in use, an entry from an older iteration
+  is replaced first, otherwise the entry with the larger depth (which is
+  expected to root the smaller subtree) is evicted.
+
+  Entries from older iterations are never used for cutting, so no clearing is
+  needed between iterations: calling start_iteration() invalidates all of
+  them at once.
+*/
+
+namespace transposition_table {
+class TranspositionTable {
+    struct Entry {
+        std::uint64_t key;
+        int g_value;
+        int depth;
+        int iteration;
+
+        Entry()
+            : key(0), g_value(-1), depth(-1), iteration(-1) {
+        }
+    };
+
+    static const int BUCKET_SIZE = 2;
+
+    std::vector<Entry> entries;
+    std::uint64_t bucket_mask;
+    int current_iteration;
+
+    long unsigned int num_hits;
+    long unsigned int num_misses;
+    long unsigned int num_evictions;
+
+public:
+    explicit TranspositionTable(std::size_t memory_budget_in_bytes);
+
+    void start_iteration();
+
+    /*
+      Return true if the state with the given key was already reached with a
+      g value of at most g_value during the current iteration. Otherwise,
+      record g_value for the state and return false.
+    */
+    bool check_and_store(std::uint64_t key, int g_value, int depth);
+
+    std::size_t get_memory_usage_in_bytes() const;
+    void print_statistics() const;
+};
+}
+
+#endif
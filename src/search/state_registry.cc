@@ -82,7 +82,8 @@ State StateRegistry::get_successor_state(const State &predecessor, const Operato
             state_packer.set(buffer, i, new_values[i]);
         }
         StateID id = insert_id_or_pop_state();
-        return task_proxy.create_state(*this, id, buffer, move(new_values));
+        // The buffer is popped again if the successor was registered before.
+        return task_proxy.create_state(*this, id, state_data_pool[id.value], move(new_values));
     } else {
         for (EffectProxy effect : op.get_effects()) {
             if (does_fire(effect, predecessor)) {
@@ -91,10 +92,28 @@ State StateRegistry::get_successor_state(const State &predecessor, const Operato
             }
         }
         StateID id = insert_id_or_pop_state();
-        return task_proxy.create_state(*this, id, buffer);
+        return task_proxy.create_state(*this, id, state_data_pool[id.value]);
     }
 }
 
+State StateRegistry::insert_state(const vector<int> &values) {
+    assert(static_cast<int>(values.size()) == num_variables);
+    // Avoid garbage values in half-full bins.
+    packing_buffer.assign(get_bins_per_state(), 0);
+    for (int var = 0; var < num_variables; ++var) {
+        state_packer.set(packing_buffer.data(), var, values[var]);
+    }
+    state_data_pool.push_back(packing_buffer.data());
+    StateID id = insert_id_or_pop_state();
+    return lookup_state(id);
+}
+
+State StateRegistry::insert_packed_state(const PackedStateBin *buffer) {
+    state_data_pool.push_back(buffer);
+    StateID id = insert_id_or_pop_state();
+    return lookup_state(id);
+}
+
 int StateRegistry::get_bins_per_state() const {
     return state_packer.get_num_bins();
 }
@@ -103,6 +122,11 @@ int StateRegistry::get_state_size_in_bytes() const {
     return get_bins_per_state() * sizeof(PackedStateBin);
 }
 
+size_t StateRegistry::get_memory_usage_in_bytes() const {
+    return size() * get_state_size_in_bytes() +
+           registered_states.get_memory_usage_in_bytes();
+}
+
 void StateRegistry::print_statistics() const {
     utils::g_log << "Number of registered states: " << size() << endl;
     registered_states.print_statistics();
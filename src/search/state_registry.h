@@ -166,6 +166,7 @@ class StateRegistry : public subscriber::SubscriberService<StateRegistry> {
     StateIDSet registered_states;
 
     std::unique_ptr<State> cached_initial_state;
+    std::vector<PackedStateBin> packing_buffer;
 
     StateID insert_id_or_pop_state();
     int get_bins_per_state() const;
@@ -203,6 +204,19 @@ public:
     */
     State get_successor_state(const State &predecessor, const OperatorProxy &op);
 
+    /*
+      Returns the state with the given unpacked values and registers it if
+      this was not done before.
+    */
+    State insert_state(const std::vector<int> &values);
+
+    /*
+      Same as insert_state, but with the packed values of the state (e.g. as
+      returned by State::get_buffer() for a state of another registry of
+      the same task).
+    */
+    State insert_packed_state(const PackedStateBin *buffer);
+
     /*
       Returns the number of states registered so far.
     */
@@ -212,6 +226,12 @@ public:
 
     int get_state_size_in_bytes() const;
 
+    /*
+      Returns the number of bytes used by the packed states and the hash set
+      of registered states.
+    */
+    size_t get_memory_usage_in_bytes() const;
+
     void print_statistics() const;
 
     class const_iterator : public std::iterator<
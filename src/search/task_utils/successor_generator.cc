@@ -20,5 +20,10 @@ void SuccessorGenerator::generate_applicable_ops(
     root->generate_applicable_ops(state.get_unpacked_values(), applicable_ops);
 }
 
+void SuccessorGenerator::generate_applicable_ops(
+    const vector<int> &state_values, vector<OperatorID> &applicable_ops) const {
+    root->generate_applicable_ops(state_values, applicable_ops);
+}
+
 PerTaskInformation<SuccessorGenerator> g_successor_generators;
 }
@@ -27,6 +27,10 @@ public:
 
     void generate_applicable_ops(
         const State &state, std::vector<OperatorID> &applicable_ops) const;
+    // Like above, for the values of an unpacked state.
+    void generate_applicable_ops(
+        const std::vector<int> &state_values,
+        std::vector<OperatorID> &applicable_ops) const;
 };
 
 extern PerTaskInformation<SuccessorGenerator> g_successor_generators;
@@ -39,6 +39,10 @@
 #include <mach/mach.h>
 #endif
 
+#if defined(__GLIBC__)
+#include <malloc.h>
+#endif
+
 using namespace std;
 
 namespace utils {
@@ -249,6 +253,19 @@ void register_event_handlers() {
     sigaction(SIGXCPU, &default_signal_action, 0);
 }
 
+/*
+  glibc gives every thread that allocates its own malloc arena and reserves
+  64 MB of address space for each of them. The peak memory we report and the
+  memory limit of the driver both count address space, so with a few worker
+  threads, most of the measured memory would be untouched arena reservations.
+  Limiting glibc to one arena makes all threads allocate from the main heap.
+*/
+void share_heap_between_threads() {
+#if defined(__GLIBC__)
+    mallopt(M_ARENA_MAX, 1);
+#endif
+}
+
 void report_exit_code_reentrant(ExitCode exitcode) {
     const char *message = get_exit_code_message_reentrant(exitcode);
     bool is_error = is_exit_code_error_reentrant(exitcode);
@@ -57,6 +57,10 @@ void register_event_handlers() {
     // SIGXCPU is not supported on Windows.
 }
 
+void share_heap_between_threads() {
+    // Threads on Windows allocate from the process heap anyway.
+}
+
 void report_exit_code_reentrant(ExitCode exitcode) {
     const char *message = get_exit_code_message_reentrant(exitcode);
     bool is_error = is_exit_code_error_reentrant(exitcode);
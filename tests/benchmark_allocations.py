@@ -0,0 +1,135 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import List, Tuple
+from instance_analysis import test_error, get_relevant_info_data
+
+class bcolors:
+    OKGREEN = '\033[92m'
+    OKBLUE = '\033[94m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+# Counts the heap allocations of the search, i.e. between the log lines of the pruning method and the solution. Preloaded
+# into the planner, it interposes malloc, calloc and realloc, and watches the log through write, writev and fwrite.
+ALLOCATION_COUNTER_SOURCE = r'''
+#define _GNU_SOURCE
+#include <dlfcn.h>
+#include <stdio.h>
+#include <string.h>
+#include <sys/uio.h>
+#include <unistd.h>
+
+extern void *__libc_malloc(size_t);
+extern void *__libc_calloc(size_t, size_t);
+extern void *__libc_realloc(void *, size_t);
+
+static int counting = 0;
+static unsigned long allocations = 0;
+static ssize_t (*real_write)(int, const void *, size_t) = 0;
+
+void *malloc(size_t size) { allocations += counting; return __libc_malloc(size); }
+void *calloc(size_t n, size_t size) { allocations += counting; return __libc_calloc(n, size); }
+void *realloc(void *p, size_t size) { allocations += counting; return __libc_realloc(p, size); }
+
+static void watch(int fd, const void *buf, size_t count) {
+    if (!real_write)
+        real_write = (ssize_t (*)(int, const void *, size_t)) dlsym(RTLD_NEXT, "write");
+    if (!counting && memmem(buf, count, "pruning method:", 15))
+        counting = 1;
+    else if (counting && memmem(buf, count, "Solution found!", 15)) {
+        counting = 0;
+        char line[64];
+        int n = snprintf(line, sizeof(line), "Search allocations: %lu\n", allocations);
+        real_write(fd, line, n);
+    }
+}
+
+ssize_t write(int fd, const void *buf, size_t count) {
+    watch(fd, buf, count);
+    return real_write(fd, buf, count);
+}
+
+size_t fwrite(const void *buf, size_t size, size_t n, FILE *stream) {
+    static size_t (*real_fwrite)(const void *, size_t, size_t, FILE *) = 0;
+    if (!real_fwrite)
+        real_fwrite = (size_t (*)(const void *, size_t, size_t, FILE *)) dlsym(RTLD_NEXT, "fwrite");
+    watch(fileno(stream), buf, size * n);
+    return real_fwrite(buf, size, n, stream);
+}
+
+ssize_t writev(int fd, const struct iovec *iov, int iovcnt) {
+    static ssize_t (*real_writev)(int, const struct iovec *, int) = 0;
+    if (!real_writev)
+        real_writev = (ssize_t (*)(int, const struct iovec *, int)) dlsym(RTLD_NEXT, "writev");
+    for (int i = 0; i < iovcnt; ++i)
+        watch(fd, iov[i].iov_base, iov[i].iov_len);
+    return real_writev(fd, iov, iovcnt);
+}
+'''
+
+# Fixed instance set: (domain, domain_pddl, instance_pddl, open_limit), the same as in benchmark_expansion.py.
+instances = [
+    ('gripper', 'domain', 'prob03', '2000'),
+    ('blocks', 'domain', 'probBLOCKS-6-0', '500'),
+    ('logistics00', 'domain', 'probLOGISTICS-6-0', '2000'),
+    ('miconic', 'domain', 's4-0', '500'),
+    ('depot', 'domain', 'p01', '500'),
+    ('sokoban-opt08-strips', 'domain', 'p01', '5000'),
+]
+
+heuristic = sys.argv[1] if len(sys.argv) > 1 else 'lmcut'
+extra_args = sys.argv[2:]
+
+# The counter library and the SAS file are run artifacts, so they go to a directory that is removed on exit.
+scratch_directory = tempfile.TemporaryDirectory(prefix='benchmark_allocations_')
+
+def get_command_line_args(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str) -> List[str]:
+    command_line_args = []
+    command_line_args.append('python3')
+    command_line_args.append('./fast-downward.py')
+    command_line_args.append('--sas-file')
+    command_line_args.append(os.path.join(scratch_directory.name, 'benchmark_allocations.sas'))
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{domain_pddl}.pddl')
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{instance_pddl}.pddl')
+    command_line_args.append('--search')
+    command_line_args.append(f'pea_ida({heuristic}())')
+    command_line_args.append('--open-limit')
+    command_line_args.append(open_limit)
+    command_line_args.extend(extra_args)
+    return command_line_args
+
+def run(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str) -> Tuple[int, int, int]:
+    env = dict(os.environ, LD_PRELOAD=os.path.join(scratch_directory.name, 'count_allocations.so'))
+    stdout = subprocess.run(get_command_line_args(domain, domain_pddl, instance_pddl, open_limit), stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env).stdout.decode()
+    if not 'Solution found' in stdout:
+        raise RuntimeError(test_error(stdout) or 'No solution found')
+    allocations = int(re.search(r'Search allocations: (\d+)', stdout).group(1))
+    expansions = int(get_relevant_info_data(stdout, 'total_expansions'))
+    evaluations = int(re.search(r'Evaluated (\d+) state', stdout).group(1))
+    return allocations, expansions, evaluations
+
+with open(os.path.join(scratch_directory.name, 'count_allocations.c'), 'w') as source_file:
+    source_file.write(ALLOCATION_COUNTER_SOURCE)
+subprocess.run(['cc', '-O2', '-shared', '-fPIC', '-o', os.path.join(scratch_directory.name, 'count_allocations.so'), os.path.join(scratch_directory.name, 'count_allocations.c'), '-ldl'], check=True)
+
+allocations_per_expansion: List[float] = []
+
+for domain, domain_pddl, instance_pddl, open_limit in instances:
+    line = f'{domain}/{instance_pddl}:'
+    try:
+        allocations, expansions, evaluations = run(domain, domain_pddl, instance_pddl, open_limit)
+    except RuntimeError as e:
+        print(f'{line} {bcolors.FAIL}{e}{bcolors.ENDC}')
+        continue
+    allocations_per_expansion.append(allocations / max(expansions, 1))
+    # The evaluators allocate on their own for every evaluation, so the evaluations are printed alongside.
+    line += f' {bcolors.OKBLUE}{allocations / max(expansions, 1):.2f}{bcolors.ENDC} allocations/expansion'
+    line += f' ({allocations} allocations, {expansions} expansions, {evaluations} evaluations)'
+    print(line)
+
+if len(allocations_per_expansion) > 0:
+    print(f'{bcolors.OKGREEN}Allocations per expansion{bcolors.ENDC}: mean {sum(allocations_per_expansion) / len(allocations_per_expansion):.2f}, min {min(allocations_per_expansion):.2f}, max {max(allocations_per_expansion):.2f}')
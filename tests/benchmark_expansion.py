@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+from instance_analysis import test_error, get_relevant_info_data
+
+class bcolors:
+    OKGREEN = '\033[92m'
+    OKBLUE = '\033[94m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+# Fixed instance set: (domain, domain_pddl, instance_pddl, open_limit). The open limits are small enough
+# for every instance to go through both phases of PEA*+IDA*.
+instances = [
+    ('gripper', 'domain', 'prob03', '2000'),
+    ('blocks', 'domain', 'probBLOCKS-6-0', '500'),
+    ('logistics00', 'domain', 'probLOGISTICS-6-0', '2000'),
+    ('miconic', 'domain', 's4-0', '500'),
+    ('depot', 'domain', 'p01', '500'),
+    ('sokoban-opt08-strips', 'domain', 'p01', '5000'),
+]
+
+modes = {
+    'stepping': [],
+    'whole-node': ['--whole-node-expansion'],
+}
+
+heuristic = sys.argv[1] if len(sys.argv) > 1 else 'lmcut'
+repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+# The SAS file is a run artifact, so it goes to a directory that is removed on exit.
+scratch_directory = tempfile.TemporaryDirectory(prefix='benchmark_expansion_')
+
+def get_command_line_args(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str, mode_args: List[str]) -> List[str]:
+    command_line_args = []
+    command_line_args.append('python3')
+    command_line_args.append('./fast-downward.py')
+    command_line_args.append('--sas-file')
+    command_line_args.append(os.path.join(scratch_directory.name, 'benchmark_expansion.sas'))
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{domain_pddl}.pddl')
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{instance_pddl}.pddl')
+    command_line_args.append('--search')
+    command_line_args.append(f'pea_ida({heuristic}())')
+    command_line_args.append('--open-limit')
+    command_line_args.append(open_limit)
+    command_line_args.extend(mode_args)
+    return command_line_args
+
+def run(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str, mode_args: List[str]) -> Tuple[int, float]:
+    stdout = subprocess.run(get_command_line_args(domain, domain_pddl, instance_pddl, open_limit, mode_args), stdout=subprocess.PIPE, stderr=subprocess.PIPE).stdout.decode()
+    if not 'Solution found' in stdout:
+        raise RuntimeError(test_error(stdout) or 'No solution found')
+    expansions = int(get_relevant_info_data(stdout, 'total_expansions'))
+    search_time = float(get_relevant_info_data(stdout, 'search_time')[:-1])
+    return expansions, search_time
+
+nodes_per_second: Dict[str, List[float]] = {mode: [] for mode in modes}
+
+for domain, domain_pddl, instance_pddl, open_limit in instances:
+    line = f'{domain}/{instance_pddl}:'
+    for mode, mode_args in modes.items():
+        try:
+            results = [run(domain, domain_pddl, instance_pddl, open_limit, mode_args) for _ in range(repetitions)]
+        except RuntimeError as e:
+            line += f' {mode} {bcolors.FAIL}{e}{bcolors.ENDC}'
+            continue
+        expansions = results[0][0]
+        best_search_time = max(min(search_time for _, search_time in results), 1e-3)
+        nodes_per_second[mode].append(expansions / best_search_time)
+        line += f' {mode} {bcolors.OKBLUE}{expansions / best_search_time:.0f}{bcolors.ENDC} nodes/s ({expansions} expansions, {best_search_time}s)'
+    print(line)
+
+for mode in modes:
+    if len(nodes_per_second[mode]) == 0:
+        continue
+    print(f'{bcolors.BOLD}{mode}{bcolors.ENDC}: mean {sum(nodes_per_second[mode]) / len(nodes_per_second[mode]):.0f} nodes/s over {len(nodes_per_second[mode])} instances')
+
+if len(nodes_per_second['stepping']) == len(nodes_per_second['whole-node']) and len(nodes_per_second['stepping']) > 0:
+    speedups = [whole_node / stepping for stepping, whole_node in zip(nodes_per_second['stepping'], nodes_per_second['whole-node'])]
+    print(f'{bcolors.OKGREEN}Whole-node expansion speedup{bcolors.ENDC}: mean {sum(speedups) / len(speedups):.2f}x, min {min(speedups):.2f}x, max {max(speedups):.2f}x')
@@ -0,0 +1,84 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+from instance_analysis import test_error, get_relevant_info_data
+
+class bcolors:
+    OKGREEN = '\033[92m'
+    OKBLUE = '\033[94m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+# Fixed instance set: (domain, domain_pddl, instance_pddl, open_limit). The open limits are small enough
+# for every instance to go through both phases of PEA*+IDA*.
+instances = [
+    ('gripper', 'domain', 'prob03', '2000'),
+    ('blocks', 'domain', 'probBLOCKS-6-0', '500'),
+    ('logistics00', 'domain', 'probLOGISTICS-6-0', '2000'),
+    ('miconic', 'domain', 's4-0', '500'),
+    ('depot', 'domain', 'p01', '500'),
+    ('sokoban-opt08-strips', 'domain', 'p01', '5000'),
+]
+
+heuristic = sys.argv[1] if len(sys.argv) > 1 else 'lmcut'
+repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+thread_counts = [int(thread_count) for thread_count in sys.argv[3].split(',')] if len(sys.argv) > 3 else [1, 2, 4, 8, 12]
+
+# The SAS file is a run artifact, so it goes to a directory that is removed on exit.
+scratch_directory = tempfile.TemporaryDirectory(prefix='benchmark_second_phase_threads_')
+
+# The sequential baseline is the transient second phase, which also never registers second-phase states.
+modes = {thread_count: ['--transient-second-phase'] if thread_count == 1 else ['--second-phase-threads', str(thread_count)] for thread_count in thread_counts}
+
+def get_command_line_args(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str, mode_args: List[str]) -> List[str]:
+    command_line_args = []
+    command_line_args.append('python3')
+    command_line_args.append('./fast-downward.py')
+    command_line_args.append('--sas-file')
+    command_line_args.append(os.path.join(scratch_directory.name, 'benchmark_second_phase_threads.sas'))
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{domain_pddl}.pddl')
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{instance_pddl}.pddl')
+    command_line_args.append('--search')
+    command_line_args.append(f'pea_ida({heuristic}())')
+    command_line_args.append('--open-limit')
+    command_line_args.append(open_limit)
+    command_line_args.extend(mode_args)
+    return command_line_args
+
+def run(domain: str, domain_pddl: str, instance_pddl: str, open_limit: str, mode_args: List[str]) -> Tuple[int, float, int]:
+    stdout = subprocess.run(get_command_line_args(domain, domain_pddl, instance_pddl, open_limit, mode_args), stdout=subprocess.PIPE, stderr=subprocess.PIPE).stdout.decode()
+    if not 'Solution found' in stdout:
+        raise RuntimeError(test_error(stdout) or 'No solution found')
+    expansions = int(get_relevant_info_data(stdout, 'total_expansions'))
+    search_time = float(get_relevant_info_data(stdout, 'search_time')[:-1])
+    peak_memory = int(re.search(r'Peak memory: (\d+) KB', stdout).group(1))
+    return expansions, search_time, peak_memory
+
+search_times: Dict[int, List[float]] = {mode: [] for mode in modes}
+
+for domain, domain_pddl, instance_pddl, open_limit in instances:
+    line = f'{domain}/{instance_pddl}:'
+    for mode, mode_args in modes.items():
+        try:
+            results = [run(domain, domain_pddl, instance_pddl, open_limit, mode_args) for _ in range(repetitions)]
+        except RuntimeError as e:
+            line += f' {mode} {bcolors.FAIL}{e}{bcolors.ENDC}'
+            continue
+        expansions = results[0][0]
+        best_search_time = max(min(search_time for _, search_time, _ in results), 1e-3)
+        # Every worker thread reserves a stack, so the peak memory grows with the thread count.
+        peak_memory = max(peak_memory for _, _, peak_memory in results)
+        search_times[mode].append(best_search_time)
+        line += f' {mode} threads {bcolors.OKBLUE}{best_search_time}s{bcolors.ENDC} ({expansions} expansions, {peak_memory} KB)'
+    print(line)
+
+# Speedups and efficiencies are only comparable over the instances solved with every thread count.
+if all(len(search_times[mode]) == len(instances) for mode in modes) and 1 in modes:
+    for mode in modes:
+        speedups = [sequential / parallel for sequential, parallel in zip(search_times[1], search_times[mode])]
+        mean_speedup = sum(speedups) / len(speedups)
+        print(f'{bcolors.BOLD}{mode} threads{bcolors.ENDC}: mean speedup {bcolors.OKGREEN}{mean_speedup:.2f}x{bcolors.ENDC}, scaling efficiency {mean_speedup / mode:.2f}')
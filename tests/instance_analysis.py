@@ -1,3 +1,5 @@
+import json
+
 def test_error(data):
     if data == None:
         return 'Test not found'
@@ -30,6 +32,13 @@ def test_error(data):
     if 'FileNotFoundError' in data:
         return 'Some file not found'
 
+def get_phase_transition_records(raw_data):
+    if raw_data == None:
+        return []
+
+    keyword = 'Phase transition record:'
+    return [json.loads(line.split(keyword)[1]) for line in raw_data.split('\n') if keyword in line]
+
 def get_relevant_info_data(raw_data, relevant_info_data):
     if raw_data == None:
         return
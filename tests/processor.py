@@ -1,6 +1,8 @@
 import os
 import json
 
+from instance_analysis import get_phase_transition_records
+
 trigger_keywords = {
                 'solution_cost': 'Plan cost:',
                 'solution_length': 'Plan length:',
@@ -11,7 +13,31 @@ trigger_keywords = {
                 'total_generations': 'Generated',
                 'first_phase_generations': 'Number of first phase generations:',
                 'second_phase_generations': 'Number of second phase generations:',
+                'first_phase_evaluations': 'Number of first phase evaluations:',
+                'second_phase_evaluations': 'Number of second phase evaluations:',
+                'first_phase_evaluations_per_expansion': 'First phase evaluations per expansion:',
+                'second_phase_evaluations_per_expansion': 'Second phase evaluations per expansion:',
+                'deferred_evaluations': 'Number of deferred evaluations:',
+                'saved_evaluations': 'Number of saved evaluations:',
+                'solution_time': 'Time to solution:',
+                'osf_deferred_successors': 'Number of successors deferred by the operator selection function:',
+                'first_phase_pruning_ratio': 'First phase pruning ratio:',
+                'second_phase_pruning_ratio': 'Second phase pruning ratio:',
+                'first_phase_pruning_time': 'First phase pruning time:',
+                'second_phase_pruning_time': 'Second phase pruning time:',
                 'second_phase_iterations': 'Number of second phase iterations:',
+                'grown_thresholds': 'Number of second phase iterations with a grown threshold:',
+                'bounded_sweeps': 'Number of second phase bounded sweeps:',
+                'second_phase_reexpansion_ratio': 'Second phase re-expansion ratio:',
+                'goal_perimeter_radius': 'Goal perimeter radius:',
+                'goal_perimeter_hits': 'Goal perimeter hits:',
+                'dead_end_memo_hit_rate': 'Dead-end memo hit rate:',
+                'dead_end_memo_memory': 'Dead-end memo memory:',
+                'frontier_prunings': 'Number of frontier prunings:',
+                'forgotten_nodes': 'Number of forgotten nodes:',
+                'reopened_predecessors': 'Number of reopened predecessors:',
+                'symmetry_generators': 'Symmetry generators:',
+                'orbit_reduction_ratio': 'Orbit reduction ratio:',
                 'open_peak_size': 'Open peak size:',
                 'closed_peak_size': 'Closed peak size:',
                 'min_f_at_phase_change' : 'Mininum F-value at phase transition:',
@@ -35,11 +61,12 @@ for folder in os.listdir(f'./tests/results/'):
         # kwargs = {information: '?' for information in trigger_keywords.keys()} | json.loads(open(f'./tests/results/{folder}/{instance}.json').read())
         kwargs = {information: '?' for information in trigger_keywords.keys()}
         kwargs.update(json.loads(open(f'./tests/results/{folder}/{instance}.json').read()))
+        kwargs['phase_transitions'] = get_phase_transition_records(data)
         for line in data.split('\n'):
             for information, keyword in trigger_keywords.items():
                 if keyword in line:
                     value = line.split(keyword)[1].split(' ')[1]
-                    if information == 'search_time':
+                    if information.endswith('_time'):
                         value = value[:-1]
                     kwargs[information] = value
         open(output_path, 'w').write(json.dumps(kwargs, indent=4, sort_keys=True))
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional
+from instance_analysis import test_error, get_relevant_info_data
+
+class bcolors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+# Fixed regression cases: (description, domain, domain_pddl, instance_pddl, search_args, plan_cost, time_limit_seconds, required_output).
+# Every case has to finish within its time limit and the memory limit with a plan of the given (optimal) cost, and print
+# the required output if there is one.
+cases = [
+    ('perimeter budget smaller than its first layer', 'elevators-opt08-strips', 'domain', 'p01', ['--perimeter-memory', '10k'], '42', 60, None),
+    ('frontier pruning with operators of cost 0', 'elevators-opt08-strips', 'domain', 'p01', ['--frontier-pruning', '--partial-expansion', '--open-limit', '200'], '42', 60, None),
+    ('partially expanded nodes as second-phase roots', 'gripper', 'domain', 'prob03', ['--enhanced-partial-expansion', '--open-limit', '2000'], '23', 60, None),
+    # Second-phase iterations close their roots in pegsol, whose subtrees are finite, so the open queue shrinks.
+    ('return to best-first expansion below the open size', 'pegsol-08-strips', 'domain', 'p10', ['--open-limit', '1000', '--low-water-mark', '0.995'], '6', 60, 'Resuming best-first expansion'),
+    ('return to best-first expansion under a memory budget', 'pegsol-08-strips', 'domain', 'p15', ['--open-memory-budget', '100k', '--low-water-mark', '0.999'], '8', 60, 'Resuming best-first expansion'),
+]
+
+heuristic = sys.argv[1] if len(sys.argv) > 1 else 'lmcut'
+memory_limit = '2G'
+
+# The SAS files are run artifacts, so they go to a directory that is removed on exit.
+scratch_directory = tempfile.TemporaryDirectory(prefix='regression_tests_')
+
+def get_command_line_args(domain: str, domain_pddl: str, instance_pddl: str, search_args: List[str], time_limit_seconds: int) -> List[str]:
+    command_line_args = []
+    command_line_args.append('python3')
+    command_line_args.append('./fast-downward.py')
+    command_line_args.append('--overall-memory-limit')
+    command_line_args.append(memory_limit)
+    command_line_args.append('--search-time-limit')
+    command_line_args.append(f'{time_limit_seconds}s')
+    command_line_args.append('--sas-file')
+    command_line_args.append(os.path.join(scratch_directory.name, f'{domain}_{instance_pddl}.sas'))
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{domain_pddl}.pddl')
+    command_line_args.append(f'./instances/FD-IPC-opt-strips/{domain}/{instance_pddl}.pddl')
+    command_line_args.append('--search')
+    command_line_args.append(f'pea_ida({heuristic}())')
+    command_line_args.extend(search_args)
+    return command_line_args
+
+def run(domain: str, domain_pddl: str, instance_pddl: str, search_args: List[str], plan_cost: str, time_limit_seconds: int, required_output: Optional[str]) -> Optional[str]:
+    process = subprocess.run(get_command_line_args(domain, domain_pddl, instance_pddl, search_args, time_limit_seconds), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout = process.stdout.decode()
+    if not 'Solution found' in stdout or process.returncode != 0:
+        return test_error(stdout) or f'no solution found (exit code {process.returncode})'
+    if get_relevant_info_data(stdout, 'solution_cost') != plan_cost:
+        return f'plan cost {get_relevant_info_data(stdout, "solution_cost")} instead of {plan_cost}'
+    if required_output and not required_output in stdout:
+        return f'missing output "{required_output}"'
+    return None
+
+failures = 0
+
+for description, domain, domain_pddl, instance_pddl, search_args, plan_cost, time_limit_seconds, required_output in cases:
+    line = f'{domain}/{instance_pddl} {" ".join(search_args)} ({description}):'
+    error = run(domain, domain_pddl, instance_pddl, search_args, plan_cost, time_limit_seconds, required_output)
+    if error:
+        failures += 1
+        line += f' {bcolors.FAIL}{error}{bcolors.ENDC}'
+    else:
+        line += f' {bcolors.OKGREEN}ok{bcolors.ENDC}'
+    print(line)
+
+print(f'{bcolors.BOLD}{len(cases) - failures} of {len(cases)} regression cases passed{bcolors.ENDC}')
+sys.exit(1 if failures else 0)
@@ -1,5 +1,6 @@
 import os
 import subprocess
+import sys
 import time
 import datetime
 import copy
@@ -57,18 +58,34 @@ def get_command_line_args(kwargs: Dict[str, Union[str, int, bool]]) -> List[str]
     if 'open_limit' in kwargs.keys():
         command_line_args.append(f'--open-limit')
         command_line_args.append(kwargs['open_limit'])
+    if 'open_memory_budget' in kwargs.keys():
+        command_line_args.append(f'--open-memory-budget')
+        command_line_args.append(kwargs['open_memory_budget'])
     if 'is_using_partial_expansion' in kwargs.keys():
         command_line_args.append(f'--partial-expansion')
+    if 'is_using_frontier_pruning' in kwargs.keys():
+        command_line_args.append(f'--frontier-pruning')
+    if 'is_using_symmetry_pruning' in kwargs.keys():
+        command_line_args.append(f'--symmetry-pruning')
+    if 'is_spilling' in kwargs.keys():
+        command_line_args.append(f'--spill-directory')
+        command_line_args.append(f'./tests/trash')
     if 'second_phase_lower_bound' in kwargs.keys():
         command_line_args.append(f'--second-phase-lower-bound')
         command_line_args.append(kwargs['second_phase_lower_bound'])
+    if 'checkpoint' in kwargs.keys():
+        command_line_args.append(f'--checkpoint')
+        command_line_args.append(kwargs['checkpoint'])
+        if os.path.exists(kwargs['checkpoint']):
+            command_line_args.append(f'--resume')
+            command_line_args.append(kwargs['checkpoint'])
 
     return command_line_args
 
 def get_command_line(kwargs: Dict[str, Union[str, int, bool]]) -> str:
     return subprocess.list2cmdline(get_command_line_args(kwargs))
 
-def run_test(kwargs: Dict[str, Union[str, int, bool]]) -> Tuple[str, str, float]:
+def run_test(kwargs: Dict[str, Union[str, int, bool]]) -> Tuple[str, str, float, int]:
     process = subprocess.Popen(get_command_line_args(kwargs), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
     print(f'{bcolors.OKGREEN}Starting...{bcolors.ENDC} {get_command_line(kwargs)}')
@@ -86,7 +103,7 @@ def run_test(kwargs: Dict[str, Union[str, int, bool]]) -> Tuple[str, str, float]
 
     print(f'{bcolors.OKBLUE}Finishing...{bcolors.ENDC} {get_command_line(kwargs)} {get_relevant_info_data(stdout.decode(), "solution_cost") or (test_error(stdout.decode()) or f"{bcolors.FAIL}?{bcolors.ENDC}")} {get_relevant_info_data(stdout.decode(), "total_expansions") or (test_error(stdout.decode()) or f"{bcolors.FAIL}?{bcolors.ENDC}")}')
 
-    return stdout.decode(), stderr.decode(), (finish_time - start_time)
+    return stdout.decode(), stderr.decode(), (finish_time - start_time), process.returncode
 
 def print_remaining_time() -> None:
     global lock, start_time, done, prunned, threads
@@ -112,7 +129,8 @@ def run_thread(kwargs: Dict[str, Union[str, int, bool]]) -> None:
     filepath_out = f'./tests/results/{pack}/{kwargs["domain"]}_{kwargs["instance_pddl"]}.out'
     filepath_err = f'./tests/results/{pack}/{kwargs["domain"]}_{kwargs["instance_pddl"]}.err'
 
-    if prune and os.path.exists(filepath_out):
+    is_resumable = 'checkpoint' in kwargs.keys() and os.path.exists(kwargs['checkpoint'])
+    if prune and os.path.exists(filepath_out) and not is_resumable:
         is_disabled_pruning_for_this_experiment = False
         if not is_disabled_pruning_for_this_experiment:
             print(f'{bcolors.OKCYAN}Prunning...{bcolors.ENDC} {get_command_line(kwargs)}')
@@ -124,11 +142,16 @@ def run_thread(kwargs: Dict[str, Union[str, int, bool]]) -> None:
 
     semaphore.acquire()
 
-    stdout, stderr, elapsed_time = run_test(kwargs)
+    stdout, stderr, elapsed_time, returncode = run_test(kwargs)
 
     open(filepath_json, 'w').write(json.dumps(kwargs, indent=4, sort_keys=True))
     open(filepath_out, 'w').write(stdout)
     open(filepath_err, 'w').write(stderr)
+    # Every exit code of the driver, including those of the time and memory limits, is below 128; a run killed by a signal
+    # exits with a negative code (or 256 minus the signal number, if the signal killed the search), and only such a run is resumed.
+    is_killed = returncode < 0 or returncode >= 128
+    if not is_killed and 'checkpoint' in kwargs.keys() and os.path.exists(kwargs['checkpoint']):
+        os.remove(kwargs['checkpoint'])
 
     lock.acquire()
     done.append('thread')
@@ -140,10 +163,9 @@ def run_thread(kwargs: Dict[str, Union[str, int, bool]]) -> None:
 def run_threads() -> None:
     global start_time, threads
 
-    import sys
-    exindex = int(sys.argv[1]) if len(sys.argv) > 1 else 0
-    excount = int(sys.argv[2]) if len(sys.argv) > 1 else 1
-    limit = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    exindex = int(positional_args[1]) if len(positional_args) > 1 else 0
+    excount = int(positional_args[2]) if len(positional_args) > 1 else 1
+    limit = int(positional_args[3]) if len(positional_args) > 3 else None
 
     threads = [thread for i, thread in enumerate(threads) if i % excount == exindex][:limit]
     shuffle(threads)
@@ -171,6 +193,9 @@ def add_threads(common_kwargs: Dict[str, Union[str, int, bool]]) -> None:
         os.mkdir(f'./tests/results/{pack}')
         open(f'./tests/results/{pack}/_config.json', 'w').write(json.dumps(common_kwargs, indent=4, sort_keys=True))
 
+    if not os.path.exists(f'./tests/checkpoints/{pack}'):
+        os.makedirs(f'./tests/checkpoints/{pack}')
+
     for domain in os.listdir(f'./instances/{common_kwargs["suite"]}'):
         domain_pddls = list(sorted([x[:-5] for x in os.listdir(f'./instances/{common_kwargs["suite"]}/{domain}') if 'domain' in x and x.endswith('.pddl')]))
         instances_pddls = list(sorted([x[:-5] for x in os.listdir(f'./instances/{common_kwargs["suite"]}/{domain}') if not 'domain' in x and x.endswith('.pddl')]))
@@ -206,9 +231,25 @@ def add_threads(common_kwargs: Dict[str, Union[str, int, bool]]) -> None:
                 else:
                     kwargs['heuristic_call'] = kwargs['heuristic'] + '()'
 
-                if 'pe' in kwargs['algorithm']:
+                # The algorithm name is a list of options separated by '-', so that no option is a substring of another one.
+                algorithm_tokens = kwargs['algorithm'].split('-')
+
+                if 'pe' in algorithm_tokens:
                     kwargs['is_using_partial_expansion'] = True
 
+                if 'sma' in algorithm_tokens:
+                    kwargs['is_using_frontier_pruning'] = True
+
+                if 'sym' in algorithm_tokens:
+                    kwargs['is_using_symmetry_pruning'] = True
+
+                # Long runs write checkpoints, so that a crashed or killed run continues where it stopped when the tests are run again.
+                if kwargs['time_limit_seconds'] >= 60 * 60:
+                    kwargs['checkpoint'] = f'./tests/checkpoints/{pack}/{domain}_{instance_pddl}.checkpoint'
+
+                if 'spill' in algorithm_tokens:
+                    kwargs['is_spilling'] = True
+
                 kwargs['algorithm_call'] = 'pea_ida'
 
                 if kwargs['open_limitness'] == 'unlimited' and kwargs['heuristic'] == 'blind':
@@ -222,7 +263,10 @@ def add_threads(common_kwargs: Dict[str, Union[str, int, bool]]) -> None:
                     else:
                         raise AssertionError
 
-                if kwargs['open_limitness'] != 'unlimited':
+                if kwargs['open_limitness'].startswith('budget'):
+                    # The engine switches phases by itself when its data structures reach the budget, so no A* calibration run is needed.
+                    kwargs['open_memory_budget'] = kwargs['open_limitness'].split('-')[1]
+                elif kwargs['open_limitness'] != 'unlimited':
                     astar_common_kwargs = copy.deepcopy(common_kwargs)
                     astar_common_kwargs['time_limit'] = '10m'
                     astar_common_kwargs['algorithm'] = 'edd-eh'
@@ -283,6 +327,11 @@ if not os.path.exists(f'./tests/results'):
 # heuristics = ['lmcut', 'hmax', 'operatorcounting']
 heuristics = ['lmcut']
 
+# Experiments that are not run by default are selected with --experiment <name>, once per experiment.
+# The positional arguments select a share of the tests (see run_threads).
+experiment_names = [sys.argv[i + 1] for i in range(1, len(sys.argv) - 1) if sys.argv[i] == '--experiment']
+positional_args = [arg for i, arg in enumerate(sys.argv) if arg != '--experiment' and (i == 0 or sys.argv[i - 1] != '--experiment')]
+
 number_of_threads = 12
 prune = True
 semaphore = Semaphore(number_of_threads)
@@ -332,6 +381,52 @@ def run_hybrid_tests() -> None:
                 add_threads(common_kwargs)
     run_threads()
 
+def run_spill_hybrid_tests() -> None:
+    common_kwargs = {}
+    common_kwargs['suite'] = 'FD-IPC-opt-strips'
+    common_kwargs['cost_system'] = 'real-costs'
+    common_kwargs['memory_limit'] = '2G'
+    common_kwargs['time_limit'] = '360m'
+    for algorithm in ['spill-pe-edd-eh', 'spill-edd-eh']:
+        common_kwargs['algorithm'] = algorithm
+        for open_limitness in ['limited-10']:
+            common_kwargs['open_limitness'] = open_limitness
+            for heuristic in heuristics:
+                common_kwargs['heuristic'] = heuristic
+                add_threads(common_kwargs)
+    run_threads()
+
+def run_frontier_pruning_hybrid_tests() -> None:
+    common_kwargs = {}
+    common_kwargs['suite'] = 'FD-IPC-opt-strips'
+    common_kwargs['cost_system'] = 'real-costs'
+    common_kwargs['memory_limit'] = '2G'
+    common_kwargs['time_limit'] = '360m'
+    # The same open limits as the hybrid tests, so that forgetting the worst nodes can be compared with switching to IDA*.
+    for algorithm in ['sma-pe-edd-eh', 'sma-edd-eh']:
+        common_kwargs['algorithm'] = algorithm
+        for open_limitness in ['limited-90', 'limited-50', 'limited-10']:
+            common_kwargs['open_limitness'] = open_limitness
+            for heuristic in heuristics:
+                common_kwargs['heuristic'] = heuristic
+                add_threads(common_kwargs)
+    run_threads()
+
+def run_symmetry_hybrid_tests() -> None:
+    common_kwargs = {}
+    common_kwargs['suite'] = 'FD-IPC-opt-strips'
+    common_kwargs['cost_system'] = 'real-costs'
+    common_kwargs['memory_limit'] = '2G'
+    common_kwargs['time_limit'] = '360m'
+    for algorithm in ['sym-pe-edd-eh', 'sym-edd-eh']:
+        common_kwargs['algorithm'] = algorithm
+        for open_limitness in ['limited-90', 'limited-10']:
+            common_kwargs['open_limitness'] = open_limitness
+            for heuristic in heuristics:
+                common_kwargs['heuristic'] = heuristic
+                add_threads(common_kwargs)
+    run_threads()
+
 def run_artificial_hybrid_tests() -> None:
     common_kwargs = {}
     common_kwargs['suite'] = 'FD-IPC-opt-strips'
@@ -346,17 +441,49 @@ def run_artificial_hybrid_tests() -> None:
             add_threads(common_kwargs)
     run_threads()
 
+def run_budget_hybrid_tests() -> None:
+    common_kwargs = {}
+    common_kwargs['suite'] = 'FD-IPC-opt-strips'
+    common_kwargs['cost_system'] = 'real-costs'
+    common_kwargs['memory_limit'] = '2G'
+    common_kwargs['time_limit'] = '360m'
+    for algorithm in ['pe-edd-eh', 'edd-eh']:
+        common_kwargs['algorithm'] = algorithm
+        for open_limitness in ['budget-1500M']:
+            common_kwargs['open_limitness'] = open_limitness
+            for heuristic in heuristics:
+                common_kwargs['heuristic'] = heuristic
+                add_threads(common_kwargs)
+    run_threads()
+
 def run_processor() -> None:
     subprocess.Popen(['python3', './tests/processor.py'], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE).communicate()
 
-run_astar_tests()
-run_processor()
-run_blind_astar_tests()
-run_processor()
-run_hybrid_tests()
-run_processor()
-run_artificial_hybrid_tests()
-run_processor()
+experiments = {
+    'budget': run_budget_hybrid_tests,
+    'spill': run_spill_hybrid_tests,
+    'frontier-pruning': run_frontier_pruning_hybrid_tests,
+    'symmetry': run_symmetry_hybrid_tests,
+}
+
+unknown_experiment_names = [experiment_name for experiment_name in experiment_names if experiment_name not in experiments]
+if unknown_experiment_names:
+    sys.exit(f'Unknown experiments: {", ".join(unknown_experiment_names)} (known: {", ".join(experiments)})')
+
+if experiment_names:
+    # The node-count open limits of these experiments (except for the budget one) are calibrated with the A* runs of the default tests.
+    for experiment_name in experiment_names:
+        experiments[experiment_name]()
+        run_processor()
+else:
+    run_astar_tests()
+    run_processor()
+    run_blind_astar_tests()
+    run_processor()
+    run_hybrid_tests()
+    run_processor()
+    run_artificial_hybrid_tests()
+    run_processor()
 
 # while True:
 #     print('\a')